@@ -0,0 +1,172 @@
+import threading
+from collections import OrderedDict
+from datetime import date
+from typing import Callable, Hashable, Optional, Tuple
+
+import pandas as pd
+
+import columnar
+
+# Faixas de atraso dos recebíveis pendentes: (limite exclusivo em dias, rótulo)
+AGING_BUCKETS = (
+    (0, "A vencer"),
+    (31, "0-30 dias"),
+    (61, "31-60 dias"),
+    (91, "61-90 dias"),
+    (None, "Mais de 90 dias"),
+)
+AGING_LABELS = [label for _, label in AGING_BUCKETS]
+CACHE_ENTRIES = 32
+
+
+def _period(frame: pd.DataFrame, start: Optional[date], end: Optional[date]):
+    stamps = frame["_ts_Data"]
+    mask = pd.Series(True, index=frame.index)
+    if start is not None:
+        mask &= stamps >= pd.Timestamp(start)
+    if end is not None:
+        mask &= stamps < pd.Timestamp(end) + pd.Timedelta(days=1)
+    return frame[mask.to_numpy()]
+
+
+def _by_kind(frame: pd.DataFrame, key) -> pd.DataFrame:
+    totals = frame.groupby([key, "Tipo"], sort=True, observed=True)["Valor"].sum()
+    table = totals.unstack("Tipo", fill_value=0.0)
+    for kind in ("Receita", "Despesa"):
+        if kind not in table.columns:
+            table[kind] = 0.0
+    table.columns.name = None
+    return table[["Receita", "Despesa"]]
+
+
+def cash_flow(
+    frame: pd.DataFrame, start: Optional[date] = None, end: Optional[date] = None
+) -> pd.DataFrame:
+    """Monthly receitas, despesas, net flow and running balance.
+
+    Months without movements inside the period appear with zeros so the
+    chart keeps a regular time axis.
+    """
+    frame = _period(frame, start, end).dropna(subset=["_ts_Data"])
+    if frame.empty:
+        return pd.DataFrame(columns=["Receita", "Despesa", "Saldo", "Acumulado"])
+    months = frame["_ts_Data"].dt.to_period("M").rename("Mês")
+    table = _by_kind(frame.assign(**{"Mês": months}), "Mês")
+    full = pd.period_range(months.min(), months.max(), freq="M", name="Mês")
+    table = table.reindex(full, fill_value=0.0)
+    table["Saldo"] = table["Receita"] - table["Despesa"]
+    table["Acumulado"] = table["Saldo"].cumsum()
+    table.index = table.index.to_timestamp()
+    return table
+
+
+def by_category(
+    frame: pd.DataFrame, start: Optional[date] = None, end: Optional[date] = None
+) -> pd.DataFrame:
+    """Receitas and despesas per category, largest volume first."""
+    frame = _period(frame, start, end)
+    categories = frame["Categoria"].fillna("Sem categoria")
+    table = _by_kind(frame.assign(Categoria=categories), "Categoria")
+    order = (table["Receita"] + table["Despesa"]).sort_values(ascending=False).index
+    return table.loc[order]
+
+
+def receivables_aging(frame: pd.DataFrame, today: date) -> pd.DataFrame:
+    """Pending receitas per client and case, split by days outstanding.
+
+    The age counts from the movement date; future dates fall in "A vencer".
+    Rows are sorted by the total outstanding amount.
+    """
+    pending = frame[
+        ((frame["Tipo"] == "Receita") & (frame["Status"] == "Pendente")).to_numpy()
+    ]
+    columns = ["Cliente", "Caso"] + AGING_LABELS + ["Total"]
+    if pending.empty:
+        return pd.DataFrame(columns=columns)
+    age = (pd.Timestamp(today) - pending["_ts_Data"]).dt.days
+    limits = [upper for upper, _ in AGING_BUCKETS[:-1]]
+    edges = [-float("inf")] + limits + [float("inf")]
+    buckets = pd.cut(age, bins=edges, labels=AGING_LABELS, right=False)
+    table = (
+        pending.assign(
+            Cliente=pending["Cliente"].fillna("Sem cliente"),
+            Caso=pending["Caso"].fillna("Sem caso"),
+            Faixa=buckets,
+        )
+        .groupby(["Cliente", "Caso", "Faixa"], observed=False)["Valor"]
+        .sum()
+        .unstack("Faixa", fill_value=0.0)
+        .reindex(columns=AGING_LABELS, fill_value=0.0)
+    )
+    table.columns.name = None
+    table["Total"] = table.sum(axis=1)
+    table = table[table["Total"] > 0].sort_values("Total", ascending=False)
+    return table.reset_index()[columns]
+
+
+class FinanceAnalytics:
+    """Analytics frames over the transactions, cached by data version.
+
+    Every result is computed with vectorized group-bys on the columnar
+    store frame and kept in a small LRU keyed by the report, its
+    parameters and the store version of the transactions, so reruns that
+    only change the view reuse the frames until a movement is written.
+    """
+
+    def __init__(self, store: columnar.ColumnarStore, entries: int = CACHE_ENTRIES):
+        self.store = store
+        self.entries = entries
+        self._cache: "OrderedDict[Tuple, pd.DataFrame]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _cached(
+        self,
+        key: Tuple[Hashable, ...],
+        compute: Callable[[pd.DataFrame], pd.DataFrame],
+    ) -> pd.DataFrame:
+        # A versão é lida antes do frame: no pior caso o resultado é recalculado
+        key = (self.store.version("transactions"),) + key
+        with self._lock:
+            result = self._cache.get(key)
+            if result is not None:
+                self._cache.move_to_end(key)
+                return result
+        result = compute(self.store.frame("transactions"))
+        with self._lock:
+            self._cache[key] = result
+            while len(self._cache) > self.entries:
+                self._cache.popitem(last=False)
+        return result
+
+    def cash_flow(
+        self, start: Optional[date] = None, end: Optional[date] = None
+    ) -> pd.DataFrame:
+        return self._cached(
+            ("cash_flow", start, end), lambda f: cash_flow(f, start, end)
+        )
+
+    def by_category(
+        self, start: Optional[date] = None, end: Optional[date] = None
+    ) -> pd.DataFrame:
+        return self._cached(
+            ("by_category", start, end), lambda f: by_category(f, start, end)
+        )
+
+    def receivables_aging(self, today: date) -> pd.DataFrame:
+        return self._cached(
+            ("receivables_aging", today), lambda f: receivables_aging(f, today)
+        )
+
+
+_analytics: Optional[FinanceAnalytics] = None
+_analytics_lock = threading.Lock()
+
+
+def get_analytics() -> FinanceAnalytics:
+    """Return the process-wide analytics over the shared columnar store."""
+    global _analytics
+    if _analytics is None:
+        with _analytics_lock:
+            if _analytics is None:
+                _analytics = FinanceAnalytics(columnar.get_store())
+    return _analytics
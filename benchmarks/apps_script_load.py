@@ -0,0 +1,318 @@
+"""Load-test ``google_utils`` against the local Apps Script stand-in.
+
+Starts ``tools/apps_script_server.py`` in process (or uses ``--url``) and
+runs concurrent simulated sessions for ``--duration`` seconds. Each session
+picks actions by the ``--mix`` weights: appending movements as the write
+queue does (with idempotency keys), loading a sheet through the shared
+cache, pulling deltas into a replica and uploading files in chunks. Before
+the load, :func:`check_layout` confirms that rows sent the way the panel
+sends them land under the right sheet headers. Reports throughput, p50/p95/p99 latency
+and the failure rate of each action, so timeouts, retries, batching and
+cache TTL can be tuned offline:
+
+    python benchmarks/apps_script_load.py --sessions 20 --duration 30 \\
+        --latency 0.3 --jitter 0.5 --error-rate 0.02 --quota-per-minute 600
+"""
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "tools"))
+
+import apps_script_server  # noqa: E402
+import google_utils  # noqa: E402
+import synthetic  # noqa: E402
+import ui  # noqa: E402
+import write_queue  # noqa: E402
+
+SHEET = ui.SHEET_NAMES["transactions"]
+DEFAULT_MIX = "append=5,load=3,since=2,upload=1"
+
+
+def _percentile(ordered: List[float], fraction: float) -> float:
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def _error_name(error: Exception) -> str:
+    response = getattr(error, "response", None)
+    if response is not None:
+        return f"HTTP {response.status_code}"
+    return type(error).__name__
+
+
+class Session:
+    """One simulated user of the panel, sending a random mix of actions."""
+
+    def __init__(
+        self,
+        number: int,
+        client: google_utils.AppsScriptClient,
+        args: argparse.Namespace,
+    ):
+        self.client = client
+        self.args = args
+        self.rng = random.Random(args.seed + number)
+        self.generator = synthetic.Generator(args.seed + number)
+        self.replica = google_utils.SheetReplica(SHEET, client)
+        self.name = f"Sessão {number}"
+        self.actions: Dict[str, Callable[[], None]] = {
+            "append": self.append,
+            "load": self.load,
+            "since": self.since,
+            "upload": self.upload,
+        }
+
+    def append(self) -> None:
+        # Linhas montadas como em ui.sync_records, com uma chave por linha
+        keys = [
+            uuid.UUID(int=self.rng.getrandbits(128)).hex for _ in range(self.args.rows)
+        ]
+        rows = [
+            ui.sheet_row("transactions", {"id": key, **self.generator.transaction(0)})
+            for key in keys
+        ]
+        self.client.append_rows(SHEET, rows, keys=keys)
+
+    def load(self) -> None:
+        self.client.load_rows(SHEET)
+
+    def since(self) -> None:
+        self.replica.refresh()
+
+    def upload(self) -> None:
+        data = self.rng.randbytes(self.args.upload_kb * 1024)
+        self.client.upload_stream(
+            _Bytes(data),
+            f"documento-{uuid.uuid4().hex[:8]}.pdf",
+            self.name,
+            chunk_size=self.args.chunk_kb * 1024,
+        )
+
+    def run(self, weights: Dict[str, float], deadline: float, results: List) -> None:
+        names, shares = list(weights), list(weights.values())
+        while time.monotonic() < deadline:
+            action = self.rng.choices(names, shares)[0]
+            started = time.perf_counter()
+            error = None
+            try:
+                self.actions[action]()
+            except Exception as exc:
+                error = _error_name(exc)
+            results.append((action, (time.perf_counter() - started) * 1000, error))
+            if self.args.think:
+                time.sleep(self.rng.expovariate(1 / self.args.think))
+
+
+class _Bytes:
+    """Minimal seekable file object over bytes, without copying on read."""
+
+    def __init__(self, data: bytes):
+        self.data = memoryview(data)
+        self.position = 0
+
+    def seek(self, position: int) -> None:
+        self.position = position
+
+    def read(self, size: int) -> bytes:
+        chunk = self.data[self.position : self.position + size]
+        self.position += len(chunk)
+        return bytes(chunk)
+
+
+def check_layout(url: str, directory: str) -> List[str]:
+    """Send one record of each collection to the sheets and compare.
+
+    The records go the way the panel sends them (``ui.sync_records`` and a
+    write queue) through a client of their own to the Apps Script at
+    ``url``; each one is then read back from its sheet by id and every field
+    must sit under its own header. Returns the mismatches found.
+    """
+    generator = synthetic.Generator()
+    records = {name: next(generator.records(name, 1))[0] for name in ui.SHEET_NAMES}
+    client = google_utils.AppsScriptClient(url)
+    queue = write_queue.WriteQueue(
+        str(Path(directory) / "fila.db"),
+        sender=lambda sheet, rows, keys: client.append_rows(sheet, rows, keys=keys),
+    )
+    try:
+        for name, record in records.items():
+            ui.sync_records(name, [record], queue)
+        queue.flush()
+        problems = [f"envio: {queue.last_error}"] if queue.last_error else []
+        for name, record in records.items():
+            sheet = ui.SHEET_NAMES[name]
+            rows = {row.get("id"): row for row in client.load_rows(sheet)}
+            expected = dict(zip(ui.sheet_columns(name), ui.sheet_row(name, record)))
+            row = rows.get(record["id"])
+            if row is None:
+                problems.append(f"{sheet}: registro {record['id']} não encontrado")
+                continue
+            for field, value in expected.items():
+                if row.get(field) != value:
+                    problems.append(
+                        f"{sheet}: coluna {field} tem {row.get(field)!r}, "
+                        f"esperado {value!r}"
+                    )
+    finally:
+        queue.close()
+        client.close()
+    return problems
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    weights = {}
+    for item in text.split(","):
+        name, _, weight = item.partition("=")
+        weights[name.strip()] = float(weight or 1)
+    return {name: weight for name, weight in weights.items() if weight > 0}
+
+
+def summarize(results: List, elapsed: float) -> Dict[str, Dict]:
+    """Return count, throughput, failures and latency percentiles per action."""
+    by_action: Dict[str, List] = defaultdict(list)
+    for action, milliseconds, error in results:
+        by_action[action].append((milliseconds, error))
+    by_action["total"] = [
+        sample for samples in by_action.values() for sample in samples
+    ]
+    summary = {}
+    for action, samples in by_action.items():
+        times = sorted(ms for ms, _ in samples)
+        errors = Counter(error for _, error in samples if error)
+        summary[action] = {
+            "count": len(samples),
+            "per_second": len(samples) / elapsed,
+            "failure_rate": sum(errors.values()) / len(samples),
+            "errors": dict(errors),
+            "p50": _percentile(times, 0.50),
+            "p95": _percentile(times, 0.95),
+            "p99": _percentile(times, 0.99),
+        }
+    return summary
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="Apps Script já em execução (padrão: local)")
+    parser.add_argument("--sessions", type=int, default=10)
+    parser.add_argument("--duration", type=float, default=20, help="segundos")
+    parser.add_argument("--think", type=float, default=0.2, help="pausa média (s)")
+    parser.add_argument("--mix", default=DEFAULT_MIX)
+    parser.add_argument("--rows", type=int, default=10, help="linhas por append")
+    parser.add_argument("--upload-kb", type=int, default=512)
+    parser.add_argument("--chunk-kb", type=int, default=256)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="grava o resumo em JSON")
+    parser.add_argument("--max-failure-rate", type=float, default=0.01)
+    tuning = parser.add_argument_group("cliente (google_utils)")
+    tuning.add_argument(
+        "--connect-timeout", type=float, default=google_utils.CONNECT_TIMEOUT
+    )
+    tuning.add_argument("--read-timeout", type=float, default=google_utils.READ_TIMEOUT)
+    tuning.add_argument("--retries", type=int, default=google_utils.MAX_RETRIES)
+    tuning.add_argument("--backoff", type=float, default=google_utils.BACKOFF_FACTOR)
+    tuning.add_argument("--pool", type=int, default=10, help="conexões por cliente")
+    tuning.add_argument("--cache-ttl", type=float, default=google_utils.CACHE_TTL)
+    tuning.add_argument(
+        "--client-per-session",
+        action="store_true",
+        help="um cliente por sessão em vez do cliente único do processo",
+    )
+    faults = parser.add_argument_group("falhas do servidor local")
+    apps_script_server.add_fault_arguments(faults)
+    args = parser.parse_args()
+    weights = parse_mix(args.mix)
+
+    directory = tempfile.TemporaryDirectory()
+    # A conferência usa um servidor local próprio, sem falhas, e nunca --url,
+    # para não gravar registros de teste nas planilhas reais
+    checker = apps_script_server.make_server(str(Path(directory.name) / "layout"))
+    threading.Thread(target=checker.serve_forever, daemon=True).start()
+    problems = check_layout(checker.url, directory.name)
+    checker.shutdown()
+    for problem in problems:
+        print("COLUNAS", problem)
+    if problems:
+        return 1
+
+    server: Optional[apps_script_server.ThreadingHTTPServer] = None
+    url = args.url
+    if url is None:
+        server = apps_script_server.make_server(
+            str(Path(directory.name) / "sheets"),
+            faults=apps_script_server.faults_from_args(args),
+        )
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = server.url
+
+    def new_client() -> google_utils.AppsScriptClient:
+        return google_utils.AppsScriptClient(
+            url,
+            connect_timeout=args.connect_timeout,
+            read_timeout=args.read_timeout,
+            max_retries=args.retries,
+            backoff_factor=args.backoff,
+            pool_maxsize=args.pool,
+            cache=cache,
+        )
+
+    # Como no painel, as sessões dividem o cache de planilhas do processo
+    cache = google_utils.SheetCache(ttl=args.cache_ttl)
+    shared = new_client()
+    sessions = [
+        Session(n, new_client() if args.client_per_session else shared, args)
+        for n in range(args.sessions)
+    ]
+    results: List = []
+    started = time.monotonic()
+    deadline = started + args.duration
+    threads = [
+        threading.Thread(target=s.run, args=(weights, deadline, results))
+        for s in sessions
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - started
+    if server is not None:
+        server.shutdown()
+    directory.cleanup()
+
+    summary = summarize(results, elapsed)
+    print(f"{args.sessions} sessões por {elapsed:.1f} s contra {url}")
+    for action, row in summary.items():
+        print(
+            f"{action:<8} {row['count']:6d} ops {row['per_second']:7.1f}/s  "
+            f"p50 {row['p50']:7.0f} ms  p95 {row['p95']:7.0f} ms  "
+            f"p99 {row['p99']:7.0f} ms  falhas {row['failure_rate']:6.1%}"
+            + (f"  {row['errors']}" if row["errors"] else "")
+        )
+    stats = dict(server.stub.stats) if server is not None else {}
+    if stats:
+        print(
+            "servidor: "
+            + ", ".join(f"{name} {count}" for name, count in sorted(stats.items()))
+        )
+    if args.output:
+        payload = {"arguments": vars(args), "summary": summary, "server": stats}
+        Path(args.output).write_text(
+            json.dumps(payload, indent=2, ensure_ascii=False), encoding="utf-8"
+        )
+    total = summary.get("total")
+    return 1 if total and total["failure_rate"] > args.max_failure_rate else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+"""Measure cold start and rerun time of each page against its budget.
+
+Each page is opened in a fresh interpreter through Streamlit's ``AppTest``,
+so the first run includes every import the page triggers; the following
+runs are plain reruns. Prints one line per page and exits with status 1
+when a page exceeds :data:`perf.STARTUP_BUDGET_MS` or its rerun budget.
+
+    python benchmarks/page_budgets.py [--runs 20] [pagina ...]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import perf  # noqa: E402
+
+# Dependências que só algumas páginas devem carregar
+HEAVY_MODULES = ("fpdf", "openpyxl", "streamlit_calendar")
+
+_CHILD = """
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+page, runs = sys.argv[1], int(sys.argv[2])
+started = time.perf_counter()
+at = AppTest.from_file("app.py", default_timeout=120)
+at.switch_page(f"views/{page}.py")
+at.run()
+cold = (time.perf_counter() - started) * 1000
+reruns = []
+for _ in range(runs):
+    started = time.perf_counter()
+    at.run()
+    reruns.append((time.perf_counter() - started) * 1000)
+print(json.dumps({
+    "cold": cold,
+    "reruns": sorted(reruns),
+    "errors": [str(e.value) for e in at.exception],
+    "modules": [m for m in %r if m in sys.modules],
+}))
+""" % (HEAVY_MODULES,)
+
+
+def measure(page: str, runs: int) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", _CHILD, page, str(runs)],
+        cwd=ROOT,
+        env=os.environ.copy(),
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("pages", nargs="*", default=list(perf.PAGE_BUDGETS))
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    failed = False
+    for page in args.pages:
+        result = measure(page, args.runs)
+        reruns = result["reruns"]
+        p50 = reruns[len(reruns) // 2]
+        p95 = reruns[min(len(reruns) - 1, int(0.95 * len(reruns)))]
+        over = (
+            result["errors"]
+            or result["cold"] > perf.STARTUP_BUDGET_MS
+            or p95 > perf.budget(page)
+        )
+        failed = failed or bool(over)
+        print(
+            f"{page:<18} frio {result['cold']:7.0f} ms  "
+            f"p50 {p50:6.1f} ms  p95 {p95:6.1f} ms  "
+            f"orçamento {perf.budget(page):4d} ms  "
+            f"módulos {','.join(result['modules']) or '-'}"
+            + ("  ACIMA" if over else "")
+        )
+        for error in result["errors"]:
+            print(f"    erro: {error}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
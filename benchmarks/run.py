@@ -0,0 +1,265 @@
+"""Time filters, saldo, calendar and reports over synthetic data.
+
+Fills a temporary database with :mod:`synthetic` records and times the
+work each page does with its data, outside Streamlit: the page filters on
+the columnar store, the ledger totals, the Visão Geral calendar window,
+the finance analytics and the PDF and Excel writers. Results are printed
+and optionally written as JSON; the run exits with status 1 when a median
+exceeds its threshold in ``thresholds.json`` for that size or regresses
+against a previous result given with ``--baseline``.
+
+    python benchmarks/run.py --records 100000 --output resultado.json
+    python benchmarks/run.py --records 100000 --baseline resultado.json
+
+Rendering time of each page is measured by ``page_budgets.py``.
+"""
+
+import argparse
+import io
+import json
+import platform
+import sys
+import tempfile
+import time
+from datetime import timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import analytics  # noqa: E402
+import calendar_feed  # noqa: E402
+import columnar  # noqa: E402
+import ledger  # noqa: E402
+import reports  # noqa: E402
+import storage  # noqa: E402
+import synthetic  # noqa: E402
+
+THRESHOLDS_PATH = Path(__file__).resolve().parent / "thresholds.json"
+# Itens por página usados nas listas (ver ui.PAGE_SIZES)
+PAGE_ROWS = 25
+# Diferenças menores que isto não contam como regressão (ruído de medição)
+NOISE_MS = 5.0
+
+
+class Suite:
+    """The benchmarks of one synthetic database, registered by name."""
+
+    def __init__(self, repo: storage.Repository, report_rows: int):
+        self.repo = repo
+        self.today = synthetic.TODAY
+        self.store = columnar.ColumnarStore(repo)
+        for name in storage.SCHEMAS:
+            self.store.frame(name)
+        movements = self.store.frame("transactions").head(report_rows)
+        self.report_frame = movements[list(storage.SCHEMAS["transactions"])]
+        self.report_records = self.store.to_records("transactions", movements)
+        self.client = self.store.frame("clients")["Nome"].iloc[0]
+        self.cases: Dict[str, Callable[[], object]] = {}
+        self._register()
+
+    def _page(self, name: str, **filters) -> Callable[[], List[Dict]]:
+        # Como ui.paginate: filtra tudo e converte só a primeira página
+        def run() -> List[Dict]:
+            result = self.store.select(name, **filters)
+            return self.store.to_records(name, result.iloc[:PAGE_ROWS])
+
+        return run
+
+    def _register(self) -> None:
+        today = self.today
+        self.cases = {
+            "columnar.load": self._load,
+            "filter.clientes": self._page(
+                "clients", search="silva", search_fields=("Nome",)
+            ),
+            "filter.casos": self._page(
+                "cases",
+                search="silva",
+                search_fields=("Processo", "Cliente"),
+                equals={"Status": "Ativo"},
+            ),
+            "filter.documentos": self._page(
+                "documents", search="procuração", search_fields=("Título",)
+            ),
+            "filter.agenda": self._page(
+                "events",
+                search="audiência",
+                search_fields=("Título",),
+                equals={"Status": "Agendado"},
+            ),
+            "filter.tarefas": self._page(
+                "tasks",
+                search="petição",
+                search_fields=("Descrição",),
+                date_field="Prazo",
+                date_to=today,
+            ),
+            "filter.financeiro": self._page(
+                "transactions",
+                date_field="Data",
+                date_from=today - timedelta(days=365),
+                order_by="Data",
+            ),
+            "filter.casos_por_cliente": lambda: self.repo.collection("cases").query(
+                equals={"Cliente": self.client}
+            ),
+            "saldo.load": self._cold(ledger.Ledger, lambda ledger_: ledger_.balance()),
+            "calendar.window": self._cold(
+                calendar_feed.CalendarFeed,
+                lambda feed: feed.window(*calendar_feed.month_window(today)),
+            ),
+            "analytics.cash_flow": lambda: analytics.cash_flow(
+                self.store.frame("transactions")
+            ),
+            "analytics.receivables_aging": lambda: analytics.receivables_aging(
+                self.store.frame("transactions"), today
+            ),
+            "report.pdf": lambda: reports.dataframe_to_pdf(
+                self.report_frame, "Financeiro"
+            ),
+            "report.excel": lambda: reports.write_excel(
+                io.BytesIO(), [("Financeiro", "transactions", [self.report_records])]
+            ),
+        }
+
+    def _cold(self, build: Callable, use: Callable) -> Callable[[], object]:
+        """Return a case that builds a structure from the tables and uses it.
+
+        The structure stops listening to the repository afterwards, so the
+        listeners of earlier repeats do not slow the later ones down.
+        """
+
+        def run() -> object:
+            built = build(self.repo)
+            try:
+                return use(built)
+            finally:
+                self.repo.unsubscribe(built._on_change)
+
+        return run
+
+    def _load(self) -> None:
+        # Primeira abertura de uma página: monta os frames a partir do banco
+        store = columnar.ColumnarStore(self.repo)
+        try:
+            for name in storage.SCHEMAS:
+                store.frame(name)
+        finally:
+            self.repo.unsubscribe(store._on_change)
+
+    def run(self, names: List[str], repeat: int) -> Dict[str, Dict]:
+        """Run each benchmark ``repeat`` times; return its times in ms."""
+        results = {}
+        for name in names:
+            runs = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                self.cases[name]()
+                runs.append((time.perf_counter() - started) * 1000)
+            runs.sort()
+            results[name] = {
+                "median": runs[len(runs) // 2],
+                "min": runs[0],
+                "max": runs[-1],
+            }
+        return results
+
+
+def check(
+    results: Dict[str, Dict],
+    thresholds: Dict[str, float],
+    baseline: Optional[Dict[str, Dict]],
+    tolerance: float,
+) -> List[str]:
+    """Return a message for each median over its threshold or baseline."""
+    failures = []
+    for name, result in results.items():
+        median = result["median"]
+        limit = thresholds.get(name)
+        if limit is not None and median > limit:
+            failures.append(f"{name}: {median:.1f} ms > limite de {limit:.0f} ms")
+        previous = (baseline or {}).get(name)
+        if previous is not None:
+            allowed = max(
+                previous["median"] * (1 + tolerance), previous["median"] + NOISE_MS
+            )
+            if median > allowed:
+                failures.append(
+                    f"{name}: {median:.1f} ms > {previous['median']:.1f} ms "
+                    f"da referência (+{tolerance:.0%})"
+                )
+    return failures
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("benchmarks", nargs="*", help="padrão: todos")
+    parser.add_argument("--records", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--report-rows", type=int, default=10_000)
+    parser.add_argument("--output", help="grava os resultados em JSON")
+    parser.add_argument("--thresholds", default=str(THRESHOLDS_PATH))
+    parser.add_argument("--baseline", help="resultado JSON de uma execução anterior")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        repo = storage.Repository(str(Path(directory) / "bench.db"))
+        started = time.perf_counter()
+        counts = synthetic.populate(repo, args.records, args.seed)
+        print(
+            f"{args.records} registros gerados em "
+            f"{time.perf_counter() - started:.1f} s (semente {args.seed})"
+        )
+        suite = Suite(repo, args.report_rows)
+        names = args.benchmarks or list(suite.cases)
+        unknown = [name for name in names if name not in suite.cases]
+        if unknown:
+            parser.error("benchmark desconhecido: " + ", ".join(unknown))
+        results = suite.run(names, args.repeat)
+
+    thresholds = {}
+    if args.thresholds and Path(args.thresholds).exists():
+        table = json.loads(Path(args.thresholds).read_text(encoding="utf-8"))
+        thresholds = table.get(str(args.records), {})
+    baseline = None
+    if args.baseline:
+        previous = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        if previous["records"] == args.records and previous["seed"] == args.seed:
+            baseline = previous["results"]
+        else:
+            print("Referência ignorada: tamanho ou semente diferentes")
+    failures = check(results, thresholds, baseline, args.tolerance)
+
+    for name, result in results.items():
+        limit = thresholds.get(name)
+        print(
+            f"{name:<30} mediana {result['median']:9.1f} ms  "
+            f"mín {result['min']:9.1f} ms"
+            + (f"  limite {limit:.0f} ms" if limit is not None else "")
+        )
+    for failure in failures:
+        print("FALHOU", failure)
+
+    if args.output:
+        payload = {
+            "records": args.records,
+            "seed": args.seed,
+            "repeat": args.repeat,
+            "report_rows": args.report_rows,
+            "counts": counts,
+            "python": platform.python_version(),
+            "results": results,
+            "failures": failures,
+        }
+        Path(args.output).write_text(
+            json.dumps(payload, indent=2, ensure_ascii=False), encoding="utf-8"
+        )
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
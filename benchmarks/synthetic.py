@@ -0,0 +1,324 @@
+"""Deterministic synthetic data for every collection of the panel.
+
+The same ``seed`` and size always produce the same records, so benchmark
+runs on different commits measure the same data. Records reference each
+other as the forms do: cases, tasks, events, movements and documents point
+at existing clients and process numbers.
+
+    python benchmarks/synthetic.py --records 100000 --database bench.db
+"""
+
+import argparse
+import random
+import sys
+import time
+from datetime import date, datetime, time as day_time, timedelta
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import business_days  # noqa: E402
+import storage  # noqa: E402
+
+# Parte do total de registros em cada coleção
+SHARES = {
+    "clients": 0.10,
+    "cases": 0.15,
+    "tasks": 0.20,
+    "events": 0.20,
+    "transactions": 0.25,
+    "documents": 0.10,
+}
+CHUNK_ROWS = 5000
+# Datas geradas em torno de hoje: anos para trás e para a frente
+YEARS_BACK = 5
+YEARS_AHEAD = 1
+TODAY = date(2025, 6, 2)
+
+FIRST_NAMES = (
+    "Ana Antônio Beatriz Bruno Camila Carlos Cecília Daniel Débora Eduardo "
+    "Fernanda Francisco Gabriela Gustavo Helena Igor Isabela João Júlia "
+    "Larissa Lucas Luíza Marcelo Maria Mateus Natália Otávio Patrícia "
+    "Paulo Rafael Renata Rodrigo Sérgio Sofia Tatiana Thiago Valéria "
+    "Vinícius Yasmin Zé"
+).split()
+SURNAMES = (
+    "Almeida Alves Araújo Barbosa Cardoso Carvalho Castro Conceição Costa "
+    "Dias Fernandes Ferreira Gomes Gonçalves Lima Lopes Martins Melo "
+    "Mendes Monteiro Moreira Nascimento Oliveira Pereira Ribeiro Rocha "
+    "Rodrigues Santos Silva Soares Sousa Teixeira Vieira"
+).split()
+COMPANY_SUFFIXES = ("Ltda.", "S.A.", "ME", "EIRELI", "Comércio Ltda.")
+CLIENT_NOTES = ("", "Prefere contato por e-mail", "Cliente VIP")
+LAWYERS = (
+    "Dra. Ana Ribeiro",
+    "Dr. Carlos Monteiro",
+    "Dra. Helena Castro",
+    "Dr. Paulo Teixeira",
+    "Dra. Renata Gomes",
+)
+CITIES = (
+    "São Paulo",
+    "Rio de Janeiro",
+    "Belo Horizonte",
+    "Porto Alegre",
+    "Curitiba",
+    "Salvador",
+    "Recife",
+    "Fortaleza",
+    "Brasília",
+    "Goiânia",
+)
+SUBJECTS = (
+    "Ação de cobrança",
+    "Reclamação trabalhista",
+    "Divórcio consensual",
+    "Inventário",
+    "Revisão contratual",
+    "Indenização por danos morais",
+    "Execução fiscal",
+    "Despejo por falta de pagamento",
+    "Usucapião",
+    "Mandado de segurança",
+)
+TASKS = (
+    "Protocolar petição inicial",
+    "Apresentar contestação",
+    "Juntar procuração",
+    "Interpor recurso de apelação",
+    "Responder intimação",
+    "Preparar audiência",
+    "Calcular custas",
+    "Enviar parecer ao cliente",
+    "Revisar contrato",
+    "Solicitar certidões",
+)
+DOCUMENTS = (
+    "Petição inicial",
+    "Procuração",
+    "Contrato de honorários",
+    "Contestação",
+    "Sentença",
+    "Acórdão",
+    "Comprovante de pagamento",
+    "Certidão de intimação",
+    "Laudo pericial",
+    "Ata de audiência",
+)
+INCOME_CATEGORIES = ("Honorários", "Honorários de êxito", "Consultoria")
+EXPENSE_CATEGORIES = ("Custas", "Aluguel", "Deslocamento", "Perícia", "Cartório")
+RULES = ("FREQ=WEEKLY;BYDAY=MO", "FREQ=MONTHLY", "FREQ=WEEKLY;INTERVAL=2;BYDAY=WE")
+EVENT_TYPES = ("Audiência", "Prazo", "Reunião")
+# Segmento do Judiciário (J) e tribunal (TR) do número único do CNJ
+COURTS = ((8, 26), (8, 19), (8, 13), (5, 2), (5, 15), (4, 3), (4, 1))
+
+
+def person_name(rng: random.Random) -> str:
+    return f"{rng.choice(FIRST_NAMES)} {rng.choice(SURNAMES)} {rng.choice(SURNAMES)}"
+
+
+def client_name(rng: random.Random) -> str:
+    """Return a person name or, for one client in five, a company name."""
+    if rng.random() < 0.2:
+        partners = f"{rng.choice(SURNAMES)} & {rng.choice(SURNAMES)}"
+        return f"{partners} {rng.choice(COMPANY_SUFFIXES)}"
+    return person_name(rng)
+
+
+def process_number(rng: random.Random, year: int) -> str:
+    """Return a CNJ unified process number (NNNNNNN-DD.AAAA.J.TR.OOOO).
+
+    The check digits follow Resolução CNJ 65/2008 (ISO 7064, mod 97).
+    """
+    sequence = rng.randrange(10_000_000)
+    segment, court = rng.choice(COURTS)
+    origin = rng.randrange(1, 10_000)
+    digits = f"{sequence:07d}{year:04d}{segment}{court:02d}{origin:04d}"
+    check = 98 - int(digits + "00") % 97
+    return f"{sequence:07d}-{check:02d}.{year:04d}.{segment}.{court:02d}.{origin:04d}"
+
+
+def sizes(total: int) -> Dict[str, int]:
+    """Split ``total`` records among the collections by :data:`SHARES`."""
+    counts = {name: max(1, int(total * share)) for name, share in SHARES.items()}
+    counts["transactions"] += total - sum(counts.values())
+    return counts
+
+
+class Generator:
+    """Build the records of every collection from one random seed."""
+
+    def __init__(self, seed: int = 42, today: Optional[date] = None):
+        self.rng = random.Random(seed)
+        # Um "hoje" fixo mantém os dados iguais em qualquer dia da execução
+        self.today = today or TODAY
+        self.first_day = self.today - timedelta(days=365 * YEARS_BACK)
+        self.span = 365 * (YEARS_BACK + YEARS_AHEAD)
+        self.clients: List[str] = []
+        self.cases: List[tuple] = []
+        self.calendar = business_days.get_calendar()
+
+    def day(self, until_today: bool = False) -> date:
+        span = 365 * YEARS_BACK if until_today else self.span
+        return self.first_day + timedelta(days=self.rng.randrange(span))
+
+    def moment(self) -> datetime:
+        hour = self.rng.choice((8, 9, 10, 11, 13, 14, 15, 16, 17))
+        minute = self.rng.choice((0, 15, 30, 45))
+        return datetime.combine(self.day(), day_time(hour, minute))
+
+    def case_ref(self) -> tuple:
+        return self.rng.choice(self.cases) if self.cases else (None, None)
+
+    def client(self, index: int) -> Dict:
+        rng = self.rng
+        name = client_name(rng)
+        self.clients.append(name)
+        login = name.split()[0].lower().replace("&", "")
+        return {
+            "Nome": name,
+            "Email": f"{login}{index}@exemplo.com.br",
+            "Telefone": f"({rng.randrange(11, 99)}) 9{rng.randrange(10**7, 10**8)}",
+            "Anotações": rng.choice(CLIENT_NOTES),
+        }
+
+    def case(self, index: int) -> Dict:
+        rng = self.rng
+        opened = self.day(until_today=True)
+        client = rng.choice(self.clients)
+        number = process_number(rng, opened.year)
+        self.cases.append((client, number))
+        return {
+            "Cliente": client,
+            "Processo": number,
+            "Partes": f"{client} x {person_name(rng)} — {rng.choice(SUBJECTS)}",
+            "Advogado": rng.choice(LAWYERS),
+            "Data de Abertura": opened,
+            "Status": rng.choices(("Ativo", "Encerrado", "Suspenso"), (6, 3, 1))[0],
+        }
+
+    def task(self, index: int) -> Dict:
+        rng = self.rng
+        client, case = self.case_ref()
+        record = {
+            "Descrição": f"{rng.choice(TASKS)} — {case}",
+            "Prioridade": rng.choice(("Baixa", "Média", "Alta")),
+            "Prazo": self.day(),
+            "Cliente": client,
+            "Caso": case,
+            "Início": None,
+            "Dias úteis": None,
+            "Calendário": None,
+        }
+        if rng.random() < 0.3:
+            start, days = self.day(), rng.choice((5, 10, 15, 30))
+            record["Início"] = start
+            record["Dias úteis"] = days
+            record["Calendário"] = self.calendar.name
+            record["Prazo"] = self.calendar.due_date(start, days)
+        # Quase todas as tarefas vencidas já foram feitas
+        done = record["Prazo"] < TODAY and rng.random() < 0.9
+        record["Status"] = "Concluída" if done else "Pendente"
+        return record
+
+    def event(self, index: int) -> Dict:
+        rng = self.rng
+        client, case = self.case_ref()
+        kind = rng.choice(EVENT_TYPES)
+        when = self.moment()
+        status = (
+            "Agendado"
+            if when.date() >= self.today
+            else rng.choice(("Concluído", "Concluído", "Cancelado", "Agendado"))
+        )
+        recurring = kind == "Reunião" and rng.random() < 0.02
+        return {
+            "Título": f"{kind} — {case}" if case else f"{kind} interna",
+            "Tipo": kind,
+            "Data": when,
+            "Local": f"Fórum de {rng.choice(CITIES)}" if kind == "Audiência" else "",
+            "Cliente": client,
+            "Caso": case,
+            "Status": status,
+            "Descrição": rng.choice(SUBJECTS),
+            "Recorrência": rng.choice(RULES) if recurring else None,
+            "Exceções": None,
+        }
+
+    def transaction(self, index: int) -> Dict:
+        rng = self.rng
+        client, case = self.case_ref()
+        income = rng.random() < 0.6
+        when = self.day()
+        return {
+            "Tipo": "Receita" if income else "Despesa",
+            "Categoria": rng.choice(
+                INCOME_CATEGORIES if income else EXPENSE_CATEGORIES
+            ),
+            "Valor": round(rng.lognormvariate(7, 1), 2),
+            "Descrição": rng.choice(SUBJECTS),
+            "Data": when,
+            "Status": (
+                "Pendente" if when >= self.today or rng.random() < 0.15 else "Pago"
+            ),
+            "Cliente": client,
+            "Caso": case,
+        }
+
+    def document(self, index: int) -> Dict:
+        rng = self.rng
+        client, case = self.case_ref()
+        title = rng.choice(DOCUMENTS)
+        slug = title.lower().replace(" ", "-")
+        return {
+            "Cliente": client,
+            "Caso": case,
+            "Título": f"{title} — {case}",
+            "Arquivo": f"{slug}-{index}.pdf",
+            "Link": f"https://drive.exemplo.com.br/d/{rng.getrandbits(64):016x}",
+        }
+
+    def records(self, name: str, count: int) -> Iterator[List[Dict]]:
+        """Yield ``count`` records of a collection, ``CHUNK_ROWS`` at a time."""
+        build = getattr(self, name[:-1])
+        for start in range(0, count, CHUNK_ROWS):
+            chunk = [build(i) for i in range(start, min(start + CHUNK_ROWS, count))]
+            for record in chunk:
+                # Ids também saem da semente, no formato de storage.new_id
+                record["id"] = f"{self.rng.getrandbits(128):032x}"
+            yield chunk
+
+
+def populate(repo: storage.Repository, total: int, seed: int = 42) -> Dict[str, int]:
+    """Fill ``repo`` with ``total`` synthetic records and return the counts.
+
+    Collections are filled in dependency order (clients, then cases, then
+    the rest) in transactions of ``CHUNK_ROWS`` records.
+    """
+    counts = sizes(total)
+    generator = Generator(seed)
+    for name, count in counts.items():
+        for chunk in generator.records(name, count):
+            repo.insert_many(name, chunk)
+    return counts
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--database", default=storage.DATABASE_PATH)
+    args = parser.parse_args()
+    started = time.perf_counter()
+    counts = populate(storage.Repository(args.database), args.records, args.seed)
+    elapsed = time.perf_counter() - started
+    for name, count in counts.items():
+        print(f"{name:<14} {count:>9}")
+    print(f"{sum(counts.values())} registros em {elapsed:.1f} s -> {args.database}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
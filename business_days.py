@@ -0,0 +1,194 @@
+import os
+import threading
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from dateutil.easter import easter
+
+import storage
+
+# Anos cobertos pelas tabelas de feriados pré-calculadas
+FIRST_YEAR = int(os.environ.get("HOLIDAYS_FIRST_YEAR", "2000"))
+LAST_YEAR = int(os.environ.get("HOLIDAYS_LAST_YEAR", "2060"))
+# Arquivo opcional com feriados estaduais, municipais ou do tribunal:
+# uma data AAAA-MM-DD por linha, seguida opcionalmente de ";descrição"
+HOLIDAYS_PATH = os.environ.get("HOLIDAYS_PATH")
+
+NATIONAL = "Nacional"
+FORENSIC = "Forense (CPC, art. 220)"
+FEDERAL = "Justiça Federal (Lei 5.010/66)"
+CALENDARS = (FORENSIC, NATIONAL, FEDERAL)
+DEFAULT_CALENDAR = FORENSIC
+
+_FIXED = (
+    (1, 1, "Confraternização Universal"),
+    (4, 21, "Tiradentes"),
+    (5, 1, "Dia do Trabalho"),
+    (9, 7, "Independência"),
+    (10, 12, "Nossa Senhora Aparecida"),
+    (11, 2, "Finados"),
+    (11, 15, "Proclamação da República"),
+    (12, 25, "Natal"),
+)
+# Feriados da Justiça Federal além dos nacionais (Lei 5.010/66, art. 62)
+_FEDERAL_FIXED = (
+    (8, 11, "Dia do Advogado"),
+    (11, 1, "Todos os Santos"),
+    (12, 8, "Dia da Justiça"),
+)
+
+
+def _national(year: int) -> Dict[date, str]:
+    holidays = {date(year, m, d): name for m, d, name in _FIXED}
+    if year >= 2024:
+        holidays[date(year, 11, 20)] = "Consciência Negra"
+    sunday = easter(year)
+    holidays[sunday - timedelta(days=48)] = "Carnaval"
+    holidays[sunday - timedelta(days=47)] = "Carnaval"
+    holidays[sunday - timedelta(days=2)] = "Sexta-feira Santa"
+    holidays[sunday + timedelta(days=60)] = "Corpus Christi"
+    return holidays
+
+
+def _recess(year: int) -> Dict[date, str]:
+    # Prazos suspensos de 20 de dezembro a 20 de janeiro (CPC, art. 220)
+    start = date(year, 12, 20)
+    return {start + timedelta(days=i): "Recesso forense" for i in range(32)}
+
+
+def _federal(year: int) -> Dict[date, str]:
+    holidays = {date(year, m, d): name for m, d, name in _FEDERAL_FIXED}
+    sunday = easter(year)
+    for offset in (4, 3):
+        holidays[sunday - timedelta(days=offset)] = "Semana Santa"
+    return holidays
+
+
+def _extra_holidays(path: Optional[str]) -> Dict[date, str]:
+    holidays: Dict[date, str] = {}
+    if not path:
+        return holidays
+    with open(path, encoding="utf-8") as handle:
+        for line in handle:
+            day, _, name = line.strip().partition(";")
+            if day and not day.startswith("#"):
+                holidays[date.fromisoformat(day.strip())] = name.strip() or "Feriado"
+    return holidays
+
+
+class BusinessCalendar:
+    """Business-day arithmetic over a precomputed holiday table.
+
+    The holidays of every year from ``FIRST_YEAR`` to ``LAST_YEAR`` are
+    computed once into a sorted ``datetime64[D]`` array wrapped in a
+    :class:`numpy.busdaycalendar`, so counting is done by
+    :func:`numpy.busday_offset` over whole arrays of start dates at once.
+    Weekends never count.
+    """
+
+    def __init__(self, name: str, holidays: Dict[date, str]):
+        self.name = name
+        self.names = holidays
+        self.holidays = np.array(sorted(holidays), dtype="datetime64[D]")
+        self._calendar = np.busdaycalendar(weekmask="1111100", holidays=self.holidays)
+
+    def add(self, starts: Sequence, days: Sequence) -> np.ndarray:
+        """Return the due dates of deadlines of ``days`` business days.
+
+        As in the CPC (art. 219 and 224), the start day is excluded and
+        counting begins on the next business day; a start on a weekend or
+        holiday is moved to the next business day first. Takes and returns
+        ``datetime64[D]`` arrays (or sequences of dates).
+        """
+        starts = np.asarray(starts, dtype="datetime64[D]")
+        days = np.asarray(days, dtype=np.int64)
+        return np.busday_offset(starts, days, roll="forward", busdaycal=self._calendar)
+
+    def due_date(self, start: date, days: int) -> date:
+        """Return the due date of a single deadline, see :meth:`add`."""
+        return self.add([start], [days])[0].astype(object)
+
+    def is_business_day(self, day: date) -> bool:
+        return bool(np.is_busday(np.datetime64(day, "D"), busdaycal=self._calendar))
+
+    def holidays_between(self, start: date, end: date) -> List[Tuple[date, str]]:
+        """Return the holidays from ``start`` to ``end`` inclusive."""
+        lower = np.searchsorted(self.holidays, np.datetime64(start, "D"))
+        upper = np.searchsorted(self.holidays, np.datetime64(end, "D"), side="right")
+        days = self.holidays[lower:upper].astype(object)
+        return [(day, self.names[day]) for day in days]
+
+
+def _build(name: str) -> BusinessCalendar:
+    holidays: Dict[date, str] = {}
+    for year in range(FIRST_YEAR - 1, LAST_YEAR + 1):
+        holidays.update(_national(year))
+        if name in (FORENSIC, FEDERAL):
+            holidays.update(_recess(year))
+        if name == FEDERAL:
+            holidays.update(_federal(year))
+    holidays.update(_extra_holidays(HOLIDAYS_PATH))
+    return BusinessCalendar(name, holidays)
+
+
+_calendars: Dict[str, BusinessCalendar] = {}
+_calendars_lock = threading.Lock()
+
+
+def get_calendar(name: str = DEFAULT_CALENDAR) -> BusinessCalendar:
+    """Return the shared calendar ``name`` (one of :data:`CALENDARS`)."""
+    calendar = _calendars.get(name)
+    if calendar is None:
+        with _calendars_lock:
+            calendar = _calendars.get(name)
+            if calendar is None:
+                if name not in CALENDARS:
+                    raise ValueError(f"Calendário desconhecido: {name}")
+                calendar = _calendars[name] = _build(name)
+    return calendar
+
+
+def reload_calendars() -> None:
+    """Drop the built calendars, e.g. after editing ``HOLIDAYS_PATH``."""
+    with _calendars_lock:
+        _calendars.clear()
+
+
+def recompute_tasks(tasks: storage.Collection, names: Iterable[str] = CALENDARS) -> int:
+    """Recompute ``Prazo`` of every task counted in business days.
+
+    Tasks created with a start date and a number of business days keep both,
+    so after a calendar change their due dates are recomputed in one
+    vectorized pass per calendar and the changed tasks are written in one
+    transaction, through the session's ``tasks`` view. A task edited
+    meanwhile is left as the edit saved it. Returns how many tasks changed.
+    """
+    changed: List[Dict] = []
+    versions: List[int] = []
+    for name in names:
+        calendar = get_calendar(name)
+        # Versões lidas antes dos dados: uma edição no meio invalida a tarefa
+        read = dict(
+            tasks.repo.read(
+                'SELECT id, version FROM tasks WHERE "Calendário" = ?', [name]
+            )
+        )
+        found = tasks.query(equals={"Calendário": name})
+        found = [
+            t
+            for t in found
+            if t["Início"] and t["Dias úteis"] is not None and t["id"] in read
+        ]
+        if not found:
+            continue
+        due = calendar.add(
+            [t["Início"] for t in found], [int(t["Dias úteis"]) for t in found]
+        ).astype(object)
+        for task, day in zip(found, due):
+            if task["Prazo"] != day:
+                changed.append({**task, "Prazo": day})
+                versions.append(read[task["id"]])
+    if not changed:
+        return 0
+    return len(tasks.update_many(changed, versions))
@@ -0,0 +1,137 @@
+import threading
+from collections import OrderedDict
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import recurrence
+import storage
+
+EVENT_STATUS_COLORS = {"Agendado": "blue", "Concluído": "green", "Cancelado": "red"}
+TASK_PRIORITY_COLORS = {"Baixa": "green", "Média": "orange", "Alta": "red"}
+TASK_STATUS_COLORS = {"Pendente": "orange", "Concluída": "green"}
+
+# Dias além da grade visível incluídos em cada janela
+MARGIN_DAYS = 7
+CACHE_WINDOWS = 16
+
+Window = Tuple[date, date]
+
+
+def _event_item(e: Dict) -> Dict:
+    return {
+        "title": f"{e['Título']} ({e['Tipo']})",
+        "start": e["Data"].isoformat(),
+        "color": EVENT_STATUS_COLORS.get(e["Status"], "gray"),
+        "extendedProps": {"type": "event", "id": e["id"]},
+    }
+
+
+def _task_item(t: Dict) -> Dict:
+    return {
+        "title": f"Tarefa: {t['Descrição']}",
+        "start": t["Prazo"].isoformat(),
+        "allDay": True,
+        "color": TASK_PRIORITY_COLORS.get(t["Prioridade"], "gray"),
+        "extendedProps": {"type": "task", "id": t["id"]},
+    }
+
+
+# coleção -> (campo de data, conversão para item do FullCalendar)
+SOURCES = {
+    "events": ("Data", _event_item),
+    "tasks": ("Prazo", _task_item),
+}
+
+
+def month_window(month: date, margin_days: int = MARGIN_DAYS) -> Window:
+    """Return the days shown by a month grid, widened by ``margin_days``.
+
+    The grid starts on the Sunday on or before the 1st and always shows
+    six weeks, as FullCalendar's ``dayGridMonth`` view does.
+    """
+    first = month.replace(day=1)
+    grid_start = first - timedelta(days=(first.weekday() + 1) % 7)
+    margin = timedelta(days=margin_days)
+    return grid_start - margin, grid_start + timedelta(days=41) + margin
+
+
+class CalendarFeed:
+    """FullCalendar items of events and tasks, fetched one window at a time.
+
+    A window is an inclusive day range; its items come from range queries
+    on the indexed ``Data`` and ``Prazo`` columns, so the payload follows
+    the visible period instead of the whole history. Recurring events are
+    expanded only inside the window (see :mod:`recurrence`). Built payloads
+    are kept in a small LRU per window and dropped whenever an event or task
+    is written.
+    """
+
+    def __init__(self, repo: storage.Repository, windows: int = CACHE_WINDOWS):
+        self.repo = repo
+        self.windows = windows
+        self._cache: "OrderedDict[Window, List[Dict]]" = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+        repo.subscribe(self._on_change)
+
+    def _on_change(
+        self, name: str, operation: str, record_id: str, record: Optional[Dict]
+    ) -> None:
+        if name in SOURCES:
+            with self._lock:
+                self._generation += 1
+                self._cache.clear()
+
+    def window(self, start: date, end: date) -> List[Dict]:
+        """Return the items dated from ``start`` to ``end`` inclusive."""
+        key = (start, end)
+        with self._lock:
+            items = self._cache.get(key)
+            if items is not None:
+                self._cache.move_to_end(key)
+                return items
+            generation = self._generation
+        items = []
+        for name, (field, to_item) in SOURCES.items():
+            records = self.repo.collection(name).query(
+                date_field=field, date_from=start, date_to=end, order_by=field
+            )
+            if name == "events":
+                records = self._with_occurrences(records, start, end)
+            items.extend(to_item(record) for record in records)
+        with self._lock:
+            # Uma escrita durante a consulta pode ter deixado o resultado velho
+            if generation == self._generation:
+                self._cache[key] = items
+                while len(self._cache) > self.windows:
+                    self._cache.popitem(last=False)
+        return items
+
+    def _with_occurrences(
+        self, records: List[Dict], start: date, end: date
+    ) -> List[Dict]:
+        # Séries que começam até o fim da janela, expandidas só dentro dela
+        series = self.repo.rows_to_records(
+            "events",
+            self.repo.select(
+                "events",
+                '"Recorrência" IS NOT NULL AND "Data" < ?',
+                [(end + timedelta(days=1)).isoformat()],
+            ),
+        )
+        one_off = [r for r in records if not recurrence.is_recurring(r)]
+        return recurrence.expand_records(one_off + series, start, end)
+
+
+_feed: Optional[CalendarFeed] = None
+_feed_lock = threading.Lock()
+
+
+def get_calendar_feed() -> CalendarFeed:
+    """Return the process-wide calendar feed over the shared repository."""
+    global _feed
+    if _feed is None:
+        with _feed_lock:
+            if _feed is None:
+                _feed = CalendarFeed(storage.get_repository())
+    return _feed
@@ -0,0 +1,213 @@
+import threading
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+import storage
+from search_index import normalize
+
+try:
+    _SEARCH_DTYPE = pd.StringDtype("pyarrow")
+except ImportError:
+    # Sem pyarrow o filtro continua vetorizado, mas com strings do pandas
+    _SEARCH_DTYPE = pd.StringDtype()
+
+
+def _fold(series: pd.Series) -> pd.Series:
+    return series.map(normalize).astype(_SEARCH_DTYPE)
+
+
+def _timestamps(series: pd.Series) -> pd.Series:
+    return pd.to_datetime(series, errors="coerce")
+
+
+class ColumnarStore:
+    """In-memory pandas frame per collection for the list page filters.
+
+    Each frame is indexed by record id and holds the record fields as
+    loaded from the repository, plus ``_ts_<campo>`` datetime columns for
+    date fields and ``_fold_<campo>`` string columns without case and accents,
+    built the first time a field is searched. Repository writes are queued through a
+    listener and applied in one batch on the next read.
+
+    Frames are never changed in place once returned: applying writes or
+    adding a search column builds a new frame and swaps it in, so concurrent
+    sessions can filter the frame they got without holding any lock.
+    """
+
+    def __init__(self, repo: storage.Repository):
+        self.repo = repo
+        self._frames: Dict[str, pd.DataFrame] = {}
+        self._pending: Dict[str, List[Tuple[str, str, Optional[Dict]]]] = {}
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.RLock()
+        repo.subscribe(self._on_change)
+
+    def _on_change(
+        self, name: str, operation: str, record_id: str, record: Optional[Dict]
+    ) -> None:
+        with self._lock:
+            self._versions[name] = self._versions.get(name, 0) + 1
+            if name in self._frames:
+                self._pending.setdefault(name, []).append(
+                    (operation, record_id, record)
+                )
+
+    def _build(
+        self, name: str, records: List[Dict], like: Optional[pd.DataFrame] = None
+    ) -> pd.DataFrame:
+        fields = storage.SCHEMAS[name]
+        index = pd.Index([r["id"] for r in records], dtype=object, name="id")
+        columns = {}
+        for field, kind in fields.items():
+            values = [r.get(field) for r in records]
+            dtype = float if kind == "real" else object
+            columns[field] = pd.Series(values, index=index, dtype=dtype)
+        frame = pd.DataFrame(columns, index=index)
+        for field, kind in fields.items():
+            if kind in ("date", "datetime"):
+                frame[f"_ts_{field}"] = _timestamps(frame[field])
+        if like is not None:
+            for column in like.columns:
+                if column.startswith("_fold_"):
+                    frame[column] = _fold(frame[column[len("_fold_") :]])
+        return frame
+
+    def _apply_pending(self, name: str) -> None:
+        frame = self._frames[name]
+        copied = False
+        inserts: List[Dict] = []
+
+        def flush_inserts(frame: pd.DataFrame) -> pd.DataFrame:
+            if not inserts:
+                return frame
+            new = self._build(name, inserts, like=frame)
+            inserts.clear()
+            return pd.concat([frame, new]) if len(frame) else new
+
+        for operation, record_id, record in self._pending.pop(name, []):
+            if operation == "insert":
+                inserts.append(record)
+                continue
+            frame = flush_inserts(frame)
+            if operation == "delete":
+                frame = frame.drop(record_id, errors="ignore")
+            elif record_id in frame.index:
+                if not copied:
+                    frame, copied = frame.copy(), True
+                row = self._build(name, [record], like=frame)
+                frame.loc[record_id, row.columns] = row.iloc[0]
+        self._frames[name] = flush_inserts(frame)
+
+    def frame(self, name: str) -> pd.DataFrame:
+        """Return the up-to-date frame of a collection."""
+        with self._lock:
+            if name in self._frames:
+                if self._pending.get(name):
+                    self._apply_pending(name)
+                return self._frames[name]
+        # A primeira carga segura as escritas até o frame estar montado; a
+        # trava do repositório vem primeiro, na mesma ordem das escritas
+        with self.repo.lock, self._lock:
+            if name not in self._frames:
+                records = self.repo.rows_to_records(name, self.repo.select(name))
+                self._frames[name] = self._build(name, records)
+            return self._frames[name]
+
+    def version(self, name: str) -> int:
+        """Return a counter that changes on every write to a collection."""
+        with self._lock:
+            return self._versions.get(name, 0)
+
+    def _folded(
+        self, name: str, frame: pd.DataFrame, fields: Tuple[str, ...]
+    ) -> List[pd.Series]:
+        columns = [f"_fold_{field}" for field in fields]
+        missing = {
+            column: _fold(frame[field])
+            for column, field in zip(columns, fields)
+            if column not in frame.columns
+        }
+        if missing:
+            with self._lock:
+                # Guarda as colunas para as próximas buscas se o frame ainda é o
+                # atual; todas de uma vez, pois cada assign troca o frame
+                if self._frames.get(name) is frame:
+                    self._frames[name] = frame.assign(**missing)
+        return [missing[c] if c in missing else frame[c] for c in columns]
+
+    def distinct(self, name: str, field: str) -> List[Any]:
+        """Return the sorted distinct values of a field."""
+        return sorted(self.frame(name)[field].dropna().unique())
+
+    def select(
+        self,
+        name: str,
+        search: str = "",
+        search_fields: Tuple[str, ...] = (),
+        equals: Optional[Dict[str, Any]] = None,
+        date_field: Optional[str] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        order_by: Optional[str] = None,
+    ) -> pd.DataFrame:
+        """Return the rows of a collection matching the filters.
+
+        Takes the same filters as :meth:`storage.Collection.query`, evaluated
+        as vectorized masks; rows keep insertion order unless ``order_by``
+        is given. Use :meth:`to_records` on the (possibly sliced) result.
+        """
+        frame = self.frame(name)
+        mask = pd.Series(True, index=frame.index)
+        for field, value in (equals or {}).items():
+            mask &= frame[field] == value
+        if date_field and (date_from is not None or date_to is not None):
+            stamps = frame[f"_ts_{date_field}"]
+            if date_from is not None:
+                mask &= stamps >= pd.Timestamp(date_from)
+            if date_to is not None:
+                if isinstance(date_to, datetime):
+                    date_to = date_to.date()
+                mask &= stamps < pd.Timestamp(date_to + timedelta(days=1))
+        if search and search_fields:
+            term = normalize(search)
+            found = pd.Series(False, index=frame.index)
+            for folded in self._folded(name, frame, search_fields):
+                found |= folded.str.contains(term, regex=False)
+            mask &= found.fillna(False).astype(bool)
+        result = frame[mask.to_numpy()]
+        if order_by:
+            kind = storage.SCHEMAS[name][order_by]
+            key = f"_ts_{order_by}" if kind in ("date", "datetime") else order_by
+            result = result.sort_values(key, kind="stable")
+        return result
+
+    def to_records(self, name: str, frame: pd.DataFrame) -> List[Dict]:
+        """Convert rows returned by :meth:`select` into record dicts."""
+        records = frame[list(storage.SCHEMAS[name])].to_dict("records")
+        return [
+            {"id": record_id, **record}
+            for record_id, record in zip(frame.index, records)
+        ]
+
+    def filter(self, name: str, limit: Optional[int] = None, **filters) -> List[Dict]:
+        """Return the matching records, see :meth:`select` for the filters."""
+        result = self.select(name, **filters)
+        if limit is not None:
+            result = result.head(limit)
+        return self.to_records(name, result)
+
+
+_store: Optional[ColumnarStore] = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> ColumnarStore:
+    """Return the process-wide columnar store over the shared repository."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = ColumnarStore(storage.get_repository())
+    return _store
@@ -0,0 +1,163 @@
+import bisect
+import heapq
+import itertools
+import threading
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple, Union
+
+import recurrence
+import storage
+
+# Prazos que vencem nos próximos dias entram no painel de alertas
+ALERT_DAYS = 7
+
+# Status das tarefas que saem dos alertas de prazo
+TASK_DONE = "Concluída"
+
+# coleção -> campo de data ordenado; tarefas usam a data, eventos data e hora
+FIELDS = {"events": "Data", "tasks": "Prazo"}
+
+Key = Tuple[Union[date, datetime], str]
+
+
+def _is_open(name: str, record: Dict) -> bool:
+    # Eventos concluídos ou cancelados e tarefas concluídas não vencem
+    if record.get(FIELDS[name]) is None:
+        return False
+    if name == "tasks":
+        return record.get("Status") != TASK_DONE
+    return record.get("Status") == "Agendado"
+
+
+def _series_between(series: Dict, start: datetime, end: datetime) -> List[Dict]:
+    return [
+        occurrence
+        for record in series.values()
+        for occurrence in recurrence.occurrences(record, start.date(), end.date())
+        if start <= occurrence["Data"] < end
+    ]
+
+
+class DeadlineIndex:
+    """Open events and tasks kept in date order.
+
+    Each collection keeps a sorted list of ``(data, id)`` for the events
+    still scheduled and the tasks with a due date not yet marked
+    "Concluída", updated by a repository listener on every write. Queries
+    bisect the list at the given instant, so "next N", "overdue" and "due
+    within X days" cost a binary search plus the records returned. Tasks are
+    compared by day: a task due today is not overdue until tomorrow.
+
+    Scheduled recurring events are kept apart: they never become overdue,
+    and their occurrences are merged into "next N" and "due within" results.
+    """
+
+    def __init__(self, repo: storage.Repository):
+        self.repo = repo
+        self._keys: Dict[str, List[Key]] = {name: [] for name in FIELDS}
+        self._records: Dict[Tuple[str, str], Dict] = {}
+        self._series: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        with repo.lock:
+            with self._lock:
+                for name, field in FIELDS.items():
+                    records = repo.rows_to_records(
+                        name, repo.select(name, f'"{field}" IS NOT NULL')
+                    )
+                    for record in records:
+                        if not _is_open(name, record):
+                            continue
+                        if recurrence.is_recurring(record):
+                            self._series[record["id"]] = record
+                        else:
+                            self._records[(name, record["id"])] = record
+                            self._keys[name].append((record[field], record["id"]))
+                    self._keys[name].sort()
+            repo.subscribe(self._on_change)
+
+    def _on_change(
+        self, name: str, operation: str, record_id: str, record: Optional[Dict]
+    ) -> None:
+        if name not in FIELDS:
+            return
+        field = FIELDS[name]
+        keys = self._keys[name]
+        with self._lock:
+            previous = self._records.pop((name, record_id), None)
+            if previous is not None:
+                position = bisect.bisect_left(keys, (previous[field], record_id))
+                del keys[position]
+            self._series.pop(record_id, None)
+            if record is None or not _is_open(name, record):
+                return
+            if recurrence.is_recurring(record):
+                self._series[record_id] = record
+            else:
+                self._records[(name, record_id)] = record
+                bisect.insort(keys, (record[field], record_id))
+
+    def _instant(self, name: str, now: datetime) -> Key:
+        # Chave mínima do instante: as tarefas são comparadas pelo dia
+        return (now.date() if name == "tasks" else now, "")
+
+    def _slice(self, name: str, start: int, stop: Optional[int]) -> List[Dict]:
+        return [self._records[(name, i)] for _, i in self._keys[name][start:stop]]
+
+    def upcoming(self, name: str, now: datetime, limit: int) -> List[Dict]:
+        """Return the next ``limit`` open records from ``now`` on."""
+        with self._lock:
+            start = bisect.bisect_left(self._keys[name], self._instant(name, now))
+            records = self._slice(name, start, start + limit)
+            if name != "events" or not self._series:
+                return records
+            # Cada série gera ocorrências só até o limite ser preenchido
+            following = [
+                recurrence.occurrences_after(record, now)
+                for record in self._series.values()
+            ]
+            merged = heapq.merge(records, *following, key=lambda r: r["Data"])
+            return list(itertools.islice(merged, limit))
+
+    def overdue(
+        self, name: str, now: datetime, limit: Optional[int] = None
+    ) -> List[Dict]:
+        """Return open records dated before ``now``, oldest first."""
+        with self._lock:
+            stop = bisect.bisect_left(self._keys[name], self._instant(name, now))
+            return self._slice(name, 0, stop if limit is None else min(stop, limit))
+
+    def overdue_count(self, name: str, now: datetime) -> int:
+        """Return how many open records are dated before ``now``."""
+        with self._lock:
+            return bisect.bisect_left(self._keys[name], self._instant(name, now))
+
+    def due_within(self, name: str, now: datetime, days: int) -> List[Dict]:
+        """Return open records from ``now`` up to ``days`` days ahead."""
+        with self._lock:
+            keys = self._keys[name]
+            start = bisect.bisect_left(keys, self._instant(name, now))
+            end = now + timedelta(days=days)
+            if name == "tasks":
+                # O último dia entra inteiro
+                limit: Key = (end.date() + timedelta(days=1), "")
+            else:
+                limit = (end, "")
+            records = self._slice(name, start, bisect.bisect_left(keys, limit))
+            if name == "events" and self._series:
+                records += _series_between(self._series, now, end)
+                records.sort(key=lambda r: r["Data"])
+            return records
+
+
+_index: Optional[DeadlineIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_deadline_index() -> DeadlineIndex:
+    """Return the process-wide deadline index over the shared repository."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = DeadlineIndex(storage.get_repository())
+    return _index
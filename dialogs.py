@@ -0,0 +1,653 @@
+import streamlit as st
+from datetime import datetime, date
+from typing import Dict, Optional
+
+import google_utils
+import recurrence
+import storage
+from ui import (
+    business_day_inputs,
+    business_day_value,
+    close_dialog,
+    form_values,
+    recurrence_inputs,
+    recurrence_value,
+    show_form_error,
+    sync_record,
+)
+
+
+def add_client(name, email, phone, notes):
+    record = {
+        "id": storage.new_id(),
+        "Nome": name,
+        "Email": email,
+        "Telefone": phone,
+        "Anotações": notes,
+    }
+    st.session_state.clients.append(record)
+    sync_record("clients", record)
+
+
+def add_case(client, process_number, parties, lawyer, start_date, status):
+    record = {
+        "id": storage.new_id(),
+        "Cliente": client,
+        "Processo": process_number,
+        "Partes": parties,
+        "Advogado": lawyer,
+        "Data de Abertura": start_date,
+        "Status": status,
+    }
+    st.session_state.cases.append(record)
+    sync_record("cases", record)
+
+
+def add_task(description, priority, due_date, client, related_case, counting=None):
+    start, days, calendar_name = counting or (None, None, None)
+    record = {
+        "id": storage.new_id(),
+        "Descrição": description,
+        "Prioridade": priority,
+        "Prazo": due_date,
+        "Cliente": client,
+        "Caso": related_case,
+        "Início": start,
+        "Dias úteis": days,
+        "Calendário": calendar_name,
+        "Status": "Pendente",
+    }
+    st.session_state.tasks.append(record)
+    sync_record("tasks", record)
+
+
+def add_event(
+    title,
+    event_type,
+    event_datetime,
+    location,
+    client,
+    case,
+    status,
+    description,
+    rule=None,
+):
+    record = {
+        "id": storage.new_id(),
+        "Título": title,
+        "Tipo": event_type,
+        "Data": event_datetime,
+        "Local": location,
+        "Cliente": client,
+        "Caso": case,
+        "Status": status,
+        "Descrição": description,
+        "Recorrência": rule,
+        "Exceções": None,
+    }
+    st.session_state.events.append(record)
+    sync_record("events", record)
+
+
+def add_transaction(
+    kind, category, amount, description, trans_date, payment_status, client, case
+):
+    record = {
+        "id": storage.new_id(),
+        "Tipo": kind,
+        "Categoria": category,
+        "Valor": amount,
+        "Descrição": description,
+        "Data": trans_date,
+        "Status": payment_status,
+        "Cliente": client,
+        "Caso": case,
+    }
+    st.session_state.transactions.append(record)
+    sync_record("transactions", record)
+
+
+def add_document(client, case, title, file, link=""):
+    record = {
+        "id": storage.new_id(),
+        "Cliente": client,
+        "Caso": case,
+        "Título": title,
+        "Arquivo": file.name if file else "",
+        "Link": link,
+    }
+    st.session_state.documents.append(record)
+    sync_record("documents", record)
+
+
+# Dialogs for data entry
+# Salvar grava num callback, que lê os campos pelas chaves ``{form}_<campo>`` e
+# reexecuta só a lista que abriu o diálogo: é isso que fecha o diálogo
+def optional(value):
+    """Return None for the "Nenhum" choice of a link selectbox."""
+    return None if value == "Nenhum" else value
+
+
+@st.dialog("Adicionar Cliente")
+def dialog_add_client(fragment=None):
+    form = "add_client"
+    st.text_input("Nome Completo *", key=f"{form}_name")
+    st.text_input("E-mail", key=f"{form}_email")
+    st.text_input("Telefone", key=f"{form}_phone")
+    st.text_area("Anotações / Preferências", key=f"{form}_notes")
+    st.button("Salvar", on_click=save_client, args=(form, fragment))
+
+
+def save_client(form: str, fragment) -> None:
+    v = form_values(form)
+    add_client(v["name"], v["email"], v["phone"], v["notes"])
+    close_dialog(form, fragment, "Cliente adicionado")
+
+
+@st.dialog("Adicionar Caso", width="large")
+def dialog_add_case(fragment=None):
+    form = "add_case"
+    if st.session_state.clients:
+        st.selectbox(
+            "Cliente *", st.session_state.clients.values("Nome"), key=f"{form}_client"
+        )
+    else:
+        st.text_input("Cliente *", key=f"{form}_client")
+    st.text_input("Nº do Processo *", key=f"{form}_process")
+    st.text_area("Partes Envolvidas", key=f"{form}_parties")
+    st.text_input("Advogado Responsável", key=f"{form}_lawyer")
+    st.date_input("Data de Abertura", value=date.today(), key=f"{form}_start")
+    st.selectbox("Status", ["Ativo", "Encerrado", "Suspenso"], key=f"{form}_status")
+    st.button("Salvar", on_click=save_case, args=(form, fragment))
+
+
+def save_case(form: str, fragment) -> None:
+    v = form_values(form)
+    add_case(
+        v["client"], v["process"], v["parties"], v["lawyer"], v["start"], v["status"]
+    )
+    close_dialog(form, fragment, "Caso adicionado")
+
+
+@st.dialog("Anexar Documento", width="large")
+def dialog_add_document(fragment=None):
+    form = "add_document"
+    show_form_error(form)
+    if st.session_state.clients:
+        st.selectbox(
+            "Cliente *", st.session_state.clients.values("Nome"), key=f"{form}_client"
+        )
+    else:
+        st.text_input("Cliente *", key=f"{form}_client")
+    st.selectbox(
+        "Vincular ao Caso (opcional)",
+        ["Nenhum"] + st.session_state.cases.values("Processo"),
+        key=f"{form}_case",
+    )
+    st.text_input("Título / Descrição *", key=f"{form}_title")
+    st.file_uploader("Arquivo *", key=f"{form}_file")
+    st.button("Salvar", on_click=save_document, args=(form, fragment))
+
+
+def save_document(form: str, fragment) -> None:
+    v = form_values(form)
+    file = v["file"]
+    link = ""
+    if file and google_utils.is_configured():
+        try:
+            link = google_utils.upload_file_stream(file, file.name, v["client"])
+        except Exception as exc:
+            st.session_state[f"{form}_error"] = (
+                f"Falha no envio: {exc}. Clique em Salvar para retomar."
+            )
+            return
+    add_document(v["client"], optional(v["case"]), v["title"], file, link)
+    close_dialog(form, fragment, "Documento anexado")
+
+
+@st.dialog("Adicionar Evento", width="large")
+def dialog_add_event(fragment=None):
+    form = "add_event"
+    st.text_input("Título *", key=f"{form}_title")
+    st.selectbox(
+        "Tipo de Evento *", ["Audiência", "Prazo", "Reunião"], key=f"{form}_type"
+    )
+    if business_day_inputs(key=f"{form}_deadline") is None:
+        st.date_input("Data *", value=date.today(), key=f"{form}_day")
+    st.time_input("Hora *", value=datetime.now().time(), key=f"{form}_time")
+    st.text_input("Local / Link", key=f"{form}_location")
+    st.selectbox(
+        "Vincular ao Cliente",
+        ["Nenhum"] + st.session_state.clients.values("Nome"),
+        key=f"{form}_client",
+    )
+    st.selectbox(
+        "Vincular ao Caso",
+        ["Nenhum"] + st.session_state.cases.values("Processo"),
+        key=f"{form}_case",
+    )
+    st.selectbox(
+        "Status",
+        ["Agendado", "Concluído", "Cancelado"],
+        key=f"{form}_status",
+    )
+    st.text_area("Descrição", key=f"{form}_description")
+    recurrence_inputs(key=f"{form}_rule")
+    st.button("Salvar", on_click=save_event, args=(form, fragment))
+
+
+def save_event(form: str, fragment) -> None:
+    v = form_values(form)
+    counting = business_day_value(f"{form}_deadline")
+    event_day = v["day"] if counting is None else counting[3]
+    event_time = v["time"]
+    if isinstance(event_day, datetime):
+        event_day = event_day.date()
+    if isinstance(event_time, datetime):
+        event_time = event_time.time()
+    add_event(
+        v["title"],
+        v["type"],
+        datetime.combine(event_day, event_time),
+        v["location"],
+        optional(v["client"]),
+        optional(v["case"]),
+        v["status"],
+        v["description"],
+        recurrence_value(f"{form}_rule"),
+    )
+    close_dialog(form, fragment, "Evento adicionado")
+
+
+@st.dialog("Adicionar Tarefa")
+def dialog_add_task(fragment=None):
+    form = "add_task"
+    st.text_input("Descrição *", key=f"{form}_description")
+    st.selectbox("Prioridade", ["Baixa", "Média", "Alta"], key=f"{form}_priority")
+    if business_day_inputs(key=f"{form}_deadline") is None:
+        st.date_input("Data do Prazo", value=date.today(), key=f"{form}_due")
+    st.selectbox(
+        "Vincular ao Cliente",
+        ["Nenhum"] + st.session_state.clients.values("Nome"),
+        key=f"{form}_client",
+    )
+    st.selectbox(
+        "Vincular ao Caso",
+        ["Nenhum"] + st.session_state.cases.values("Processo"),
+        key=f"{form}_case",
+    )
+    st.button("Salvar", on_click=save_task, args=(form, fragment))
+
+
+def save_task(form: str, fragment) -> None:
+    v = form_values(form)
+    counting = business_day_value(f"{form}_deadline")
+    add_task(
+        v["description"],
+        v["priority"],
+        v["due"] if counting is None else counting[3],
+        optional(v["client"]),
+        optional(v["case"]),
+        counting[:3] if counting else None,
+    )
+    close_dialog(form, fragment, "Tarefa adicionada")
+
+
+def transaction_inputs(form: str) -> None:
+    """Render the fields shared by the income and expense dialogs."""
+    st.text_input("Categoria *", value="Honorários", key=f"{form}_category")
+    st.number_input("Valor (R$) *", min_value=0.0, step=0.01, key=f"{form}_amount")
+    st.text_input("Descrição *", key=f"{form}_description")
+    st.date_input("Data *", value=date.today(), key=f"{form}_date")
+    st.selectbox("Status Pagamento", ["Pendente", "Pago"], key=f"{form}_status")
+    st.selectbox(
+        "Vincular ao Cliente",
+        ["Nenhum"] + st.session_state.clients.values("Nome"),
+        key=f"{form}_client",
+    )
+    st.selectbox(
+        "Vincular ao Caso",
+        ["Nenhum"] + st.session_state.cases.values("Processo"),
+        key=f"{form}_case",
+    )
+
+
+def save_transaction(kind: str, form: str, fragment, message: str) -> None:
+    v = form_values(form)
+    add_transaction(
+        kind,
+        v["category"],
+        v["amount"],
+        v["description"],
+        v["date"],
+        v["status"],
+        optional(v["client"]),
+        optional(v["case"]),
+    )
+    close_dialog(form, fragment, message)
+
+
+@st.dialog("Registrar Receita")
+def dialog_add_income(fragment=None):
+    form = "add_income"
+    transaction_inputs(form)
+    st.button(
+        "Salvar",
+        on_click=save_transaction,
+        args=("Receita", form, fragment, "Receita registrada"),
+    )
+
+
+@st.dialog("Registrar Despesa")
+def dialog_add_expense(fragment=None):
+    form = "add_expense"
+    transaction_inputs(form)
+    st.button(
+        "Salvar",
+        on_click=save_transaction,
+        args=("Despesa", form, fragment, "Despesa registrada"),
+    )
+
+
+# Dialogs for editing existing records
+CONFLICT_MESSAGE = (
+    "Outra pessoa alterou ou excluiu este registro depois que ele foi aberto. "
+    "Feche e abra novamente para editar a versão atual."
+)
+
+
+def open_edit_dialog(collection: str, record_id: str, fragment=None) -> None:
+    """Open the edit dialog of a record at the version stored right now.
+
+    ``fragment`` is the fragment (or fragments) rerun when the edit is
+    saved; it must include the one this is called from.
+    """
+    version = st.session_state[collection].version(record_id)
+    EDIT_DIALOGS[collection](record_id, version, fragment=fragment)
+
+
+def save_edit(
+    collection: str,
+    record_id: str,
+    version: Optional[int],
+    record: Dict,
+    form: str,
+    fragment,
+    message: str,
+) -> None:
+    """Save an edit dialog unless the record changed since it was opened.
+
+    On a conflict the dialog stays open and shows :data:`CONFLICT_MESSAGE`.
+    """
+    try:
+        st.session_state[collection].update(record_id, record, version=version)
+    except storage.ConflictError:
+        st.session_state[f"{form}_error"] = CONFLICT_MESSAGE
+        return
+    close_dialog(form, fragment, message)
+
+
+@st.dialog("Editar Cliente", width="large")
+def dialog_edit_client(record_id: str, version: Optional[int] = None, fragment=None):
+    c = st.session_state.clients.get(record_id)
+    if c is None:
+        st.warning("Este registro foi excluído.")
+        return
+    form = f"edit_client_{record_id}"
+    show_form_error(form)
+    st.text_input("Nome Completo *", value=c["Nome"], key=f"{form}_name")
+    st.text_input("E-mail", value=c["Email"], key=f"{form}_email")
+    st.text_input("Telefone", value=c["Telefone"], key=f"{form}_phone")
+    st.text_area(
+        "Anotações / Preferências",
+        value=c["Anotações"],
+        key=f"{form}_notes",
+    )
+    st.button(
+        "Salvar",
+        on_click=save_client_edit,
+        args=(record_id, version, form, fragment),
+    )
+
+
+def save_client_edit(record_id: str, version, form: str, fragment) -> None:
+    v = form_values(form)
+    save_edit(
+        "clients",
+        record_id,
+        version,
+        {
+            "Nome": v["name"],
+            "Email": v["email"],
+            "Telefone": v["phone"],
+            "Anotações": v["notes"],
+        },
+        form,
+        fragment,
+        "Cliente atualizado",
+    )
+
+
+@st.dialog("Editar Caso", width="large")
+def dialog_edit_case(record_id: str, version: Optional[int] = None, fragment=None):
+    c = st.session_state.cases.get(record_id)
+    if c is None:
+        st.warning("Este registro foi excluído.")
+        return
+    form = f"edit_case_{record_id}"
+    show_form_error(form)
+    st.text_input("Cliente *", value=c["Cliente"], key=f"{form}_client")
+    st.text_input("Nº do Processo *", value=c["Processo"], key=f"{form}_process")
+    st.text_area("Partes Envolvidas", value=c["Partes"], key=f"{form}_parties")
+    st.text_input("Advogado Responsável", value=c["Advogado"], key=f"{form}_lawyer")
+    st.date_input("Data de Abertura", value=c["Data de Abertura"], key=f"{form}_start")
+    st.selectbox(
+        "Status",
+        ["Ativo", "Encerrado", "Suspenso"],
+        index=["Ativo", "Encerrado", "Suspenso"].index(c["Status"]),
+        key=f"{form}_status",
+    )
+    st.button(
+        "Salvar", on_click=save_case_edit, args=(record_id, version, form, fragment)
+    )
+
+
+def save_case_edit(record_id: str, version, form: str, fragment) -> None:
+    v = form_values(form)
+    save_edit(
+        "cases",
+        record_id,
+        version,
+        {
+            "Cliente": v["client"],
+            "Processo": v["process"],
+            "Partes": v["parties"],
+            "Advogado": v["lawyer"],
+            "Data de Abertura": v["start"],
+            "Status": v["status"],
+        },
+        form,
+        fragment,
+        "Caso atualizado",
+    )
+
+
+@st.dialog("Editar Documento", width="large")
+def dialog_edit_document(record_id: str, version: Optional[int] = None, fragment=None):
+    d = st.session_state.documents.get(record_id)
+    if d is None:
+        st.warning("Este registro foi excluído.")
+        return
+    form = f"edit_document_{record_id}"
+    show_form_error(form)
+    st.text_input("Cliente *", value=d["Cliente"], key=f"{form}_client")
+    st.text_input("Caso", value=d["Caso"] or "", key=f"{form}_case")
+    st.text_input("Título / Descrição *", value=d["Título"], key=f"{form}_title")
+    st.button(
+        "Salvar",
+        on_click=save_document_edit,
+        args=(record_id, version, d, form, fragment),
+    )
+
+
+def save_document_edit(record_id: str, version, d: Dict, form: str, fragment):
+    v = form_values(form)
+    save_edit(
+        "documents",
+        record_id,
+        version,
+        {
+            "Cliente": v["client"],
+            "Caso": v["case"] if v["case"] else None,
+            "Título": v["title"],
+            "Arquivo": d.get("Arquivo", ""),
+            "Link": d.get("Link", ""),
+        },
+        form,
+        fragment,
+        "Documento atualizado",
+    )
+
+
+@st.dialog("Editar Evento", width="large")
+def dialog_edit_event(record_id: str, version: Optional[int] = None, fragment=None):
+    ev = st.session_state.events.get(record_id)
+    if ev is None:
+        st.warning("Este registro foi excluído.")
+        return
+    form = f"edit_event_{record_id}"
+    show_form_error(form)
+    st.text_input("Título *", value=ev["Título"], key=f"{form}_title")
+    st.selectbox(
+        "Tipo de Evento *",
+        ["Audiência", "Prazo", "Reunião"],
+        index=["Audiência", "Prazo", "Reunião"].index(ev["Tipo"]),
+        key=f"{form}_type",
+    )
+    st.date_input("Data *", value=ev["Data"].date(), key=f"{form}_day")
+    st.time_input("Hora *", value=ev["Data"].time(), key=f"{form}_time")
+    st.text_input("Local / Link", value=ev["Local"], key=f"{form}_location")
+    st.text_input("Cliente", value=ev["Cliente"] or "", key=f"{form}_client")
+    st.text_input("Caso", value=ev["Caso"] or "", key=f"{form}_case")
+    st.selectbox(
+        "Status",
+        ["Agendado", "Concluído", "Cancelado"],
+        index=["Agendado", "Concluído", "Cancelado"].index(ev["Status"]),
+        key=f"{form}_status",
+    )
+    st.text_area("Descrição", value=ev["Descrição"], key=f"{form}_description")
+    skipped = list(recurrence.parse_exceptions(ev["Exceções"]))
+    if ev["Recorrência"]:
+        st.caption(f"Repete: {recurrence.describe(ev['Recorrência'])}")
+        if st.checkbox("Alterar repetição", key=f"{form}_change_rule"):
+            recurrence_inputs(key=f"{form}_rule")
+        if skipped:
+            st.multiselect(
+                "Datas puladas",
+                skipped,
+                default=skipped,
+                format_func=lambda d: d.strftime("%d/%m/%Y"),
+                key=f"{form}_skipped",
+            )
+    else:
+        recurrence_inputs(key=f"{form}_rule")
+    st.button(
+        "Salvar",
+        on_click=save_event_edit,
+        args=(record_id, version, ev, form, fragment),
+    )
+
+
+def save_event_edit(record_id: str, version, ev: Dict, form: str, fragment):
+    v = form_values(form)
+    rule = ev["Recorrência"]
+    if not rule or v.get("change_rule"):
+        rule = recurrence_value(f"{form}_rule")
+    skipped = v.get("skipped", list(recurrence.parse_exceptions(ev["Exceções"])))
+    save_edit(
+        "events",
+        record_id,
+        version,
+        {
+            "Título": v["title"],
+            "Tipo": v["type"],
+            "Data": datetime.combine(v["day"], v["time"]),
+            "Local": v["location"],
+            "Cliente": v["client"] if v["client"] else None,
+            "Caso": v["case"] if v["case"] else None,
+            "Status": v["status"],
+            "Descrição": v["description"],
+            "Recorrência": rule,
+            "Exceções": recurrence.format_exceptions(skipped) if rule else None,
+        },
+        form,
+        fragment,
+        "Evento atualizado",
+    )
+
+
+@st.dialog("Editar Tarefa", width="large")
+def dialog_edit_task(record_id: str, version: Optional[int] = None, fragment=None):
+    t = st.session_state.tasks.get(record_id)
+    if t is None:
+        st.warning("Este registro foi excluído.")
+        return
+    form = f"edit_task_{record_id}"
+    show_form_error(form)
+    st.text_input("Descrição *", value=t["Descrição"], key=f"{form}_description")
+    st.selectbox(
+        "Prioridade",
+        ["Baixa", "Média", "Alta"],
+        index=["Baixa", "Média", "Alta"].index(t["Prioridade"]),
+        key=f"{form}_priority",
+    )
+    counting = business_day_inputs(
+        t["Início"], t["Dias úteis"], t["Calendário"], key=f"{form}_deadline"
+    )
+    if counting is None:
+        st.date_input("Data do Prazo", value=t["Prazo"], key=f"{form}_due")
+    st.text_input("Cliente", value=t["Cliente"] or "", key=f"{form}_client")
+    st.text_input("Caso", value=t["Caso"] or "", key=f"{form}_case")
+    st.selectbox(
+        "Status",
+        ["Pendente", "Concluída"],
+        index=["Pendente", "Concluída"].index(t["Status"] or "Pendente"),
+        key=f"{form}_status",
+    )
+    st.button(
+        "Salvar", on_click=save_task_edit, args=(record_id, version, form, fragment)
+    )
+
+
+def save_task_edit(record_id: str, version, form: str, fragment) -> None:
+    v = form_values(form)
+    counting = business_day_value(f"{form}_deadline")
+    start, days, calendar_name, due_date = counting or (None, None, None, v["due"])
+    save_edit(
+        "tasks",
+        record_id,
+        version,
+        {
+            "Descrição": v["description"],
+            "Prioridade": v["priority"],
+            "Prazo": due_date,
+            "Cliente": v["client"] if v["client"] else None,
+            "Caso": v["case"] if v["case"] else None,
+            "Início": start,
+            "Dias úteis": days,
+            "Calendário": calendar_name,
+            "Status": v["status"],
+        },
+        form,
+        fragment,
+        "Tarefa atualizada",
+    )
+
+
+EDIT_DIALOGS = {
+    "clients": dialog_edit_client,
+    "cases": dialog_edit_case,
+    "documents": dialog_edit_document,
+    "events": dialog_edit_event,
+    "tasks": dialog_edit_task,
+}
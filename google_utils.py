@@ -1,38 +1,64 @@
 import os
 import json
-from typing import List, Dict, Optional
+import time
+import uuid
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, BinaryIO, Callable, List, Dict, Optional, Tuple
 
 import requests
 import streamlit as st
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-APPS_SCRIPT_URL = os.environ.get("APPS_SCRIPT_URL") or st.secrets.get("APPS_SCRIPT_URL")
 
+def _get_setting(name: str, default: Optional[str] = None) -> Optional[str]:
+    """Read a setting from the environment or from Streamlit secrets."""
+    value = os.environ.get(name)
+    if value:
+        return value
+    try:
+        return st.secrets.get(name, default)
+    except Exception:
+        # Sem secrets.toml o Streamlit levanta erro ao acessar st.secrets
+        return default
 
-def _call_apps_script(action: str, payload: Optional[dict] = None, files=None):
-    """Send a request to the configured Apps Script URL."""
-    if not APPS_SCRIPT_URL:
-        raise RuntimeError("APPS_SCRIPT_URL not configured")
-    data = {"action": action}
-    if payload:
-        data.update(payload)
-    resp = requests.post(APPS_SCRIPT_URL, data=data, files=files, timeout=30)
-    resp.raise_for_status()
+
+APPS_SCRIPT_URL = _get_setting("APPS_SCRIPT_URL")
+
+CONNECT_TIMEOUT = float(_get_setting("APPS_SCRIPT_CONNECT_TIMEOUT", "5"))
+READ_TIMEOUT = float(_get_setting("APPS_SCRIPT_READ_TIMEOUT", "30"))
+MAX_RETRIES = int(_get_setting("APPS_SCRIPT_MAX_RETRIES", "3"))
+BACKOFF_FACTOR = float(_get_setting("APPS_SCRIPT_BACKOFF_FACTOR", "0.5"))
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+CACHE_TTL = float(_get_setting("APPS_SCRIPT_CACHE_TTL", "60"))
+CACHE_MAX_ROWS = int(_get_setting("APPS_SCRIPT_CACHE_MAX_ROWS", "200000"))
+
+UPLOAD_CHUNK_SIZE = int(
+    _get_setting("APPS_SCRIPT_UPLOAD_CHUNK_SIZE", str(4 * 1024 * 1024))
+)
+UPLOAD_WORKERS = int(_get_setting("APPS_SCRIPT_UPLOAD_WORKERS", "3"))
+
+
+class StaleCursorError(Exception):
+    """Raised when a ``load_rows_since`` cursor no longer matches the sheet."""
+
+    def __init__(self, sheet_name: str):
+        super().__init__(f"cursor de {sheet_name} desatualizado")
+        self.sheet_name = sheet_name
+
+
+def _parse_response(resp: requests.Response):
     try:
         return resp.json()
     except ValueError:
         return resp.text
 
 
-def append_rows(sheet_name: str, rows: List[List]):
-    """Append rows to a sheet via Apps Script."""
-    payload = {"sheet": sheet_name, "rows": json.dumps(rows)}
-    _call_apps_script("append_rows", payload)
-
-
-def load_rows(sheet_name: str) -> List[Dict]:
-    """Load all rows from a sheet via Apps Script."""
-    payload = {"sheet": sheet_name}
-    result = _call_apps_script("load_rows", payload)
+def _rows_from_result(result) -> List[Dict]:
     if isinstance(result, dict) and "data" in result:
         return result["data"]
     if isinstance(result, list):
@@ -40,11 +66,590 @@ def load_rows(sheet_name: str) -> List[Dict]:
     return []
 
 
-def upload_file(file_bytes: bytes, filename: str, client_name: str) -> str:
-    """Upload a file via Apps Script and return the created link."""
-    files = {"file": (filename, file_bytes)}
-    payload = {"filename": filename, "client": client_name}
-    result = _call_apps_script("upload_file", payload, files=files)
+def _version_from_result(result) -> Optional[str]:
+    if isinstance(result, dict) and result.get("version") is not None:
+        return str(result["version"])
+    return None
+
+
+def _link_from_result(result) -> str:
     if isinstance(result, dict):
         return result.get("link", "")
     return str(result)
+
+
+def _new_keys(rows: List[List]) -> List[str]:
+    """Return one random idempotency key per row."""
+    return [uuid.uuid4().hex for _ in rows]
+
+
+def _session(retry: Retry, pool_maxsize: int) -> requests.Session:
+    adapter = HTTPAdapter(
+        pool_connections=1, pool_maxsize=pool_maxsize, max_retries=retry
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def _copy_rows(rows: List[Dict]) -> List[Dict]:
+    """Return a new list with a shallow copy of each row."""
+    return [dict(row) for row in rows]
+
+
+def _hash_stream(fileobj: BinaryIO, chunk_size: int) -> Tuple[str, int]:
+    """Return the SHA-256 and size of a file object, reading it in chunks."""
+    digest = hashlib.sha256()
+    size = 0
+    fileobj.seek(0)
+    while True:
+        chunk = fileobj.read(chunk_size)
+        if not chunk:
+            break
+        digest.update(chunk)
+        size += len(chunk)
+    fileobj.seek(0)
+    return digest.hexdigest(), size
+
+
+class SheetCache:
+    """Thread-safe LRU cache of sheet rows shared by every session.
+
+    Entries are served directly while younger than ``ttl`` seconds. Older
+    entries are revalidated by sending the cached version to Apps Script,
+    which may answer ``{"not_modified": true}`` instead of resending the
+    rows. Memory is bounded by the total number of cached rows.
+    """
+
+    def __init__(self, ttl: float = CACHE_TTL, max_rows: int = CACHE_MAX_ROWS):
+        self.ttl = ttl
+        self.max_rows = max_rows
+        # sheet -> (rows, version, fetched_at)
+        self._entries: "OrderedDict[str, Tuple[List[Dict], Optional[str], float]]" = (
+            OrderedDict()
+        )
+        self._total_rows = 0
+        self._lock = threading.Lock()
+        self._fetch_locks: Dict[str, threading.Lock] = {}
+        # Contador de invalidações, evita gravar dados buscados antes de um append
+        self._generations: Dict[str, int] = {}
+
+    def get(
+        self,
+        sheet_name: str,
+        fetch: Callable[[Optional[str]], Tuple[Optional[List[Dict]], Optional[str]]],
+    ) -> List[Dict]:
+        """Return cached rows, calling ``fetch(known_version)`` when stale.
+
+        ``fetch`` returns ``(rows, version)``; ``rows`` is ``None`` when the
+        server confirmed that ``known_version`` is still current. Every call
+        gets its own copy of the rows, so a session changing them does not
+        change what the other sessions see.
+        """
+        entry = self._lookup(sheet_name)
+        if entry and time.monotonic() - entry[2] < self.ttl:
+            return _copy_rows(entry[0])
+        with self._lock:
+            fetch_lock = self._fetch_locks.setdefault(sheet_name, threading.Lock())
+        with fetch_lock:
+            # Outra sessão pode ter atualizado a entrada enquanto esperávamos
+            entry = self._lookup(sheet_name)
+            if entry and time.monotonic() - entry[2] < self.ttl:
+                return _copy_rows(entry[0])
+            known_version = entry[1] if entry else None
+            generation = self._generations.get(sheet_name, 0)
+            rows, version = fetch(known_version)
+            if rows is None and entry is not None:
+                rows = entry[0]
+            self.put(sheet_name, rows or [], version, generation)
+            return _copy_rows(rows or [])
+
+    def put(
+        self,
+        sheet_name: str,
+        rows: List[Dict],
+        version: Optional[str],
+        generation: Optional[int] = None,
+    ) -> None:
+        with self._lock:
+            if generation is not None and generation != self._generations.get(
+                sheet_name, 0
+            ):
+                return
+            self._discard(sheet_name)
+            if len(rows) > self.max_rows:
+                return
+            self._entries[sheet_name] = (rows, version, time.monotonic())
+            self._total_rows += len(rows)
+            while self._total_rows > self.max_rows and self._entries:
+                oldest = next(iter(self._entries))
+                self._discard(oldest)
+
+    def invalidate(self, sheet_name: Optional[str] = None) -> None:
+        """Drop one sheet (or every sheet) from the cache."""
+        with self._lock:
+            names = list(self._entries) if sheet_name is None else [sheet_name]
+            for name in names:
+                self._generations[name] = self._generations.get(name, 0) + 1
+                self._discard(name)
+
+    def _lookup(self, sheet_name: str):
+        with self._lock:
+            entry = self._entries.get(sheet_name)
+            if entry is not None:
+                self._entries.move_to_end(sheet_name)
+            return entry
+
+    def _discard(self, sheet_name: str) -> None:
+        entry = self._entries.pop(sheet_name, None)
+        if entry is not None:
+            self._total_rows -= len(entry[0])
+
+
+class AppsScriptClient:
+    """Apps Script client reusing keep-alive connections and retrying failures.
+
+    Requests answered with 429 or 5xx (and connection errors) are retried with
+    exponential backoff, honouring ``Retry-After`` when the server sends it.
+    A 5xx or a read timeout may come after the script already ran, so every
+    append carries idempotency keys, and actions that cannot be deduplicated
+    (``upload_file``, ``upload_finish``) are only retried when the script
+    surely did not run them: connection errors and 429.
+    """
+
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        connect_timeout: float = CONNECT_TIMEOUT,
+        read_timeout: float = READ_TIMEOUT,
+        max_retries: int = MAX_RETRIES,
+        backoff_factor: float = BACKOFF_FACTOR,
+        pool_maxsize: int = 10,
+        cache: Optional[SheetCache] = None,
+    ):
+        self.url = url or APPS_SCRIPT_URL
+        self.cache = cache
+        # (cliente, sha256) -> link dos arquivos já enviados / upload em aberto
+        self._uploaded: Dict[Tuple[str, str], str] = {}
+        self._open_uploads: Dict[Tuple[str, str], str] = {}
+        self._uploads_lock = threading.Lock()
+        self.timeout: Tuple[float, float] = (connect_timeout, read_timeout)
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset({"GET", "POST"}),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        self.session = _session(retry, pool_maxsize)
+        # Sem novas tentativas após leitura ou 5xx: a ação pode já ter rodado
+        self._once_session = _session(
+            retry.new(read=0, status_forcelist=(429,)), pool_maxsize
+        )
+
+    def call(
+        self,
+        action: str,
+        payload: Optional[dict] = None,
+        files=None,
+        idempotent: bool = True,
+    ):
+        """Send a single action to the Apps Script URL.
+
+        Pass ``idempotent=False`` for actions that must not run twice; they
+        are not retried after a read error or a 5xx answer.
+        """
+        if not self.url:
+            raise RuntimeError("APPS_SCRIPT_URL not configured")
+        data = {"action": action}
+        if payload:
+            data.update(payload)
+        session = self.session if idempotent else self._once_session
+        resp = session.post(self.url, data=data, files=files, timeout=self.timeout)
+        resp.raise_for_status()
+        return _parse_response(resp)
+
+    def append_rows(
+        self, sheet_name: str, rows: List[List], keys: Optional[List[str]] = None
+    ):
+        """Append rows to a sheet.
+
+        ``keys`` are idempotency keys, one per row, that let the Apps Script
+        skip rows it has already written when a request is retried; random
+        keys are generated when none are given.
+        """
+        payload = {
+            "sheet": sheet_name,
+            "rows": json.dumps(rows),
+            "keys": json.dumps(keys if keys is not None else _new_keys(rows)),
+        }
+        try:
+            return self.call("append_rows", payload)
+        finally:
+            if self.cache is not None:
+                self.cache.invalidate(sheet_name)
+
+    def fetch_rows(
+        self, sheet_name: str, known_version: Optional[str] = None
+    ) -> Tuple[Optional[List[Dict]], Optional[str]]:
+        """Load a sheet, skipping the download if ``known_version`` is current.
+
+        Returns ``(rows, version)``, with ``rows`` set to ``None`` when the
+        Apps Script reports that the sheet has not changed.
+        """
+        payload = {"sheet": sheet_name}
+        if known_version is not None:
+            payload["if_version"] = known_version
+        result = self.call("load_rows", payload)
+        version = _version_from_result(result)
+        if isinstance(result, dict) and result.get("not_modified"):
+            return None, version or known_version
+        return _rows_from_result(result), version
+
+    def load_rows(self, sheet_name: str, use_cache: bool = True) -> List[Dict]:
+        """Load all rows from a sheet, through the cache when available."""
+        if self.cache is None or not use_cache:
+            return self.fetch_rows(sheet_name)[0] or []
+        return self.cache.get(
+            sheet_name, lambda version: self.fetch_rows(sheet_name, version)
+        )
+
+    def load_rows_since(
+        self, sheet_name: str, cursor: Optional[Dict[str, Any]] = None
+    ) -> Tuple[List[Dict], Dict[str, Any]]:
+        """Load only the rows appended or changed after ``cursor``.
+
+        ``cursor`` is the dict returned by the previous call (``None`` loads
+        everything). The Apps Script receives the last seen row number in
+        ``since_row`` and modification watermark in ``since`` and answers
+        ``{"data": [...], "last_row": N, "updated_at": "..."}``, with each row
+        carrying its sheet row number in ``_row``; a row cleared since the
+        cursor comes as ``{"_row": N, "_deleted": true}``. A response without
+        ``last_row`` is a full snapshot and yields a cursor without ``row``.
+
+        Raises :class:`StaleCursorError` when the script answers
+        ``{"stale": true}`` or its last row is above the cursor's: rows were
+        removed and the ones below moved up, so row numbers seen before no
+        longer point to the same records.
+        """
+        cursor = cursor or {}
+        payload: Dict[str, Any] = {"sheet": sheet_name}
+        if cursor.get("row") is not None:
+            payload["since_row"] = cursor["row"]
+        if cursor.get("updated_at"):
+            payload["since"] = cursor["updated_at"]
+        result = self.call("load_rows_since", payload)
+        if isinstance(result, dict) and (
+            result.get("stale")
+            or cursor.get("row") is not None
+            and result.get("last_row") is not None
+            and int(result["last_row"]) < cursor["row"]
+        ):
+            raise StaleCursorError(sheet_name)
+        rows = _rows_from_result(result)
+        new_cursor: Dict[str, Any] = {}
+        if isinstance(result, dict) and result.get("last_row") is not None:
+            new_cursor["row"] = int(result["last_row"])
+            new_cursor["updated_at"] = result.get("updated_at") or cursor.get(
+                "updated_at"
+            )
+        return rows, new_cursor
+
+    def upload_file(self, file_bytes: bytes, filename: str, client_name: str) -> str:
+        """Upload a file and return the created link."""
+        files = {"file": (filename, file_bytes)}
+        payload = {"filename": filename, "client": client_name}
+        return _link_from_result(
+            self.call("upload_file", payload, files=files, idempotent=False)
+        )
+
+    def upload_stream(
+        self,
+        fileobj: BinaryIO,
+        filename: str,
+        client_name: str,
+        chunk_size: int = UPLOAD_CHUNK_SIZE,
+        workers: int = UPLOAD_WORKERS,
+    ) -> str:
+        """Upload a seekable file object in chunks and return the created link.
+
+        The content is hashed chunk by chunk first, so a file already sent
+        for the same client is answered from the local registry or by the
+        ``upload_lookup`` action without transferring it again. Otherwise
+        ``upload_start`` opens an upload, chunks are posted in parallel with
+        ``upload_chunk`` and ``upload_finish`` returns the link. If a chunk
+        fails, calling this again with the same file resumes the open upload,
+        sending only the chunks missing from ``upload_status``.
+        """
+        sha256, size = _hash_stream(fileobj, chunk_size)
+        key = (client_name, sha256)
+        with self._uploads_lock:
+            if key in self._uploaded:
+                return self._uploaded[key]
+            upload_id = self._open_uploads.get(key)
+
+        received: set = set()
+        if upload_id is None:
+            found = self.call(
+                "upload_lookup", {"client": client_name, "sha256": sha256}
+            )
+            link = _link_from_result(found) if isinstance(found, dict) else ""
+            if link:
+                with self._uploads_lock:
+                    self._uploaded[key] = link
+                return link
+            started = self.call(
+                "upload_start",
+                {
+                    "filename": filename,
+                    "client": client_name,
+                    "sha256": sha256,
+                    "size": size,
+                    "chunk_size": chunk_size,
+                },
+                idempotent=False,
+            )
+            if not isinstance(started, dict) or "upload_id" not in started:
+                raise RuntimeError("Unexpected upload_start response from Apps Script")
+            upload_id = str(started["upload_id"])
+            with self._uploads_lock:
+                self._open_uploads[key] = upload_id
+        else:
+            status = self.call("upload_status", {"upload_id": upload_id})
+            if isinstance(status, dict):
+                received = {int(i) for i in status.get("received", [])}
+
+        total_chunks = max(1, -(-size // chunk_size))
+        missing = [i for i in range(total_chunks) if i not in received]
+        read_lock = threading.Lock()
+
+        def send_chunk(index: int) -> None:
+            # Cada worker lê o seu pedaço apenas quando vai enviá-lo, então a
+            # memória fica limitada a workers * chunk_size
+            with read_lock:
+                fileobj.seek(index * chunk_size)
+                data = fileobj.read(chunk_size)
+            self.call(
+                "upload_chunk",
+                {
+                    "upload_id": upload_id,
+                    "index": index,
+                    "offset": index * chunk_size,
+                    "sha256": hashlib.sha256(data).hexdigest(),
+                },
+                files={"chunk": (f"{filename}.part{index}", data)},
+            )
+
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            list(pool.map(send_chunk, missing))
+
+        result = self.call(
+            "upload_finish",
+            {"upload_id": upload_id, "sha256": sha256, "chunks": total_chunks},
+            idempotent=False,
+        )
+        link = _link_from_result(result)
+        with self._uploads_lock:
+            self._open_uploads.pop(key, None)
+            self._uploaded[key] = link
+        return link
+
+    def batch(self) -> "AppsScriptBatch":
+        """Start a batch that sends several actions in one round-trip."""
+        return AppsScriptBatch(self)
+
+    def close(self) -> None:
+        self.session.close()
+        self._once_session.close()
+
+
+class AppsScriptBatch:
+    """Group ``append_rows``/``load_rows`` actions into a single request.
+
+    Each queued action returns its position in :attr:`results`, which is
+    filled when :meth:`send` runs (automatically at the end of a ``with``
+    block). The Apps Script must implement the ``batch`` action, answering
+    ``{"results": [...]}`` in the same order as the submitted actions.
+    """
+
+    def __init__(self, client: AppsScriptClient):
+        self.client = client
+        self.actions: List[Dict[str, Any]] = []
+        self.results: List[Any] = []
+
+    def _add(self, action: Dict[str, Any]) -> int:
+        self.actions.append(action)
+        return len(self.actions) - 1
+
+    def append_rows(
+        self, sheet_name: str, rows: List[List], keys: Optional[List[str]] = None
+    ) -> int:
+        return self._add(
+            {
+                "action": "append_rows",
+                "sheet": sheet_name,
+                "rows": rows,
+                "keys": keys if keys is not None else _new_keys(rows),
+            }
+        )
+
+    def load_rows(self, sheet_name: str) -> int:
+        return self._add({"action": "load_rows", "sheet": sheet_name})
+
+    def send(self) -> List[Any]:
+        """Send the queued actions and return their results in order."""
+        if not self.actions:
+            return []
+        result = self.client.call("batch", {"actions": json.dumps(self.actions)})
+        raw = result.get("results", []) if isinstance(result, dict) else result
+        if not isinstance(raw, list) or len(raw) != len(self.actions):
+            raise RuntimeError("Unexpected batch response from Apps Script")
+        self.results = []
+        cache = self.client.cache
+        for act, res in zip(self.actions, raw):
+            if act["action"] == "load_rows":
+                res = _rows_from_result(res)
+            elif cache is not None:
+                cache.invalidate(act["sheet"])
+            self.results.append(res)
+        self.actions = []
+        return self.results
+
+    def __enter__(self) -> "AppsScriptBatch":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.send()
+
+
+class SheetReplica:
+    """Local copy of a sheet kept up to date with ``load_rows_since`` deltas.
+
+    Rows are keyed by their sheet row number, so a delta overwrites changed
+    rows in place, appends new ones and drops the ones marked ``_deleted``;
+    refreshing costs the size of the delta rather than the size of the
+    sheet. A stale cursor rebuilds the copy from a full snapshot.
+    """
+
+    def __init__(self, sheet_name: str, client: Optional[AppsScriptClient] = None):
+        self.sheet_name = sheet_name
+        self._client = client
+        self.cursor: Optional[Dict[str, Any]] = None
+        self._rows: Dict[int, Dict] = {}
+        self._last_row = 0
+        self._snapshot: Optional[List[Dict]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self) -> AppsScriptClient:
+        return self._client or get_client()
+
+    @property
+    def rows(self) -> List[Dict]:
+        """All rows of the local copy, in sheet order."""
+        with self._lock:
+            if self._snapshot is None:
+                self._snapshot = list(self._rows.values())
+            return self._snapshot
+
+    def refresh(self) -> List[Dict]:
+        """Pull the delta since the last refresh and return the changed rows.
+
+        Deleted rows are returned as their ``{"_row": N, "_deleted": true}``
+        markers; after a full snapshot every row counts as changed.
+        """
+        with self._lock:
+            try:
+                delta, cursor = self.client.load_rows_since(
+                    self.sheet_name, self.cursor
+                )
+            except StaleCursorError:
+                # Linhas removidas deslocaram as seguintes: recomeça do zero
+                self.cursor = None
+                delta, cursor = self.client.load_rows_since(self.sheet_name)
+            if self.cursor is None or "row" not in cursor:
+                # Backends sem deltas respondem sempre a planilha inteira
+                self._rows = {}
+                self._last_row = 0
+            out_of_order = False
+            for pos, row in enumerate(delta, start=2):
+                row_number = int(row.get("_row", pos))
+                if row.get("_deleted"):
+                    self._rows.pop(row_number, None)
+                    continue
+                if row_number not in self._rows and row_number < self._last_row:
+                    out_of_order = True
+                self._rows[row_number] = row
+                self._last_row = max(self._last_row, row_number)
+            if out_of_order:
+                self._rows = dict(sorted(self._rows.items()))
+            self.cursor = cursor
+            self._snapshot = None
+            return delta
+
+
+_client: Optional[AppsScriptClient] = None
+_client_lock = threading.Lock()
+_replicas: Dict[str, SheetReplica] = {}
+
+
+def get_client() -> AppsScriptClient:
+    """Return the process-wide client shared by the helper functions."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = AppsScriptClient(cache=SheetCache())
+    return _client
+
+
+def _call_apps_script(action: str, payload: Optional[dict] = None, files=None):
+    """Send a request to the configured Apps Script URL."""
+    return get_client().call(action, payload, files=files)
+
+
+def is_configured() -> bool:
+    """Return whether an Apps Script URL is available."""
+    return bool(APPS_SCRIPT_URL)
+
+
+def append_rows(sheet_name: str, rows: List[List], keys: Optional[List[str]] = None):
+    """Append rows to a sheet via Apps Script."""
+    get_client().append_rows(sheet_name, rows, keys=keys)
+
+
+def load_rows(sheet_name: str, use_cache: bool = True) -> List[Dict]:
+    """Load all rows from a sheet via Apps Script.
+
+    Results are shared between sessions through the client's cache and
+    invalidated whenever ``append_rows`` writes to the same sheet.
+    """
+    return get_client().load_rows(sheet_name, use_cache=use_cache)
+
+
+def load_rows_since(
+    sheet_name: str, cursor: Optional[Dict[str, Any]] = None
+) -> Tuple[List[Dict], Dict[str, Any]]:
+    """Load the rows appended or changed since ``cursor`` via Apps Script."""
+    return get_client().load_rows_since(sheet_name, cursor)
+
+
+def get_replica(sheet_name: str) -> SheetReplica:
+    """Return the process-wide delta-synced copy of a sheet."""
+    with _client_lock:
+        if sheet_name not in _replicas:
+            _replicas[sheet_name] = SheetReplica(sheet_name)
+        return _replicas[sheet_name]
+
+
+def upload_file(file_bytes: bytes, filename: str, client_name: str) -> str:
+    """Upload a file via Apps Script and return the created link."""
+    return get_client().upload_file(file_bytes, filename, client_name)
+
+
+def upload_file_stream(fileobj: BinaryIO, filename: str, client_name: str) -> str:
+    """Upload a file object in resumable chunks and return the created link."""
+    return get_client().upload_stream(fileobj, filename, client_name)
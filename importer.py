@@ -0,0 +1,353 @@
+import os
+import itertools
+from typing import IO, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+import pandas as pd
+
+import business_days
+import recurrence
+import storage
+from reports import BACKUP_SHEETS
+from search_index import normalize
+
+IMPORT_CHUNK_ROWS = int(os.environ.get("IMPORT_CHUNK_ROWS", "2000"))
+# Quantos erros de linha são guardados para exibição; os demais só são contados
+MAX_REPORTED_ERRORS = 1000
+
+# Campos obrigatórios, os mesmos marcados com * nos formulários
+REQUIRED: Dict[str, Tuple[str, ...]] = {
+    "clients": ("Nome",),
+    "cases": ("Cliente", "Processo"),
+    "tasks": ("Descrição",),
+    "events": ("Título", "Tipo", "Data"),
+    "transactions": ("Tipo", "Categoria", "Valor", "Descrição", "Data"),
+    "documents": ("Cliente", "Título"),
+}
+
+# Valores aceitos nos campos de lista; a comparação ignora maiúsculas e acentos
+CHOICES: Dict[Tuple[str, str], Tuple[str, ...]] = {
+    ("cases", "Status"): ("Ativo", "Encerrado", "Suspenso"),
+    ("tasks", "Prioridade"): ("Baixa", "Média", "Alta"),
+    ("tasks", "Status"): ("Pendente", "Concluída"),
+    ("events", "Tipo"): ("Audiência", "Prazo", "Reunião"),
+    ("events", "Status"): ("Agendado", "Concluído", "Cancelado"),
+    ("transactions", "Tipo"): ("Receita", "Despesa"),
+    ("transactions", "Status"): ("Pendente", "Pago"),
+    ("tasks", "Calendário"): business_days.CALENDARS,
+}
+
+# Valores usados quando a coluna está vazia, como nos formulários
+DEFAULTS: Dict[Tuple[str, str], str] = {
+    ("cases", "Status"): "Ativo",
+    ("tasks", "Prioridade"): "Baixa",
+    ("tasks", "Status"): "Pendente",
+    ("events", "Status"): "Agendado",
+    ("transactions", "Status"): "Pendente",
+}
+
+# progress(linhas lidas, total estimado ou None)
+Progress = Callable[[int, Optional[int]], None]
+# on_batch(registros gravados no lote)
+BatchCallback = Callable[[List[Dict]], None]
+
+
+def _csv_separator(fileobj: IO[bytes]) -> str:
+    head = fileobj.read(64 * 1024)
+    fileobj.seek(0)
+    first_line = head.split(b"\n", 1)[0]
+    # Planilhas exportadas em português costumam usar ponto e vírgula
+    return ";" if first_line.count(b";") > first_line.count(b",") else ","
+
+
+def _estimate_rows(fileobj: IO[bytes]) -> Optional[int]:
+    try:
+        lines = fileobj.getvalue().count(b"\n")  # type: ignore[attr-defined]
+    except AttributeError:
+        return None
+    return max(lines - 1, 0)
+
+
+def read_chunks(
+    fileobj: IO[bytes],
+    filename: str,
+    name: str,
+    chunk_rows: int = IMPORT_CHUNK_ROWS,
+) -> Tuple[Iterator[pd.DataFrame], Optional[int]]:
+    """Return an iterator of row chunks from a CSV, XLSX or Parquet file.
+
+    Also returns the number of data rows when it is known up front (exact
+    for XLSX and Parquet, estimated from line breaks for CSV). In a
+    workbook the sheet named after the collection (as in the full backup)
+    is preferred over the first one.
+    """
+    extension = os.path.splitext(filename)[1].lower()
+    if extension in (".csv", ".txt"):
+        separator = _csv_separator(fileobj)
+        reader = pd.read_csv(
+            fileobj,
+            sep=separator,
+            dtype=str,
+            keep_default_na=False,
+            chunksize=chunk_rows,
+            encoding="utf-8-sig",
+            encoding_errors="replace",
+        )
+        return iter(reader), _estimate_rows(fileobj)
+    if extension in (".xlsx", ".xlsm"):
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(fileobj, read_only=True, data_only=True)
+        title = BACKUP_SHEETS.get(name)
+        if title in workbook.sheetnames:
+            sheet = workbook[title]
+        else:
+            sheet = workbook.worksheets[0]
+        rows = sheet.iter_rows(values_only=True)
+        header = [str(h) if h is not None else "" for h in next(rows, ())]
+        total = sheet.max_row - 1 if sheet.max_row else None
+
+        def sheet_chunks() -> Iterator[pd.DataFrame]:
+            try:
+                while True:
+                    block = list(itertools.islice(rows, chunk_rows))
+                    if not block:
+                        return
+                    # Linhas com as últimas células vazias vêm mais curtas
+                    width = len(header)
+                    yield pd.DataFrame(
+                        [list(r[:width]) + [None] * (width - len(r)) for r in block],
+                        columns=header,
+                    )
+            finally:
+                workbook.close()
+
+        return sheet_chunks(), total
+    if extension == ".parquet":
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as exc:
+            raise ValueError("A leitura de Parquet requer o pacote pyarrow") from exc
+        parquet = pq.ParquetFile(fileobj)
+        batches = parquet.iter_batches(batch_size=chunk_rows)
+        return (batch.to_pandas() for batch in batches), parquet.metadata.num_rows
+    raise ValueError(f"Formato não suportado: {extension or filename}")
+
+
+def _text(value) -> Optional[str]:
+    if value is None or value is pd.NA or value is pd.NaT:
+        return None
+    if isinstance(value, float):
+        if value != value:
+            return None
+        # Números lidos de planilhas (telefones, processos) perdem o ".0"
+        if value.is_integer():
+            return str(int(value))
+    text = str(value).strip()
+    return text or None
+
+
+def _timestamps(values: pd.Series) -> pd.Series:
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    text = values.map(_text).astype("string")
+    parsed = pd.to_datetime(text, format="ISO8601", errors="coerce")
+    for fmt in ("%d/%m/%Y %H:%M", "%d/%m/%Y %H:%M:%S", "%d/%m/%Y"):
+        pending = parsed.isna() & text.notna()
+        if not pending.any():
+            break
+        parsed[pending] = pd.to_datetime(text[pending], format=fmt, errors="coerce")
+    return parsed
+
+
+def _amounts(values: pd.Series) -> pd.Series:
+    """Parse amounts typed as numbers or in the Brazilian format.
+
+    "1.234,56" and "1.234" read as 1234.56 and 1234: without a comma, a dot
+    followed by exactly three digits separates thousands, while "12.5" and
+    "1.2345" keep the dot as the decimal point.
+    """
+    if pd.api.types.is_numeric_dtype(values):
+        return values.astype(float)
+    text = values.map(_text).astype("string")
+    text = text.str.replace("R$", "", regex=False).str.replace(" ", "", regex=False)
+    # "1.234,56" (formato brasileiro) vira "1234.56"
+    decimal_comma = text.str.contains(",", regex=False).fillna(False)
+    # Sem vírgula, "1.234" e "1.234.567" só têm separadores de milhar
+    thousands = text.str.fullmatch(r"-?[1-9]\d{0,2}(\.\d{3})+").fillna(False)
+    text = text.where(
+        ~(decimal_comma | thousands),
+        text.str.replace(".", "", regex=False).str.replace(",", ".", regex=False),
+    )
+    return pd.to_numeric(text, errors="coerce")
+
+
+class _ChunkValidator:
+    """Coerces one chunk to the collection schema and collects row errors."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.fields = storage.SCHEMAS[name]
+        self.choices = {
+            field: {normalize(v): v for v in values}
+            for (collection, field), values in CHOICES.items()
+            if collection == name
+        }
+
+    def columns(self, frame: pd.DataFrame) -> Dict[str, str]:
+        """Map file columns to schema fields, ignoring case and accents."""
+        wanted = {normalize(f): f for f in self.fields}
+        wanted["id"] = "id"
+        mapping = {}
+        for column in frame.columns:
+            field = wanted.get(normalize(str(column)).strip())
+            if field is not None and field not in mapping.values():
+                mapping[column] = field
+        return mapping
+
+    def validate(
+        self, frame: pd.DataFrame, first_line: int
+    ) -> Tuple[List[Tuple[int, Dict]], List[Dict]]:
+        """Return ``(linha, registro)`` for the valid rows and the row errors."""
+        mapping = self.columns(frame)
+        frame = frame[list(mapping)].rename(columns=mapping)
+        lines = pd.RangeIndex(first_line, first_line + len(frame))
+        frame.index = lines
+        values: Dict[str, pd.Series] = {}
+        errors: List[Tuple[int, str, object, str]] = []
+
+        def fail(mask: pd.Series, field: str, raw: pd.Series, message: str) -> None:
+            for line in mask[mask].index:
+                errors.append((line, field, raw.get(line), message))
+
+        for field, kind in self.fields.items():
+            if field not in frame:
+                values[field] = pd.Series(None, index=lines, dtype=object)
+                continue
+            raw = frame[field]
+            present = raw.map(_text).notna()
+            if kind in ("date", "datetime"):
+                stamps = _timestamps(raw)
+                fail(present & stamps.isna(), field, raw, "data inválida")
+                if kind == "date":
+                    convert = lambda ts: None if pd.isna(ts) else ts.date()
+                else:
+                    convert = lambda ts: None if pd.isna(ts) else ts.to_pydatetime()
+                values[field] = stamps.map(convert).astype(object)
+            elif kind == "real":
+                amounts = _amounts(raw)
+                fail(present & amounts.isna(), field, raw, "valor inválido")
+                fail(amounts < 0, field, raw, "valor negativo")
+                values[field] = amounts.astype(object).where(amounts.notna(), None)
+            elif kind == "integer":
+                numbers = _amounts(raw)
+                fail(present & numbers.isna(), field, raw, "número inválido")
+                fractional = numbers.notna() & (numbers % 1 != 0)
+                fail(fractional, field, raw, "número não inteiro")
+                fail(numbers < 0, field, raw, "número negativo")
+                values[field] = numbers.map(
+                    lambda n: None if pd.isna(n) or n % 1 else int(n)
+                ).astype(object)
+            else:
+                values[field] = raw.map(_text)
+        for field, lookup in self.choices.items():
+            column = values[field]
+            default = DEFAULTS.get((self.name, field))
+            if default is not None:
+                column = column.where(column.notna(), default)
+            matched = column.map(lambda v: lookup.get(normalize(v)) if v else None)
+            options = ", ".join(lookup.values())
+            fail(
+                column.notna() & matched.isna(),
+                field,
+                column,
+                f"valor fora da lista ({options})",
+            )
+            values[field] = matched
+        if self.name == "events":
+            rules = values["Recorrência"]
+            invalid = rules.map(
+                lambda r: isinstance(r, str) and not recurrence.is_valid(r)
+            )
+            invalid = invalid.astype(bool)
+            fail(invalid, "Recorrência", rules, "regra de recorrência inválida")
+        for field in REQUIRED[self.name]:
+            original = frame[field].map(_text) if field in frame else values[field]
+            fail(original.isna(), field, original, "campo obrigatório vazio")
+
+        ids = frame["id"].map(_text) if "id" in frame else None
+        bad_lines = {line for line, _, _, _ in errors}
+        records = []
+        for position, line in enumerate(lines):
+            if line in bad_lines:
+                continue
+            record = {"id": ids.iloc[position] if ids is not None else None}
+            for field in self.fields:
+                record[field] = values[field].iloc[position]
+            records.append((line, record))
+        return records, [
+            {"Linha": line, "Campo": field, "Valor": _text(value), "Erro": message}
+            for line, field, value, message in sorted(errors, key=lambda e: e[0])
+        ]
+
+
+def import_file(
+    repo: storage.Repository,
+    name: str,
+    fileobj: IO[bytes],
+    filename: str,
+    on_batch: Optional[BatchCallback] = None,
+    progress: Optional[Progress] = None,
+    chunk_rows: int = IMPORT_CHUNK_ROWS,
+) -> Dict:
+    """Validate and insert every row of a CSV, XLSX or Parquet file.
+
+    Rows are read ``chunk_rows`` at a time; each chunk is coerced to the
+    collection schema and its valid rows are inserted with one transaction
+    (:meth:`storage.Repository.insert_many`) and passed to ``on_batch``.
+    Invalid rows are skipped and reported with their line number (the
+    header is line 1). An ``id`` column is kept when its ids are new, so
+    a Parquet export can be imported back. Returns ``{"rows", "imported",
+    "errors", "error_count"}``.
+    """
+    chunks, total = read_chunks(fileobj, filename, name, chunk_rows)
+    validator = _ChunkValidator(name)
+    seen_ids: Set[str] = set()
+    errors: List[Dict] = []
+    error_count = 0
+    rows = imported = 0
+    for frame in chunks:
+        records, chunk_errors = validator.validate(frame, rows + 2)
+        rows += len(frame)
+        given = [r["id"] for _, r in records if r["id"]]
+        taken = set(repo.existing_ids(name, given)) if given else set()
+        batch = []
+        for line, record in records:
+            record_id = record["id"]
+            if record_id and (record_id in taken or record_id in seen_ids):
+                chunk_errors.append(
+                    {
+                        "Linha": line,
+                        "Campo": "id",
+                        "Valor": record_id,
+                        "Erro": "id repetido",
+                    }
+                )
+                continue
+            record["id"] = record_id or storage.new_id()
+            seen_ids.add(record["id"])
+            batch.append(record)
+        if batch:
+            repo.insert_many(name, batch)
+            imported += len(batch)
+            if on_batch is not None:
+                on_batch(batch)
+        error_count += len(chunk_errors)
+        errors.extend(chunk_errors[: MAX_REPORTED_ERRORS - len(errors)])
+        if progress is not None:
+            progress(rows, max(total, rows) if total is not None else None)
+    return {
+        "rows": rows,
+        "imported": imported,
+        "errors": errors,
+        "error_count": error_count,
+    }
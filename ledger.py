@@ -0,0 +1,148 @@
+import threading
+from datetime import date
+from typing import Dict, Optional, Tuple
+
+import storage
+
+# Dimensões das quebras mantidas; "Mês" é derivado do campo Data (AAAA-MM)
+DIMENSIONS = ("Mês", "Categoria", "Cliente", "Caso", "Status")
+
+# (tipo, centavos, chave de cada dimensão)
+Entry = Tuple[str, int, Tuple[Optional[str], ...]]
+
+
+def _cents(value) -> int:
+    return int(round((value or 0) * 100))
+
+
+def _month(value) -> Optional[str]:
+    if isinstance(value, date):
+        return value.strftime("%Y-%m")
+    return value[:7] if value else None
+
+
+class _Totals:
+    __slots__ = ("receita", "despesa", "count")
+
+    def __init__(self):
+        self.receita = 0
+        self.despesa = 0
+        self.count = 0
+
+    def add(self, kind: str, cents: int, sign: int) -> None:
+        if kind == "Receita":
+            self.receita += sign * cents
+        elif kind == "Despesa":
+            self.despesa += sign * cents
+        self.count += sign
+
+    def as_dict(self) -> Dict:
+        return {
+            "Receita": self.receita / 100,
+            "Despesa": self.despesa / 100,
+            "Saldo": (self.receita - self.despesa) / 100,
+            "count": self.count,
+        }
+
+
+class Ledger:
+    """Running financial totals kept in step with the transactions table.
+
+    The totals and the breakdowns by month, category, client, case and
+    payment status are loaded once and then adjusted by a repository
+    listener on every insert, update and delete, so reading them never
+    scans the movements. Amounts are summed in integer cents to avoid
+    drift; each movement's last contribution is kept by id so updates and
+    deletes can be subtracted exactly.
+    """
+
+    def __init__(self, repo: storage.Repository):
+        self.repo = repo
+        self._total = _Totals()
+        self._breakdowns: Dict[str, Dict[Optional[str], _Totals]] = {
+            dimension: {} for dimension in DIMENSIONS
+        }
+        self._entries: Dict[str, Entry] = {}
+        self._lock = threading.Lock()
+        with repo.lock:
+            rows = repo.execute(
+                'SELECT id, "Tipo", "Valor", "Data", "Categoria", "Cliente", '
+                '"Caso", "Status" FROM transactions'
+            )
+            with self._lock:
+                for record_id, kind, value, day, *keys in rows:
+                    entry = (kind, _cents(value), (_month(day), *keys))
+                    self._apply(record_id, entry)
+            repo.subscribe(self._on_change)
+
+    def _on_change(
+        self, name: str, operation: str, record_id: str, record: Optional[Dict]
+    ) -> None:
+        if name != "transactions":
+            return
+        entry = None
+        if record is not None:
+            keys = (_month(record.get("Data")),) + tuple(
+                record.get(field) for field in DIMENSIONS[1:]
+            )
+            entry = (record.get("Tipo"), _cents(record.get("Valor")), keys)
+        with self._lock:
+            self._apply(record_id, entry)
+
+    def _apply(self, record_id: str, entry: Optional[Entry]) -> None:
+        previous = self._entries.pop(record_id, None)
+        if previous is not None:
+            self._add(previous, -1)
+        if entry is not None:
+            self._entries[record_id] = entry
+            self._add(entry, 1)
+
+    def _add(self, entry: Entry, sign: int) -> None:
+        kind, cents, keys = entry
+        self._total.add(kind, cents, sign)
+        for dimension, key in zip(DIMENSIONS, keys):
+            groups = self._breakdowns[dimension]
+            totals = groups.get(key)
+            if totals is None:
+                totals = groups[key] = _Totals()
+            totals.add(kind, cents, sign)
+            if not totals.count:
+                del groups[key]
+
+    def totals(self) -> Dict:
+        """Return ``{"Receita", "Despesa", "Saldo", "count"}`` for every movement."""
+        with self._lock:
+            return self._total.as_dict()
+
+    def balance(self) -> float:
+        """Return receitas minus despesas."""
+        with self._lock:
+            return (self._total.receita - self._total.despesa) / 100
+
+    def group(self, dimension: str, key: Optional[str]) -> Dict:
+        """Return the totals of one group, e.g. ``group("Status", "Pendente")``."""
+        with self._lock:
+            totals = self._breakdowns[dimension].get(key)
+            return (totals or _Totals()).as_dict()
+
+    def breakdown(self, dimension: str) -> Dict[Optional[str], Dict]:
+        """Return the totals of every group of a dimension (see ``DIMENSIONS``)."""
+        with self._lock:
+            return {
+                key: totals.as_dict()
+                for key, totals in self._breakdowns[dimension].items()
+            }
+
+
+_ledger: Optional[Ledger] = None
+_ledger_lock = threading.Lock()
+
+
+def get_ledger() -> Ledger:
+    """Return the process-wide ledger over the shared repository."""
+    global _ledger
+    if _ledger is None:
+        with _ledger_lock:
+            if _ledger is None:
+                _ledger = Ledger(storage.get_repository())
+    return _ledger
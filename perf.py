@@ -0,0 +1,93 @@
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Dict, Iterator, Optional
+
+# Orçamento de cada execução de página, em milissegundos (início a frio à parte)
+PAGE_BUDGETS = {
+    "visao_geral": 250,
+    "clientes": 150,
+    "casos": 150,
+    "documentos": 150,
+    "agenda": 200,
+    "tarefas": 150,
+    "casos_por_cliente": 250,
+    "financeiro": 400,  # gráficos do Altair a cada execução
+    "relatorios": 300,
+}
+DEFAULT_BUDGET_MS = 200
+# Tempo máximo até a primeira página pronta num processo novo
+STARTUP_BUDGET_MS = int(os.environ.get("STARTUP_BUDGET_MS", "3000"))
+SAMPLES = 200
+
+
+def budget(page: str) -> int:
+    """Return the rerun budget of ``page`` in milliseconds."""
+    return PAGE_BUDGETS.get(page, DEFAULT_BUDGET_MS)
+
+
+def _percentile(values, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class PageTimings:
+    """Recent run times of each page, checked against :data:`PAGE_BUDGETS`.
+
+    Only the last ``SAMPLES`` runs of each page are kept, so the summary
+    follows the current data volume rather than the whole process history.
+    """
+
+    def __init__(self, samples: int = SAMPLES):
+        self.samples = samples
+        self._runs: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, page: str, milliseconds: float) -> None:
+        with self._lock:
+            runs = self._runs.setdefault(page, deque(maxlen=self.samples))
+            runs.append(milliseconds)
+
+    @contextmanager
+    def timed(self, page: str) -> Iterator[None]:
+        """Record how long the ``with`` block takes as a run of ``page``."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(page, (time.perf_counter() - started) * 1000)
+
+    def summary(self, page: str) -> Optional[Dict]:
+        """Return run count, p50, p95, last run and budget of ``page``."""
+        with self._lock:
+            runs = list(self._runs.get(page, ()))
+        if not runs:
+            return None
+        return {
+            "runs": len(runs),
+            "p50": _percentile(runs, 0.5),
+            "p95": _percentile(runs, 0.95),
+            "last": runs[-1],
+            "budget": budget(page),
+        }
+
+    def over_budget(self, page: str) -> bool:
+        """Return whether the p95 of ``page`` exceeds its budget."""
+        summary = self.summary(page)
+        return summary is not None and summary["p95"] > summary["budget"]
+
+
+_timings: Optional[PageTimings] = None
+_timings_lock = threading.Lock()
+
+
+def get_timings() -> PageTimings:
+    """Return the process-wide page timings."""
+    global _timings
+    if _timings is None:
+        with _timings_lock:
+            if _timings is None:
+                _timings = PageTimings()
+    return _timings
@@ -0,0 +1,173 @@
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from dateutil.rrule import rrulestr, rruleset
+
+# Rótulos do formulário -> FREQ da regra (RFC 5545)
+FREQUENCIES = {
+    "Diária": "DAILY",
+    "Semanal": "WEEKLY",
+    "Mensal": "MONTHLY",
+    "Anual": "YEARLY",
+}
+WEEKDAYS = {
+    "Seg": "MO",
+    "Ter": "TU",
+    "Qua": "WE",
+    "Qui": "TH",
+    "Sex": "FR",
+    "Sáb": "SA",
+    "Dom": "SU",
+}
+CACHE_RULES = 512
+CACHE_WINDOWS = 4096
+
+
+def build_rule(
+    frequency: str,
+    interval: int = 1,
+    until: Optional[date] = None,
+    count: Optional[int] = None,
+    weekdays: Iterable[str] = (),
+) -> str:
+    """Return an RRULE (``FREQ=WEEKLY;BYDAY=MO,WE;...``) from form values.
+
+    ``frequency`` and ``weekdays`` take the labels of :data:`FREQUENCIES`
+    and :data:`WEEKDAYS`; ``until`` includes the whole day.
+    """
+    parts = [f"FREQ={FREQUENCIES[frequency]}"]
+    if interval > 1:
+        parts.append(f"INTERVAL={interval}")
+    days = [WEEKDAYS[d] for d in weekdays]
+    if days:
+        parts.append("BYDAY=" + ",".join(days))
+    if count:
+        parts.append(f"COUNT={count}")
+    elif until is not None:
+        parts.append(f"UNTIL={until:%Y%m%d}T235959")
+    return ";".join(parts)
+
+
+def describe(rule: str) -> str:
+    """Return a short Portuguese description of an RRULE."""
+    parts = dict(p.split("=", 1) for p in rule.split(";") if "=" in p)
+    labels = {v: k for k, v in FREQUENCIES.items()}
+    text = labels.get(parts.get("FREQ", ""), "Personalizada")
+    if parts.get("INTERVAL", "1") != "1":
+        text += f", a cada {parts['INTERVAL']}"
+    if "BYDAY" in parts:
+        names = {v: k for k, v in WEEKDAYS.items()}
+        days = [names.get(d, d) for d in parts["BYDAY"].split(",")]
+        text += " (" + ", ".join(days) + ")"
+    if "COUNT" in parts:
+        text += f", {parts['COUNT']} vezes"
+    elif "UNTIL" in parts:
+        until = datetime.strptime(parts["UNTIL"][:8], "%Y%m%d")
+        text += f", até {until:%d/%m/%Y}"
+    return text
+
+
+def parse_exceptions(text: Optional[str]) -> Tuple[date, ...]:
+    """Return the skipped dates stored as ``AAAA-MM-DD,AAAA-MM-DD``."""
+    if not text:
+        return ()
+    days = (d.strip() for d in text.split(","))
+    return tuple(sorted(date.fromisoformat(d) for d in days if d))
+
+
+def format_exceptions(days: Iterable[date]) -> Optional[str]:
+    """Return the stored form of a set of skipped dates."""
+    return ",".join(d.isoformat() for d in sorted(set(days))) or None
+
+
+@lru_cache(maxsize=CACHE_RULES)
+def _rule_set(rule: str, start: datetime, exceptions: Tuple[date, ...]) -> rruleset:
+    rules = rruleset(cache=True)
+    rules.rrule(rrulestr(rule, dtstart=start, cache=True))
+    for day in exceptions:
+        rules.exdate(datetime.combine(day, start.time()))
+    return rules
+
+
+@lru_cache(maxsize=CACHE_WINDOWS)
+def expand(
+    rule: str,
+    start: datetime,
+    exceptions: Tuple[date, ...],
+    window_start: datetime,
+    window_end: datetime,
+) -> Tuple[datetime, ...]:
+    """Return the occurrences of a series inside ``[window_start, window_end)``.
+
+    Only the occurrences up to the window are generated, and both the
+    parsed rule and each window's result are cached by their arguments, so
+    editing a series simply misses the cache.
+    """
+    rules = _rule_set(rule, start, exceptions)
+    return tuple(
+        d for d in rules.between(window_start, window_end, inc=True) if d < window_end
+    )
+
+
+def occurrences_after(record: Dict, now: datetime) -> Iterator[Dict]:
+    """Yield one copy of a recurring event per occurrence at or after ``now``.
+
+    Occurrences are generated one at a time, so a caller can stop after the
+    first few of a series that never ends.
+    """
+    skipped = parse_exceptions(record.get("Exceções"))
+    rules = _rule_set(record["Recorrência"], record["Data"], skipped)
+    for stamp in rules.xafter(now, inc=True):
+        yield {**record, "Data": stamp}
+
+
+def is_valid(rule: str) -> bool:
+    """Return whether ``rule`` is an RRULE that dateutil understands."""
+    try:
+        rrulestr(rule, dtstart=datetime(2000, 1, 1))
+    except (ValueError, TypeError):
+        return False
+    return True
+
+
+def is_recurring(record: Dict) -> bool:
+    """Return whether an event record is a recurring series."""
+    return bool(record.get("Recorrência")) and record.get("Data") is not None
+
+
+def occurrences(record: Dict, start: date, end: date) -> List[Dict]:
+    """Return one copy of a recurring event per occurrence in a day range.
+
+    ``start`` and ``end`` are inclusive. Each copy has ``Data`` set to the
+    occurrence and keeps the series ``id``, so editing one edits the series.
+    """
+    window_start = datetime.combine(start, time.min)
+    window_end = datetime.combine(end + timedelta(days=1), time.min)
+    stamps = expand(
+        record["Recorrência"],
+        record["Data"],
+        parse_exceptions(record.get("Exceções")),
+        window_start,
+        window_end,
+    )
+    return [{**record, "Data": stamp} for stamp in stamps]
+
+
+def expand_records(records: Iterable[Dict], start: date, end: date) -> List[Dict]:
+    """Expand recurring events between two days, keeping one-off events.
+
+    One-off events outside the range are dropped; the result is ordered by
+    ``Data``.
+    """
+    window_start = datetime.combine(start, time.min)
+    window_end = datetime.combine(end + timedelta(days=1), time.min)
+    result: List[Dict] = []
+    for record in records:
+        if is_recurring(record):
+            result.extend(occurrences(record, start, end))
+        elif record.get("Data") is not None:
+            if window_start <= record["Data"] < window_end:
+                result.append(record)
+    result.sort(key=lambda r: r["Data"])
+    return result
@@ -0,0 +1,816 @@
+import os
+import re
+import io
+import json
+import zlib
+import math
+import hashlib
+import functools
+import threading
+import warnings
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import (
+    IO,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+import pandas as pd
+from fpdf.fonts import fpdf_charwidths
+from fpdf.ttfonts import TTFontFile
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+from openpyxl.styles import Font
+from openpyxl.utils import get_column_letter
+
+import storage
+
+REPORT_FONT_PATH = os.environ.get("REPORT_FONT_PATH", "")
+PDF_CHUNK_ROWS = int(os.environ.get("REPORT_PDF_CHUNK_ROWS", "2000"))
+CACHE_MAX_BYTES = int(
+    os.environ.get("REPORT_CACHE_MAX_BYTES", str(64 * 1024 * 1024))
+)
+
+# Fontes Unicode procuradas quando REPORT_FONT_PATH não é definido
+FONT_CANDIDATES = (
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+    "/usr/share/fonts/TTF/DejaVuSans.ttf",
+    "/usr/share/fonts/dejavu/DejaVuSans.ttf",
+    "/usr/share/fonts/dejavu-sans-fonts/DejaVuSans.ttf",
+    "/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf",
+    "/Library/Fonts/Arial Unicode.ttf",
+    "C:\\Windows\\Fonts\\arial.ttf",
+)
+
+# Nome do relatório com todas as coleções, uma aba por coleção
+BACKUP = "backup"
+BACKUP_SHEETS = {
+    "clients": "Clientes",
+    "cases": "Casos",
+    "tasks": "Tarefas",
+    "events": "Eventos",
+    "transactions": "Financeiro",
+    "documents": "Documentos",
+}
+EXCEL_FORMATS = {
+    "date": "DD/MM/YYYY",
+    "datetime": "DD/MM/YYYY HH:MM",
+    "real": '"R$" #,##0.00',
+    "integer": "0",
+}
+EXCEL_WIDTHS = {"date": 12, "datetime": 17, "real": 14, "integer": 10}
+
+# A4 paisagem, em pontos
+PAGE_WIDTH = 841.89
+PAGE_HEIGHT = 595.28
+MARGIN = 28.35
+TITLE_SIZE = 16
+FONT_SIZE = 8
+LINE_HEIGHT = FONT_SIZE * 1.25
+CELL_PADDING = 3
+MIN_COLUMN_WIDTH = 40
+# Nenhuma coluna ocupa mais que essa fração da largura útil antes da quebra
+MAX_COLUMN_SHARE = 0.4
+_ASTRAL_RE = re.compile("[\U00010000-\U0010ffff]")
+MAX_CELL_LINES = int((PAGE_HEIGHT - 2 * MARGIN - 4 * TITLE_SIZE) // LINE_HEIGHT) - 4
+
+
+def _find_font() -> Optional[str]:
+    if REPORT_FONT_PATH:
+        return REPORT_FONT_PATH
+    for path in FONT_CANDIDATES:
+        if os.path.exists(path):
+            return path
+    return None
+
+
+@functools.lru_cache(maxsize=4)
+def _ttf_metrics(path: str) -> TTFontFile:
+    ttf = TTFontFile()
+    with warnings.catch_warnings():
+        # O leitor do fpdf avisa sobre tabelas cmap que ele apenas ignora
+        warnings.simplefilter("ignore")
+        ttf.getMetrics(path)
+    return ttf
+
+
+class _UnicodeFont:
+    """TrueType font embedded as a CID font, subset to the glyphs used.
+
+    Text is written as UTF-16BE with the code point as CID, so the subset
+    and its CID-to-glyph map can only be built once the document ends.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        ttf = _ttf_metrics(path)
+        self.metrics = ttf
+        default = int(round(ttf.defaultWidth))
+        self.default_width = default
+        self._widths = [w or default for w in ttf.charWidths]
+        self._used: Set[int] = set()
+
+    def width(self, text: str, size: float) -> float:
+        if _ASTRAL_RE.search(text):
+            text = _ASTRAL_RE.sub("\ufffd", text)
+        return sum(map(self._widths.__getitem__, map(ord, text))) * size / 1000
+
+    def encode(self, text: str) -> str:
+        # Caracteres fora do plano básico não cabem em um CID de 2 bytes
+        if _ASTRAL_RE.search(text):
+            text = _ASTRAL_RE.sub("\ufffd", text)
+        self._used.update(map(ord, text))
+        return "<" + text.encode("utf-16-be").hex() + ">"
+
+    def write(self, pdf: "_PDFWriter", type0: int) -> None:
+        ttf = TTFontFile()
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            font_program = ttf.makeSubset(self.path, sorted(self._used))
+        name = "AAAAAA+" + "".join(c for c in self.metrics.fullName if c not in " ()")
+        cid_font, descriptor, program, cid_map, to_unicode = (
+            pdf.reserve() for _ in range(5)
+        )
+        pdf.write_object(
+            type0,
+            f"<</Type /Font /Subtype /Type0 /BaseFont /{name} "
+            f"/Encoding /Identity-H /DescendantFonts [{cid_font} 0 R] "
+            f"/ToUnicode {to_unicode} 0 R>>",
+        )
+        widths = " ".join(
+            f"{code} [{self._widths[code]}]"
+            for code in sorted(self._used)
+            if self._widths[code] != self.default_width
+        )
+        pdf.write_object(
+            cid_font,
+            f"<</Type /Font /Subtype /CIDFontType2 /BaseFont /{name} "
+            f"/CIDSystemInfo <</Registry (Adobe) /Ordering (UCS) /Supplement 0>> "
+            f"/FontDescriptor {descriptor} 0 R /DW {self.default_width} "
+            f"/W [{widths}] /CIDToGIDMap {cid_map} 0 R>>",
+        )
+        m = self.metrics
+        bbox = " ".join(str(int(round(v))) for v in m.bbox)
+        pdf.write_object(
+            descriptor,
+            f"<</Type /FontDescriptor /FontName /{name} /Flags {(m.flags | 4) & ~32} "
+            f"/FontBBox [{bbox}] /ItalicAngle {int(m.italicAngle)} "
+            f"/Ascent {int(round(m.ascent))} /Descent {int(round(m.descent))} "
+            f"/CapHeight {int(round(m.capHeight))} /StemV {int(round(m.stemV))} "
+            f"/MissingWidth {self.default_width} /FontFile2 {program} 0 R>>",
+        )
+        pdf.write_stream(program, font_program, f"/Length1 {len(font_program)}")
+        gid_map = bytearray(2 * (max(ttf.codeToGlyph, default=0) + 1))
+        for code, glyph in ttf.codeToGlyph.items():
+            gid_map[2 * code] = glyph >> 8
+            gid_map[2 * code + 1] = glyph & 0xFF
+        pdf.write_stream(cid_map, bytes(gid_map))
+        pdf.write_stream(to_unicode, _identity_to_unicode())
+
+
+class _CoreFont:
+    """Standard Helvetica, used when no TrueType font is available.
+
+    Only covers the Windows-1252 characters (Portuguese included); any
+    other character is written as ``?``.
+    """
+
+    def __init__(self):
+        self._widths = fpdf_charwidths["helvetica"]
+
+    def width(self, text: str, size: float) -> float:
+        widths = self._widths
+        return sum(widths.get(c, 556) for c in text) * size / 1000
+
+    def encode(self, text: str) -> str:
+        return "<" + text.encode("cp1252", errors="replace").hex() + ">"
+
+    def write(self, pdf: "_PDFWriter", number: int) -> None:
+        pdf.write_object(
+            number,
+            "<</Type /Font /Subtype /Type1 /BaseFont /Helvetica "
+            "/Encoding /WinAnsiEncoding>>",
+        )
+
+
+def _identity_to_unicode() -> bytes:
+    # Um intervalo por byte alto e no máximo 100 intervalos por bloco, como
+    # exige a especificação de CMaps
+    ranges = [f"<{h:02X}00> <{h:02X}FF> <{h:02X}00>" for h in range(256)]
+    blocks = "".join(
+        f"{len(ranges[i : i + 100])} beginbfrange\n"
+        + "\n".join(ranges[i : i + 100])
+        + "\nendbfrange\n"
+        for i in range(0, 256, 100)
+    )
+    return (
+        "/CIDInit /ProcSet findresource begin\n12 dict begin\nbegincmap\n"
+        "/CIDSystemInfo <</Registry (Adobe) /Ordering (UCS) /Supplement 0>> def\n"
+        "/CMapName /Adobe-Identity-UCS def\n/CMapType 2 def\n"
+        "1 begincodespacerange\n<0000> <FFFF>\nendcodespacerange\n"
+        f"{blocks}endcmap\nCMapName currentdict /CMap defineresource pop\nend\nend"
+    ).encode("ascii")
+
+
+class _PDFWriter:
+    """Minimal PDF serializer that writes objects to ``sink`` as they finish.
+
+    Only the byte offset of each object is kept in memory; the page tree,
+    fonts and cross-reference table are written by :meth:`close`.
+    """
+
+    def __init__(self, sink: IO[bytes]):
+        self.sink = sink
+        self._offsets: Dict[int, int] = {}
+        self._position = 0
+        self._next = 1
+        self._emit(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+    def _emit(self, data: bytes) -> None:
+        self.sink.write(data)
+        self._position += len(data)
+
+    def reserve(self) -> int:
+        number = self._next
+        self._next += 1
+        return number
+
+    def write_object(self, number: int, body: str) -> None:
+        self._offsets[number] = self._position
+        self._emit(f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1"))
+
+    def write_stream(self, number: int, data: bytes, extra: str = "") -> None:
+        data = zlib.compress(data)
+        self._offsets[number] = self._position
+        self._emit(
+            f"{number} 0 obj\n<</Length {len(data)} /Filter /FlateDecode {extra}>>"
+            "\nstream\n".encode("latin-1")
+        )
+        self._emit(data)
+        self._emit(b"\nendstream\nendobj\n")
+
+    def close(self, root: int, info: Optional[int] = None) -> None:
+        xref = self._position
+        lines = [f"xref\n0 {self._next}\n", "0000000000 65535 f \n"]
+        for number in range(1, self._next):
+            lines.append(f"{self._offsets.get(number, 0):010d} 00000 n \n")
+        trailer = f"/Size {self._next} /Root {root} 0 R"
+        if info is not None:
+            trailer += f" /Info {info} 0 R"
+        lines.append(f"trailer\n<<{trailer}>>\nstartxref\n{xref}\n%%EOF\n")
+        self._emit("".join(lines).encode("latin-1"))
+
+
+def _cell_text(value) -> str:
+    if value is None or value is pd.NaT:
+        return ""
+    if isinstance(value, float):
+        return "" if math.isnan(value) else f"{value:,.2f}"
+    if isinstance(value, datetime):
+        if value.hour or value.minute:
+            return value.strftime("%d/%m/%Y %H:%M")
+        return value.strftime("%d/%m/%Y")
+    if isinstance(value, date):
+        return value.strftime("%d/%m/%Y")
+    return str(value)
+
+
+class PDFTableReport:
+    """Streaming table report: rows in, finished pages out.
+
+    Rows are laid out as they arrive and each page is compressed and written
+    to ``sink`` as soon as it is full, so memory does not grow with the
+    number of rows. Column widths are sized from the header and the first
+    ``sample_rows`` rows, long values wrap inside their cell and the header
+    is repeated at the top of every page. Text uses an embedded Unicode
+    TrueType font (``REPORT_FONT_PATH`` or a system DejaVu/Liberation/Arial)
+    and falls back to Helvetica when none is found.
+    """
+
+    def __init__(
+        self,
+        sink: IO[bytes],
+        title: str,
+        columns: Sequence[str],
+        font_path: Optional[str] = None,
+        sample_rows: int = PDF_CHUNK_ROWS,
+    ):
+        self.title = title
+        self.columns = [str(c) for c in columns]
+        self.sample_rows = sample_rows
+        font_path = font_path or _find_font()
+        self.font = _UnicodeFont(font_path) if font_path else _CoreFont()
+        self._pdf = _PDFWriter(sink)
+        self._catalog = self._pdf.reserve()
+        self._pages_root = self._pdf.reserve()
+        self._font_ref = self._pdf.reserve()
+        self._pages: List[int] = []
+        self._ops: List[str] = []
+        self._y = 0.0
+        self._widths: Optional[List[float]] = None
+        self._numeric: List[bool] = [False] * len(self.columns)
+        self._buffer: List[List[str]] = []
+        self._measured: Dict[str, float] = {}
+        self.rows_written = 0
+
+    def _text(self, x: float, y: float, text: str, size: float = FONT_SIZE) -> None:
+        self._ops.append(
+            f"BT /F1 {size} Tf {x:.2f} {y:.2f} Td {self.font.encode(text)} Tj ET"
+        )
+
+    def _size_columns(self, sample: List[List[str]]) -> List[float]:
+        available = PAGE_WIDTH - 2 * MARGIN
+        padding = 2 * CELL_PADDING
+        natural = []
+        minimum = []
+        for i, header in enumerate(self.columns):
+            widest = max((self._measure(row[i]) for row in sample), default=0)
+            header_width = self._measure(header)
+            longest_word = max((self._measure(w) for w in header.split()), default=0)
+            natural.append(
+                min(max(widest, header_width) + padding, available * MAX_COLUMN_SHARE)
+            )
+            minimum.append(max(MIN_COLUMN_WIDTH, min(longest_word + padding, 80)))
+        natural = [max(n, m) for n, m in zip(natural, minimum)]
+        total = sum(natural)
+        if total <= available:
+            return [w * available / total for w in natural]
+        floor = sum(minimum)
+        if floor >= available:
+            return [w * available / floor for w in minimum]
+        share = (available - floor) / (total - floor)
+        return [m + (n - m) * share for n, m in zip(natural, minimum)]
+
+    def _measure(self, text: str) -> float:
+        width = self._measured.get(text)
+        if width is None:
+            if len(self._measured) > 100_000:
+                self._measured.clear()
+            width = self._measured[text] = self.font.width(text, FONT_SIZE)
+        return width
+
+    def _wrap(self, text: str, width: float) -> List[str]:
+        if "\n" not in text and self._measure(text) <= width:
+            return [text]
+        space = self._measure(" ")
+        lines: List[str] = []
+        for paragraph in text.splitlines() or [""]:
+            line: List[str] = []
+            used = 0.0
+            for word in paragraph.split(" "):
+                word_width = self._measure(word)
+                needed = word_width + (space if line else 0)
+                if used + needed <= width:
+                    line.append(word)
+                    used += needed
+                    continue
+                if line:
+                    lines.append(" ".join(line))
+                if word_width <= width:
+                    line, used = [word], word_width
+                    continue
+                # Palavras maiores que a coluna são quebradas por caractere
+                piece = ""
+                used = 0.0
+                for char in word:
+                    char_width = self._measure(char)
+                    if piece and used + char_width > width:
+                        lines.append(piece)
+                        piece, used = "", 0.0
+                    piece += char
+                    used += char_width
+                line = [piece]
+            lines.append(" ".join(line))
+        return lines
+
+    def _start_page(self) -> None:
+        self._ops = ["0.5 w"]
+        self._y = PAGE_HEIGHT - MARGIN
+        if not self._pages:
+            self._y -= TITLE_SIZE
+            self._text(MARGIN, self._y, self.title, TITLE_SIZE)
+            self._y -= TITLE_SIZE * 0.75
+        self._row(self.columns, header=True)
+
+    def _finish_page(self) -> None:
+        number = len(self._pages) + 1
+        self._text(PAGE_WIDTH - MARGIN - 40, MARGIN / 2, f"Página {number}")
+        content = self._pdf.reserve()
+        page = self._pdf.reserve()
+        self._pdf.write_stream(content, "\n".join(self._ops).encode("latin-1"))
+        self._pdf.write_object(
+            page,
+            f"<</Type /Page /Parent {self._pages_root} 0 R "
+            f"/Resources <</Font <</F1 {self._font_ref} 0 R>>>> "
+            f"/Contents {content} 0 R>>",
+        )
+        self._pages.append(page)
+        self._ops = []
+
+    def _row(self, cells: List[str], header: bool = False) -> None:
+        widths = self._widths
+        inner = [w - 2 * CELL_PADDING for w in widths]
+        wrapped = [self._wrap(text, w) for text, w in zip(cells, inner)]
+        for lines in wrapped:
+            # Uma linha da tabela nunca passa de uma página
+            if len(lines) > MAX_CELL_LINES:
+                del lines[MAX_CELL_LINES:]
+                lines[-1] += " …"
+        height = max(len(lines) for lines in wrapped) * LINE_HEIGHT + CELL_PADDING
+        if not header and self._y - height < MARGIN:
+            self._finish_page()
+            self._start_page()
+        top = self._y
+        bottom = top - height
+        if header:
+            self._ops.append(
+                f"0.88 g {MARGIN:.2f} {bottom:.2f} {sum(widths):.2f} {height:.2f} "
+                "re f 0 g"
+            )
+        x = MARGIN
+        for i, (lines, width) in enumerate(zip(wrapped, widths)):
+            self._ops.append(f"{x:.2f} {bottom:.2f} {width:.2f} {height:.2f} re S")
+            baseline = top - LINE_HEIGHT + (LINE_HEIGHT - FONT_SIZE) / 2
+            for line in lines:
+                if not line:
+                    baseline -= LINE_HEIGHT
+                    continue
+                if self._numeric[i] and not header:
+                    offset = width - CELL_PADDING - self._measure(line)
+                else:
+                    offset = CELL_PADDING
+                self._text(x + offset, baseline, line)
+                baseline -= LINE_HEIGHT
+            x += width
+        self._y = bottom
+
+    def write_rows(self, rows: Iterable[Sequence]) -> None:
+        """Lay out ``rows`` (sequences in column order), writing full pages."""
+        for row in rows:
+            if self._widths is None:
+                # Colunas numéricas são alinhadas à direita
+                for i, value in enumerate(row):
+                    if isinstance(value, (int, float)) and not isinstance(value, bool):
+                        self._numeric[i] = True
+                self._buffer.append([_cell_text(v) for v in row])
+                if len(self._buffer) >= self.sample_rows:
+                    self._begin()
+                continue
+            self._row([_cell_text(v) for v in row])
+            self.rows_written += 1
+
+    def _begin(self) -> None:
+        self._widths = self._size_columns(self._buffer)
+        self._start_page()
+        for row in self._buffer:
+            self._row(row)
+        self.rows_written += len(self._buffer)
+        self._buffer = []
+
+    def close(self) -> None:
+        """Write the last page, the fonts and the document trailer."""
+        if self._widths is None:
+            self._begin()
+        self._finish_page()
+        self.font.write(self._pdf, self._font_ref)
+        kids = " ".join(f"{page} 0 R" for page in self._pages)
+        self._pdf.write_object(
+            self._pages_root,
+            f"<</Type /Pages /Kids [{kids}] /Count {len(self._pages)} "
+            f"/MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}]>>",
+        )
+        self._pdf.write_object(
+            self._catalog, f"<</Type /Catalog /Pages {self._pages_root} 0 R>>"
+        )
+        self._pdf.close(self._catalog)
+
+
+def write_pdf(
+    sink: IO[bytes],
+    title: str,
+    columns: Sequence[str],
+    chunks: Iterable[Iterable[Sequence]],
+) -> int:
+    """Write a table report to ``sink`` from chunks of rows; return the row count."""
+    report = PDFTableReport(sink, title, columns)
+    for rows in chunks:
+        report.write_rows(rows)
+    report.close()
+    return report.rows_written
+
+
+def frame_chunks(
+    df: pd.DataFrame, size: int = PDF_CHUNK_ROWS
+) -> Iterator[List[tuple]]:
+    """Yield the rows of ``df`` as lists of tuples, ``size`` rows at a time."""
+    for start in range(0, len(df), size):
+        yield list(df.iloc[start : start + size].itertuples(index=False, name=None))
+
+
+def dataframe_to_pdf(df: pd.DataFrame, title: str) -> bytes:
+    """Render ``df`` as a paginated PDF table.
+
+    Only the compressed document is held in memory; use :func:`write_pdf`
+    with a file to keep it on disk instead.
+    """
+    output = io.BytesIO()
+    write_pdf(output, title, list(df.columns), frame_chunks(df))
+    return output.getvalue()
+
+
+# progress(linhas processadas, total de linhas)
+Progress = Callable[[int, int], None]
+
+
+def _tracker(total: int, progress: Optional[Progress]):
+    """Return a wrapper for chunk iterators that reports rows done so far."""
+    done = 0
+
+    def track(chunks: Iterable[List[Dict]]) -> Iterator[List[Dict]]:
+        nonlocal done
+        for records in chunks:
+            yield records
+            done += len(records)
+            if progress is not None:
+                progress(min(done, total), total)
+
+    return track
+
+
+def _sources(name: str) -> List[str]:
+    return list(BACKUP_SHEETS) if name == BACKUP else [name]
+
+
+def build_pdf(
+    repo: storage.Repository,
+    name: str,
+    title: str,
+    progress: Optional[Progress] = None,
+) -> bytes:
+    """Render a whole collection as a PDF table, reading it in chunks."""
+    if name == BACKUP:
+        raise ValueError("O backup completo só é exportado em Excel")
+    fields = list(storage.SCHEMAS[name])
+    track = _tracker(len(repo.collection(name)), progress)
+    output = io.BytesIO()
+    write_pdf(
+        output,
+        title,
+        fields,
+        (
+            [tuple(r[f] for f in fields) for r in records]
+            for records in track(repo.iter_chunks(name, PDF_CHUNK_ROWS))
+        ),
+    )
+    return output.getvalue()
+
+
+def _excel_value(value):
+    if isinstance(value, str):
+        # Caracteres de controle são rejeitados pelo formato XLSX
+        return ILLEGAL_CHARACTERS_RE.sub("", value)
+    return value
+
+
+def write_excel(
+    sink: IO[bytes], sheets: Iterable[Tuple[str, str, Iterable[List[Dict]]]]
+) -> int:
+    """Write ``(título, coleção, blocos de registros)`` sheets to ``sink``.
+
+    Uses an openpyxl write-only workbook, which serializes each row as it
+    is appended instead of keeping a cell object per value. Dates,
+    datetimes and amounts are written as typed cells with an Excel number
+    format. Returns the number of rows written.
+    """
+    workbook = Workbook(write_only=True)
+    bold = Font(bold=True)
+    count = 0
+    for title, name, chunks in sheets:
+        fields = storage.SCHEMAS[name]
+        sheet = workbook.create_sheet(title[:31])
+        sheet.freeze_panes = "A2"
+        for position, (field, kind) in enumerate(fields.items(), start=1):
+            letter = get_column_letter(position)
+            sheet.column_dimensions[letter].width = EXCEL_WIDTHS.get(kind, 24)
+        header = []
+        for field in fields:
+            cell = WriteOnlyCell(sheet, field)
+            cell.font = bold
+            header.append(cell)
+        sheet.append(header)
+        formats = {f: EXCEL_FORMATS[k] for f, k in fields.items() if k in EXCEL_FORMATS}
+        for records in chunks:
+            for record in records:
+                row = []
+                for field in fields:
+                    value = _excel_value(record.get(field))
+                    number_format = formats.get(field)
+                    if number_format and value is not None:
+                        value = WriteOnlyCell(sheet, value)
+                        value.number_format = number_format
+                    row.append(value)
+                sheet.append(row)
+            count += len(records)
+    workbook.save(sink)
+    return count
+
+
+def build_excel(
+    repo: storage.Repository,
+    name: str,
+    title: str,
+    progress: Optional[Progress] = None,
+) -> bytes:
+    """Render a collection, or every collection for ``BACKUP``, as a workbook."""
+    sources = _sources(name)
+    track = _tracker(sum(len(repo.collection(s)) for s in sources), progress)
+    if name == BACKUP:
+        titles = [BACKUP_SHEETS[s] for s in sources]
+    else:
+        titles = [title]
+    output = io.BytesIO()
+    write_excel(
+        output,
+        (
+            (sheet_title, source, track(repo.iter_chunks(source, PDF_CHUNK_ROWS)))
+            for sheet_title, source in zip(titles, sources)
+        ),
+    )
+    return output.getvalue()
+
+
+def build_parquet(
+    repo: storage.Repository,
+    name: str,
+    title: str,
+    progress: Optional[Progress] = None,
+) -> bytes:
+    """Export a collection, ids included, as a Parquet file.
+
+    Columns keep their schema types (texto, data, data e hora, valor e inteiro), so
+    the file can be imported back with :func:`importer.import_file`.
+    """
+    if name == BACKUP:
+        raise ValueError("O backup completo só é exportado em Excel")
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as exc:
+        raise ValueError("A exportação em Parquet requer o pacote pyarrow") from exc
+    types = {
+        "text": pa.string(),
+        "date": pa.date32(),
+        "datetime": pa.timestamp("us"),
+        "real": pa.float64(),
+        "integer": pa.int64(),
+    }
+    fields = storage.SCHEMAS[name]
+    schema = pa.schema(
+        [("id", pa.string())] + [(f, types[kind]) for f, kind in fields.items()]
+    )
+    track = _tracker(len(repo.collection(name)), progress)
+    output = io.BytesIO()
+    with pq.ParquetWriter(output, schema, compression="zstd") as writer:
+        for records in track(repo.iter_chunks(name, PDF_CHUNK_ROWS)):
+            writer.write_table(pa.Table.from_pylist(records, schema=schema))
+    return output.getvalue()
+
+
+BUILDERS: Dict[str, Callable[..., bytes]] = {
+    "pdf": build_pdf,
+    "xlsx": build_excel,
+    "parquet": build_parquet,
+}
+
+# (coleção, formato, título, hash do conteúdo)
+ReportKey = Tuple[str, str, str, str]
+
+
+class ReportCache:
+    """LRU cache of generated report files shared by every session.
+
+    Files are keyed by the SHA-256 of the collection contents (of every
+    collection for ``BACKUP``), so a report is only rebuilt after the data
+    actually changes. The hash itself is memoized per collection and
+    dropped by a repository listener on every write. Memory is bounded by
+    the total size of the cached files.
+    """
+
+    def __init__(self, repo: storage.Repository, max_bytes: int = CACHE_MAX_BYTES):
+        self.repo = repo
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[ReportKey, bytes]" = OrderedDict()
+        self._total_bytes = 0
+        # Contador de escritas por coleção, invalida o hash memorizado
+        self._versions: Dict[str, int] = {}
+        self._hashes: Dict[str, Tuple[int, str]] = {}
+        self._lock = threading.Lock()
+        self._build_locks: Dict[ReportKey, threading.Lock] = {}
+        repo.subscribe(self._on_change)
+
+    def _on_change(
+        self, name: str, operation: str, record_id: str, record: Optional[Dict]
+    ) -> None:
+        with self._lock:
+            self._versions[name] = self._versions.get(name, 0) + 1
+
+    def _version(self, name: str) -> int:
+        with self._lock:
+            return sum(self._versions.get(s, 0) for s in _sources(name))
+
+    def content_hash(self, name: str) -> str:
+        """Return the SHA-256 of every record of a collection, in order."""
+        if name == BACKUP:
+            digest = hashlib.sha256()
+            for source in _sources(name):
+                digest.update(self.content_hash(source).encode())
+            return digest.hexdigest()
+        with self._lock:
+            version = self._versions.get(name, 0)
+            memo = self._hashes.get(name)
+        if memo is not None and memo[0] == version:
+            return memo[1]
+        digest = hashlib.sha256()
+        for records in self.repo.iter_chunks(name):
+            for record in records:
+                digest.update(
+                    json.dumps(record, default=str, ensure_ascii=False).encode()
+                )
+                digest.update(b"\n")
+        value = digest.hexdigest()
+        with self._lock:
+            if self._versions.get(name, 0) == version:
+                self._hashes[name] = (version, value)
+        return value
+
+    def get(self, name: str, fmt: str, title: str) -> Optional[bytes]:
+        """Return the cached report for the current contents, if any."""
+        key = (name, fmt, title, self.content_hash(name))
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+            return data
+
+    def build(
+        self,
+        name: str,
+        fmt: str,
+        title: str,
+        progress: Optional[Progress] = None,
+    ) -> bytes:
+        """Return the report, generating it unless an identical one is cached.
+
+        Concurrent requests for the same report wait for a single build.
+        """
+        version = self._version(name)
+        key = (name, fmt, title, self.content_hash(name))
+        with self._lock:
+            build_lock = self._build_locks.setdefault(key, threading.Lock())
+        with build_lock:
+            cached = self.get(name, fmt, title)
+            if cached is not None:
+                return cached
+            data = BUILDERS[fmt](self.repo, name, title, progress)
+            unchanged = self._version(name) == version
+            with self._lock:
+                self._build_locks.pop(key, None)
+                # Uma escrita durante a geração deixa o arquivo sem hash válido
+                if unchanged:
+                    self._put(key, data)
+        return data
+
+    def _put(self, key: ReportKey, data: bytes) -> None:
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._total_bytes -= len(previous)
+        if len(data) > self.max_bytes:
+            return
+        self._entries[key] = data
+        self._total_bytes += len(data)
+        while self._total_bytes > self.max_bytes:
+            _, oldest = self._entries.popitem(last=False)
+            self._total_bytes -= len(oldest)
+
+
+_cache: Optional[ReportCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_report_cache() -> ReportCache:
+    """Return the process-wide report cache over the shared repository."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ReportCache(storage.get_repository())
+    return _cache
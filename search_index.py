@@ -0,0 +1,239 @@
+import re
+import bisect
+import heapq
+import threading
+import unicodedata
+from typing import Dict, List, Optional, Set, Tuple
+
+import storage
+
+# Campos indexados por coleção; o primeiro é o título exibido nos resultados
+SEARCH_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "clients": ("Nome", "Email", "Telefone", "Anotações"),
+    "cases": ("Processo", "Cliente", "Partes", "Advogado"),
+    "documents": ("Título", "Cliente", "Caso", "Arquivo"),
+    "events": ("Título", "Local", "Cliente", "Caso", "Descrição"),
+    "tasks": ("Descrição", "Cliente", "Caso"),
+}
+
+COLLECTION_LABELS = {
+    "clients": "Cliente",
+    "cases": "Caso",
+    "documents": "Documento",
+    "events": "Evento",
+    "tasks": "Tarefa",
+}
+
+TITLE_WEIGHT = 2
+_WORD_RE = re.compile(r"\w+")
+
+DocKey = Tuple[str, str]
+
+
+def normalize(text: Optional[str]) -> str:
+    """Case-fold ``text`` and strip accents ("João" -> "joao")."""
+    if not text:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", str(text))
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+def _trigrams(word: str) -> Set[str]:
+    return {word[i : i + 3] for i in range(len(word) - 2)}
+
+
+class SearchIndex:
+    """Accent-insensitive inverted index over every searchable collection.
+
+    Documents are split into normalized words; each word keeps a posting map
+    ``{(coleção, id): peso}`` and the vocabulary is indexed by trigrams, so a
+    query term is matched as a substring of words by intersecting the
+    trigram sets instead of scanning the records. Terms shorter than three
+    characters use prefix lookup on the sorted vocabulary. Repository writes
+    update the index incrementally through a listener.
+
+    The index is built without holding the repository lock: the listener is
+    subscribed first and queues the writes that arrive while the tables are
+    read and indexed, and the queue is replayed once the build finishes.
+    """
+
+    def __init__(self, repo: storage.Repository):
+        self.repo = repo
+        self._postings: Dict[str, Dict[DocKey, int]] = {}
+        self._trigram_words: Dict[str, Set[str]] = {}
+        self._vocabulary: List[str] = []
+        self._doc_words: Dict[DocKey, Dict[str, int]] = {}
+        self._titles: Dict[DocKey, Tuple[str, str]] = {}
+        self._lock = threading.RLock()
+        # Escritas recebidas durante a montagem; None depois de reaplicadas
+        self._pending: Optional[List[Tuple[str, str, Optional[Dict]]]] = []
+        # Inscreve antes de ler: cada escrita traz o registro inteiro, então
+        # reaplicar a fila sobre a leitura dá o estado final de cada um
+        repo.subscribe(self._on_change)
+        for name in SEARCH_FIELDS:
+            for record in repo.rows_to_records(name, repo.select(name)):
+                self._add(name, record)
+        with self._lock:
+            for name, record_id, record in self._pending:
+                self._apply(name, record_id, record)
+            self._pending = None
+
+    def _on_change(
+        self, name: str, operation: str, record_id: str, record: Optional[Dict]
+    ) -> None:
+        if name not in SEARCH_FIELDS:
+            return
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append((name, record_id, record))
+            else:
+                self._apply(name, record_id, record)
+
+    def _apply(self, name: str, record_id: str, record: Optional[Dict]) -> None:
+        self._remove((name, record_id))
+        if record is not None:
+            self._add(name, record)
+
+    def _add(self, name: str, record: Dict) -> None:
+        key = (name, record["id"])
+        fields = SEARCH_FIELDS[name]
+        words: Dict[str, int] = {}
+        for position, field in enumerate(fields):
+            weight = TITLE_WEIGHT if position == 0 else 1
+            for word in _WORD_RE.findall(normalize(record.get(field))):
+                words[word] = max(words.get(word, 0), weight)
+        for word, weight in words.items():
+            posting = self._postings.get(word)
+            if posting is None:
+                posting = self._postings[word] = {}
+                bisect.insort(self._vocabulary, word)
+                for gram in _trigrams(word):
+                    self._trigram_words.setdefault(gram, set()).add(word)
+            posting[key] = weight
+        self._doc_words[key] = words
+        detail = record.get("Cliente") if name != "clients" else record.get("Email")
+        self._titles[key] = (str(record.get(fields[0]) or ""), str(detail or ""))
+
+    def _remove(self, key: DocKey) -> None:
+        words = self._doc_words.pop(key, None)
+        self._titles.pop(key, None)
+        for word in words or ():
+            posting = self._postings[word]
+            posting.pop(key, None)
+            if posting:
+                continue
+            del self._postings[word]
+            pos = bisect.bisect_left(self._vocabulary, word)
+            del self._vocabulary[pos]
+            for gram in _trigrams(word):
+                grams = self._trigram_words[gram]
+                grams.discard(word)
+                if not grams:
+                    del self._trigram_words[gram]
+
+    def _matching_words(self, term: str) -> List[Tuple[str, int]]:
+        """Return ``(word, quality)`` for vocabulary words containing ``term``."""
+        if len(term) < 3:
+            start = bisect.bisect_left(self._vocabulary, term)
+            candidates = []
+            for word in self._vocabulary[start:]:
+                if not word.startswith(term):
+                    break
+                candidates.append(word)
+        else:
+            sets = sorted(
+                (self._trigram_words.get(g, set()) for g in _trigrams(term)), key=len
+            )
+            if sets[0]:
+                candidates = [w for w in sets[0].intersection(*sets[1:]) if term in w]
+            else:
+                candidates = []
+        matches = []
+        for word in candidates:
+            if word == term:
+                quality = 3
+            elif word.startswith(term):
+                quality = 2
+            else:
+                quality = 1
+            matches.append((word, quality))
+        return matches
+
+    def search(
+        self,
+        query: str,
+        collections: Optional[Tuple[str, ...]] = None,
+        limit: int = 50,
+    ) -> List[Dict]:
+        """Return ranked hits for every term of ``query``.
+
+        Each hit is ``{"collection", "id", "title", "detail", "score"}``; a
+        record must match all terms. Exact words score above prefixes, which
+        score above infixes, and matches in the title field count double.
+        """
+        terms = _WORD_RE.findall(normalize(query))
+        if not terms:
+            return []
+        with self._lock:
+            matched = [self._matching_words(term) for term in terms]
+            # Começa pelo termo mais seletivo para reduzir os candidatos cedo
+            matched.sort(
+                key=lambda words: sum(len(self._postings[w]) for w, _ in words)
+            )
+            scores: Optional[Dict[DocKey, int]] = None
+            for words in matched:
+                term_scores: Dict[DocKey, int] = {}
+                postings = [(self._postings[w], quality) for w, quality in words]
+                volume = sum(len(posting) for posting, _ in postings)
+                if scores is not None and len(scores) * len(postings) < volume:
+                    # Poucos candidatos: consulta cada um em vez de varrer postings
+                    for posting, quality in postings:
+                        for key in scores:
+                            weight = posting.get(key)
+                            if weight and quality * weight > term_scores.get(key, 0):
+                                term_scores[key] = quality * weight
+                else:
+                    for posting, quality in postings:
+                        for key, weight in posting.items():
+                            if scores is not None and key not in scores:
+                                continue
+                            score = quality * weight
+                            if score > term_scores.get(key, 0):
+                                term_scores[key] = score
+                if scores is None:
+                    scores = term_scores
+                else:
+                    scores = {k: scores[k] + s for k, s in term_scores.items()}
+                if not scores:
+                    return []
+            hits = [
+                (-score, key)
+                for key, score in scores.items()
+                if collections is None or key[0] in collections
+            ]
+            best = [(-neg, key) for neg, key in heapq.nsmallest(limit, hits)]
+            best.sort(key=lambda hit: (-hit[0], self._titles[hit[1]][0]))
+            return [
+                {
+                    "collection": name,
+                    "id": record_id,
+                    "title": self._titles[(name, record_id)][0],
+                    "detail": self._titles[(name, record_id)][1],
+                    "score": score,
+                }
+                for score, (name, record_id) in best
+            ]
+
+
+_index: Optional[SearchIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_index() -> SearchIndex:
+    """Return the process-wide search index over the shared repository."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = SearchIndex(storage.get_repository())
+    return _index
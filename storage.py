@@ -0,0 +1,603 @@
+import os
+import queue
+import uuid
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+DATABASE_PATH = os.environ.get("DATABASE_PATH", "plataforma.db")
+# Conexões só de leitura usadas em paralelo pelas sessões
+READ_CONNECTIONS = int(os.environ.get("DATABASE_READ_CONNECTIONS", "8"))
+
+# Campos de cada coleção e o tipo usado para converter valores do SQLite
+SCHEMAS: Dict[str, Dict[str, str]] = {
+    "clients": {
+        "Nome": "text",
+        "Email": "text",
+        "Telefone": "text",
+        "Anotações": "text",
+    },
+    "cases": {
+        "Cliente": "text",
+        "Processo": "text",
+        "Partes": "text",
+        "Advogado": "text",
+        "Data de Abertura": "date",
+        "Status": "text",
+    },
+    "tasks": {
+        "Descrição": "text",
+        "Prioridade": "text",
+        "Prazo": "date",
+        "Cliente": "text",
+        "Caso": "text",
+        # Prazo contado em dias úteis: data inicial, quantidade e calendário
+        "Início": "date",
+        "Dias úteis": "integer",
+        "Calendário": "text",
+        # Vazio em tarefas gravadas antes do campo existir: conta como pendente
+        "Status": "text",
+    },
+    "events": {
+        "Título": "text",
+        "Tipo": "text",
+        "Data": "datetime",
+        "Local": "text",
+        "Cliente": "text",
+        "Caso": "text",
+        "Status": "text",
+        "Descrição": "text",
+        # Regra RRULE (FREQ=WEEKLY;BYDAY=MO) e datas puladas (AAAA-MM-DD,...)
+        "Recorrência": "text",
+        "Exceções": "text",
+    },
+    "transactions": {
+        "Tipo": "text",
+        "Categoria": "text",
+        "Valor": "real",
+        "Descrição": "text",
+        "Data": "date",
+        "Status": "text",
+        "Cliente": "text",
+        "Caso": "text",
+    },
+    "documents": {
+        "Cliente": "text",
+        "Caso": "text",
+        "Título": "text",
+        "Arquivo": "text",
+        "Link": "text",
+    },
+}
+
+INDEXED_FIELDS = ("Cliente", "Processo", "Status", "Data", "Prazo")
+
+# listener(collection, operation, record_id, record); record é None em "delete"
+Listener = Callable[[str, str, str, Optional[Dict]], None]
+
+_SQL_TYPES = {
+    "text": "TEXT",
+    "date": "TEXT",
+    "datetime": "TEXT",
+    "real": "REAL",
+    "integer": "INTEGER",
+}
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _to_sql(value: Any) -> Any:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def _from_sql(kind: str, value: Any) -> Any:
+    if value is None:
+        return None
+    if kind == "date":
+        return date.fromisoformat(value[:10])
+    if kind == "datetime":
+        return datetime.fromisoformat(value)
+    if kind == "integer":
+        # Bancos antigos guardaram a contagem como REAL (15.0)
+        return int(value)
+    return value
+
+
+def _casefold(value: Optional[str]) -> str:
+    return value.casefold() if value else ""
+
+
+def new_id() -> str:
+    """Return a new unique record id."""
+    return uuid.uuid4().hex
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.create_function("casefold", 1, _casefold, deterministic=True)
+    return conn
+
+
+class ConflictError(Exception):
+    """Raised when a record changed after the version an update expected."""
+
+    def __init__(self, name: str, record_id: str):
+        super().__init__(f"{name}/{record_id} foi alterado ou excluído")
+        self.name = name
+        self.record_id = record_id
+
+
+class Repository:
+    """SQLite store for every collection of the panel.
+
+    Each collection is a table with one column per field plus a text ``id``
+    primary key, with indexes on the fields the pages filter by (Cliente,
+    Processo, Status, Data and Prazo). Ids are random and never reused, so
+    a stale id can only miss, never hit another record.
+
+    The repository is shared by every session of the process. Writes go
+    through one connection under :attr:`lock`; reads use a pool of up to
+    ``READ_CONNECTIONS`` connections and never wait for that lock, since in
+    WAL mode SQLite readers see the last committed state while a write is in
+    progress. Every record has a ``version`` that each write increments, so
+    :meth:`update` can be a compare-and-swap, and every collection has a
+    write counter that sessions poll to learn about changes made elsewhere.
+    """
+
+    def __init__(self, path: str = DATABASE_PATH, readers: int = READ_CONNECTIONS):
+        self.path = path
+        self._conn = _connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._lock = threading.RLock()
+        self._collections: Dict[str, "Collection"] = {}
+        self._listeners: List[Listener] = []
+        self._writes: Dict[str, int] = {name: 0 for name in SCHEMAS}
+        # Um banco em memória só existe na conexão de escrita
+        self._readers = 0 if path == ":memory:" else readers
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._opened = 0
+        self._readers_lock = threading.Lock()
+        with self._lock:
+            for name, fields in SCHEMAS.items():
+                columns = ", ".join(
+                    f"{_quote(f)} {_SQL_TYPES[kind]}" for f, kind in fields.items()
+                )
+                self._conn.execute(
+                    f"CREATE TABLE IF NOT EXISTS {name} "
+                    f"(id TEXT PRIMARY KEY, {columns}, "
+                    "version INTEGER NOT NULL DEFAULT 1)"
+                )
+                # Bancos criados por versões anteriores ganham os campos novos
+                existing = {
+                    row[1]
+                    for row in self._conn.execute(f"PRAGMA table_info({name})")
+                }
+                for field, kind in fields.items():
+                    if field not in existing:
+                        self._conn.execute(
+                            f"ALTER TABLE {name} ADD COLUMN "
+                            f"{_quote(field)} {_SQL_TYPES[kind]}"
+                        )
+                if "version" not in existing:
+                    self._conn.execute(
+                        f"ALTER TABLE {name} ADD COLUMN "
+                        "version INTEGER NOT NULL DEFAULT 1"
+                    )
+                for field in INDEXED_FIELDS:
+                    if field in fields:
+                        index = f"{name}_{field.lower()}_idx"
+                        self._conn.execute(
+                            f"CREATE INDEX IF NOT EXISTS {index} "
+                            f"ON {name} ({_quote(field)})"
+                        )
+            self._conn.commit()
+
+    @property
+    def lock(self) -> threading.RLock:
+        """Lock held during every write and listener notification."""
+        return self._lock
+
+    def collection(self, name: str) -> "Collection":
+        """Return the list-like view of a collection."""
+        with self._lock:
+            if name not in self._collections:
+                self._collections[name] = Collection(self, name)
+            return self._collections[name]
+
+    def subscribe(self, listener: Listener) -> None:
+        """Call ``listener`` after every insert, update and delete.
+
+        Listeners run under the repository lock, in write order, and are used
+        to keep in-memory structures in step with the tables.
+        """
+        with self._lock:
+            self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Listener) -> None:
+        """Stop calling a listener added with :meth:`subscribe`."""
+        with self._lock:
+            self._listeners.remove(listener)
+
+    def write_count(self, name: str) -> int:
+        """Return how many records of a collection were written so far."""
+        return self._writes[name]
+
+    def _notify(
+        self, name: str, operation: str, record_id: str, record: Optional[Dict]
+    ) -> None:
+        self._writes[name] += 1
+        if record is not None:
+            record = {"id": record_id, **{f: record.get(f) for f in SCHEMAS[name]}}
+        for listener in self._listeners:
+            listener(name, operation, record_id, record)
+
+    def execute(self, sql: str, params: Iterable = ()) -> List[Tuple]:
+        """Run a statement on the write connection and commit."""
+        with self._lock:
+            cursor = self._conn.execute(sql, tuple(params))
+            rows = cursor.fetchall()
+            self._conn.commit()
+            return rows
+
+    @contextmanager
+    def _reader(self) -> Iterator[sqlite3.Connection]:
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            with self._readers_lock:
+                opened = self._opened < self._readers
+                if opened:
+                    self._opened += 1
+            if opened:
+                conn = _connect(self.path)
+                conn.execute("PRAGMA query_only=ON")
+            else:
+                # Todas ocupadas: espera a próxima que for devolvida
+                conn = self._idle.get()
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+    def read(self, sql: str, params: Iterable = ()) -> List[Tuple]:
+        """Run a read-only statement without taking the write lock."""
+        if not self._readers:
+            return self.execute(sql, params)
+        with self._reader() as conn:
+            return conn.execute(sql, tuple(params)).fetchall()
+
+    def insert(self, name: str, record: Dict) -> str:
+        fields = SCHEMAS[name]
+        columns = ", ".join(_quote(f) for f in fields)
+        marks = ", ".join("?" for _ in fields)
+        record_id = record.get("id") or new_id()
+        with self._lock:
+            self.execute(
+                f"INSERT INTO {name} (id, {columns}) VALUES (?, {marks})",
+                [record_id] + [_to_sql(record.get(f)) for f in fields],
+            )
+            self._notify(name, "insert", record_id, record)
+        return record_id
+
+    def insert_many(self, name: str, records: List[Dict]) -> List[str]:
+        """Insert ``records`` in a single transaction and return their ids."""
+        fields = SCHEMAS[name]
+        columns = ", ".join(_quote(f) for f in fields)
+        marks = ", ".join("?" for _ in fields)
+        ids = [record.get("id") or new_id() for record in records]
+        with self._lock:
+            with self._conn:
+                self._conn.executemany(
+                    f"INSERT INTO {name} (id, {columns}) VALUES (?, {marks})",
+                    [
+                        [record_id] + [_to_sql(record.get(f)) for f in fields]
+                        for record_id, record in zip(ids, records)
+                    ],
+                )
+            for record_id, record in zip(ids, records):
+                self._notify(name, "insert", record_id, record)
+        return ids
+
+    def update(
+        self,
+        name: str,
+        record_id: str,
+        record: Dict,
+        version: Optional[int] = None,
+    ) -> bool:
+        """Replace the fields of a record and return whether it exists.
+
+        With ``version``, the update only applies if the record is still at
+        that version and raises :class:`ConflictError` otherwise, so an edit
+        based on a stale read never overwrites someone else's change.
+        """
+        fields = SCHEMAS[name]
+        assignments = ", ".join(f"{_quote(f)} = ?" for f in fields)
+        params = [_to_sql(record.get(f)) for f in fields] + [record_id]
+        where = "id = ?"
+        if version is not None:
+            where += " AND version = ?"
+            params.append(version)
+        with self._lock:
+            cursor = self._conn.execute(
+                f"UPDATE {name} SET {assignments}, version = version + 1 "
+                f"WHERE {where}",
+                params,
+            )
+            self._conn.commit()
+            if not cursor.rowcount:
+                if version is not None:
+                    raise ConflictError(name, record_id)
+                return False
+            self._notify(name, "update", record_id, record)
+        return True
+
+    def update_many(
+        self,
+        name: str,
+        records: List[Dict],
+        versions: Optional[List[int]] = None,
+    ) -> List[Dict]:
+        """Update several records, each carrying its ``id``, in one transaction.
+
+        With ``versions`` (one per record), a record only changes while it is
+        still at its version; records changed since they were read are left
+        alone. Returns the records that were updated.
+        """
+        fields = SCHEMAS[name]
+        assignments = ", ".join(f"{_quote(f)} = ?" for f in fields)
+        sql = f"UPDATE {name} SET {assignments}, version = version + 1 WHERE id = ?"
+        with self._lock:
+            with self._conn:
+                if versions is None:
+                    self._conn.executemany(
+                        sql,
+                        [
+                            [_to_sql(record.get(f)) for f in fields] + [record["id"]]
+                            for record in records
+                        ],
+                    )
+                    updated = records
+                else:
+                    updated = []
+                    for record, version in zip(records, versions):
+                        params = [_to_sql(record.get(f)) for f in fields]
+                        cursor = self._conn.execute(
+                            sql + " AND version = ?", params + [record["id"], version]
+                        )
+                        if cursor.rowcount:
+                            updated.append(record)
+            for record in updated:
+                self._notify(name, "update", record["id"], record)
+        return updated
+
+    def delete(self, name: str, record_id: str) -> bool:
+        """Delete a record and return whether it existed."""
+        with self._lock:
+            cursor = self._conn.execute(f"DELETE FROM {name} WHERE id = ?", [record_id])
+            self._conn.commit()
+            if not cursor.rowcount:
+                return False
+            self._notify(name, "delete", record_id, None)
+        return True
+
+    def existing_ids(self, name: str, ids: List[str]) -> List[str]:
+        """Return which of ``ids`` are already used in a collection."""
+        found: List[str] = []
+        # O SQLite limita a quantidade de parâmetros por consulta
+        for start in range(0, len(ids), 500):
+            chunk = ids[start : start + 500]
+            marks = ", ".join("?" for _ in chunk)
+            rows = self.read(f"SELECT id FROM {name} WHERE id IN ({marks})", chunk)
+            found.extend(row[0] for row in rows)
+        return found
+
+    def rows_to_records(self, name: str, rows: List[Tuple]) -> List[Dict]:
+        """Convert ``SELECT id, <fields>`` rows into record dicts."""
+        fields = SCHEMAS[name]
+        records = []
+        for row in rows:
+            record = {"id": row[0]}
+            for (f, kind), value in zip(fields.items(), row[1:]):
+                record[f] = _from_sql(kind, value)
+            records.append(record)
+        return records
+
+    def select(
+        self,
+        name: str,
+        where: str = "",
+        params: Iterable = (),
+        order_by: str = "rowid",
+        limit: Optional[int] = None,
+    ) -> List[Tuple]:
+        """Run ``SELECT id, <fields>`` on a collection and return raw rows."""
+        columns = ", ".join(_quote(f) for f in SCHEMAS[name])
+        sql = f"SELECT id, {columns} FROM {name}"
+        if where:
+            sql += f" WHERE {where}"
+        sql += f" ORDER BY {order_by}"
+        params = list(params)
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return self.read(sql, params)
+
+    def iter_chunks(self, name: str, size: int = 2000) -> Iterator[List[Dict]]:
+        """Yield every record of a collection in insertion order, ``size`` at a time.
+
+        Each chunk is a separate query resuming after the last rowid seen, so
+        writes are not blocked for the whole scan.
+        """
+        columns = ", ".join(_quote(f) for f in SCHEMAS[name])
+        last = 0
+        while True:
+            rows = self.read(
+                f"SELECT rowid, id, {columns} FROM {name} "
+                "WHERE rowid > ? ORDER BY rowid LIMIT ?",
+                [last, size],
+            )
+            if not rows:
+                return
+            last = rows[-1][0]
+            yield self.rows_to_records(name, [row[1:] for row in rows])
+
+
+class Collection:
+    """View of a repository table kept in ``st.session_state``.
+
+    Records are dicts carrying their ``id``; :meth:`get`, :meth:`update` and
+    :meth:`delete` address them through the primary key index, and
+    :meth:`query` filters with the column indexes. Each session gets its own
+    view, which counts the records it wrote in :attr:`writes` so that only
+    changes made by other sessions are reported to it.
+    """
+
+    def __init__(self, repo: Repository, name: str):
+        self.repo = repo
+        self.name = name
+        self.fields = SCHEMAS[name]
+        self.writes = 0
+
+    def __len__(self) -> int:
+        return self.repo.read(f"SELECT COUNT(*) FROM {self.name}")[0][0]
+
+    def __bool__(self) -> bool:
+        return bool(self.repo.read(f"SELECT 1 FROM {self.name} LIMIT 1"))
+
+    def __iter__(self) -> Iterator[Dict]:
+        return iter(self.repo.rows_to_records(self.name, self.repo.select(self.name)))
+
+    def __contains__(self, record_id: object) -> bool:
+        return bool(
+            self.repo.read(f"SELECT 1 FROM {self.name} WHERE id = ?", [record_id])
+        )
+
+    def get(self, record_id: str) -> Optional[Dict]:
+        """Return the record with ``record_id`` or ``None``."""
+        rows = self.repo.select(self.name, "id = ?", [record_id])
+        records = self.repo.rows_to_records(self.name, rows)
+        return records[0] if records else None
+
+    def version(self, record_id: str) -> Optional[int]:
+        """Return the current version of a record, or ``None`` if it is gone."""
+        rows = self.repo.read(
+            f"SELECT version FROM {self.name} WHERE id = ?", [record_id]
+        )
+        return rows[0][0] if rows else None
+
+    def get_versioned(self, record_id: str) -> Tuple[Optional[Dict], Optional[int]]:
+        """Return a record together with its version, read in one statement."""
+        columns = ", ".join(_quote(f) for f in self.fields)
+        rows = self.repo.read(
+            f"SELECT version, id, {columns} FROM {self.name} WHERE id = ?",
+            [record_id],
+        )
+        if not rows:
+            return None, None
+        return self.repo.rows_to_records(self.name, [rows[0][1:]])[0], rows[0][0]
+
+    def append(self, record: Dict) -> str:
+        """Insert a record and return its id."""
+        record_id = self.repo.insert(self.name, record)
+        self.writes += 1
+        return record_id
+
+    def update(
+        self, record_id: str, record: Dict, version: Optional[int] = None
+    ) -> None:
+        """Update a record; see :meth:`Repository.update` for ``version``."""
+        if self.repo.update(self.name, record_id, record, version):
+            self.writes += 1
+
+    def update_many(self, records: List[Dict], versions: List[int]) -> List[Dict]:
+        """Update several records at once; see :meth:`Repository.update_many`."""
+        updated = self.repo.update_many(self.name, records, versions)
+        self.writes += len(updated)
+        return updated
+
+    def delete(self, record_id: str) -> None:
+        if self.repo.delete(self.name, record_id):
+            self.writes += 1
+
+    def values(self, field: str) -> List[Any]:
+        """Return one field of every record, in insertion order."""
+        kind = self.fields[field]
+        rows = self.repo.read(f"SELECT {_quote(field)} FROM {self.name} ORDER BY rowid")
+        return [_from_sql(kind, row[0]) for row in rows]
+
+    def distinct(self, field: str) -> List[Any]:
+        """Return the sorted distinct values of a field."""
+        kind = self.fields[field]
+        rows = self.repo.read(
+            f"SELECT DISTINCT {_quote(field)} FROM {self.name} "
+            f"WHERE {_quote(field)} IS NOT NULL ORDER BY 1"
+        )
+        return [_from_sql(kind, row[0]) for row in rows]
+
+    def query(
+        self,
+        search: str = "",
+        search_fields: Tuple[str, ...] = (),
+        equals: Optional[Dict[str, Any]] = None,
+        date_field: Optional[str] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        order_by: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict]:
+        """Filter the collection in SQLite.
+
+        ``equals`` and the ``date_field`` range use the column indexes;
+        ``search`` is a case-insensitive substring match on ``search_fields``.
+        """
+        conditions: List[str] = []
+        params: List[Any] = []
+        for field, value in (equals or {}).items():
+            conditions.append(f"{_quote(field)} = ?")
+            params.append(_to_sql(value))
+        if date_field and date_from is not None:
+            conditions.append(f"{_quote(date_field)} >= ?")
+            params.append(_to_sql(date_from))
+        if date_field and date_to is not None:
+            # O limite é o dia seguinte exclusivo para incluir os horários do
+            # último dia em campos com data e hora
+            if isinstance(date_to, datetime):
+                date_to = date_to.date()
+            conditions.append(f"{_quote(date_field)} < ?")
+            params.append((date_to + timedelta(days=1)).isoformat())
+        if search and search_fields:
+            conditions.append(
+                "("
+                + " OR ".join(
+                    f"instr(casefold({_quote(f)}), ?) > 0" for f in search_fields
+                )
+                + ")"
+            )
+            params.extend([search.casefold()] * len(search_fields))
+        order = f"{_quote(order_by)}, rowid" if order_by else "rowid"
+        rows = self.repo.select(
+            self.name, " AND ".join(conditions), params, order, limit
+        )
+        return self.repo.rows_to_records(self.name, rows)
+
+
+_repository: Optional[Repository] = None
+_repository_lock = threading.Lock()
+
+
+def get_repository() -> Repository:
+    """Return the process-wide repository opened on ``DATABASE_PATH``."""
+    global _repository
+    if _repository is None:
+        with _repository_lock:
+            if _repository is None:
+                _repository = Repository()
+    return _repository
@@ -0,0 +1,544 @@
+"""Local stand-in for the Apps Script web app used by :mod:`google_utils`.
+
+Answers the same form-encoded POST actions as the deployed script
+(``append_rows``, ``load_rows``, ``load_rows_since``, ``batch``,
+``upload_file`` and the chunked ``upload_*`` actions) over sheets kept as
+JSON Lines files in a directory, so the panel and the load tests can run
+without a Google account:
+
+    python tools/apps_script_server.py --data apps_script_data --port 8765
+    APPS_SCRIPT_URL=http://127.0.0.1:8765/exec streamlit run app.py
+
+Rows appended to the panel's sheets must have the width of their header
+(:data:`SHEET_HEADERS`); other widths are rejected with 400. Latency,
+server errors, lost replies and quota throttling (HTTP 429 with
+``Retry-After``) can be injected to reproduce a slow or overloaded script.
+``GET /stats`` returns request counters; ``GET /files/...`` serves uploads.
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, deque
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, quote, unquote
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import ui  # noqa: E402
+
+# Cabeçalhos das planilhas do painel, na ordem em que ui.sync_records envia
+SHEET_HEADERS = {
+    sheet: ui.sheet_columns(collection) for collection, sheet in ui.SHEET_NAMES.items()
+}
+# Execuções simultâneas aceitas pelo Apps Script antes de recusar
+MAX_CONCURRENT = 30
+
+
+class Faults:
+    """Faults injected before (or after) each action is executed.
+
+    ``latency`` seconds are added to every request, plus a uniform random
+    ``jitter``. ``error_rate`` of the requests fail with 500 before doing
+    anything, and ``lost_rate`` fail with 503 after the action ran, as when
+    the reply is lost and the client retries a write that already happened.
+    Above ``quota_per_minute`` requests in the last minute, or
+    ``max_concurrent`` requests in progress, requests get 429.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        lost_rate: float = 0.0,
+        quota_per_minute: int = 0,
+        max_concurrent: int = MAX_CONCURRENT,
+        seed: Optional[int] = None,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.lost_rate = lost_rate
+        self.quota_per_minute = quota_per_minute
+        self.max_concurrent = max_concurrent
+        self._random = random.Random(seed)
+        self._recent: Deque[float] = deque()
+        self._running = 0
+        self._lock = threading.Lock()
+
+    def admit(self) -> Optional[int]:
+        """Start a request; return seconds to wait if it is throttled."""
+        now = time.monotonic()
+        with self._lock:
+            if self.quota_per_minute:
+                while self._recent and now - self._recent[0] >= 60:
+                    self._recent.popleft()
+                if len(self._recent) >= self.quota_per_minute:
+                    return max(1, int(61 - (now - self._recent[0])))
+            if self.max_concurrent and self._running >= self.max_concurrent:
+                return 1
+            self._recent.append(now)
+            self._running += 1
+        return None
+
+    def release(self) -> None:
+        with self._lock:
+            self._running -= 1
+
+    def delay(self) -> float:
+        with self._lock:
+            return self.latency + self._random.uniform(0, self.jitter)
+
+    def fails(self, rate: float) -> bool:
+        with self._lock:
+            return rate > 0 and self._random.random() < rate
+
+
+class _Sheet:
+    def __init__(self, path: Path, name: str):
+        self.path = path
+        self.headers = SHEET_HEADERS.get(name, [])
+        self.rows: List[List[Any]] = []
+        self.keys: set = set()
+        self.updated_at = _now()
+        if path.exists():
+            with open(path, encoding="utf-8") as handle:
+                lines = iter(handle)
+                self.headers = json.loads(next(lines))
+                for line in lines:
+                    entry = json.loads(line)
+                    self.rows.append(entry["values"])
+                    if entry.get("key"):
+                        self.keys.add(entry["key"])
+            self.updated_at = _timestamp(path.stat().st_mtime)
+
+    @property
+    def version(self) -> str:
+        return str(len(self.rows))
+
+    def records(self, start: int = 0) -> List[Dict]:
+        # Linha 1 é o cabeçalho, como na planilha: os dados começam na 2
+        rows = self.rows[start:]
+        width = max([len(self.headers)] + [len(values) for values in rows])
+        # Colunas sem cabeçalho levam a letra da coluna, e células vazias ""
+        headers = self.headers + [
+            _column_letter(i) for i in range(len(self.headers), width)
+        ]
+        return [
+            {**dict(zip(headers, values + [""] * (width - len(values)))), "_row": row}
+            for row, values in enumerate(rows, start=start + 2)
+        ]
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds")
+
+
+def _timestamp(seconds: float) -> str:
+    return datetime.fromtimestamp(seconds, timezone.utc).isoformat(
+        timespec="milliseconds"
+    )
+
+
+def _column_letter(index: int) -> str:
+    letters = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+class SheetStore:
+    """Sheets, idempotency keys and uploaded files kept under ``directory``.
+
+    Each sheet is a JSON Lines file: the header row, then one line per
+    appended row with its idempotency key. The version of a sheet is its
+    row count, which only grows, so ``if_version`` can be answered with
+    ``not_modified`` exactly as the deployed script does.
+    """
+
+    def __init__(self, directory: str, base_url: str = ""):
+        self.directory = Path(directory)
+        self.base_url = base_url
+        self.files_dir = self.directory / "files"
+        self.parts_dir = self.directory / "uploads"
+        self.files_dir.mkdir(parents=True, exist_ok=True)
+        self.parts_dir.mkdir(parents=True, exist_ok=True)
+        self._sheets: Dict[str, _Sheet] = {}
+        # (cliente, sha256) -> link; upload_id -> estado do upload em aberto
+        self._links: Dict[Tuple[str, str], str] = {}
+        self._uploads: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def _sheet(self, name: str) -> _Sheet:
+        sheet = self._sheets.get(name)
+        if sheet is None:
+            path = self.directory / f"{quote(name, safe='')}.jsonl"
+            sheet = self._sheets[name] = _Sheet(path, name)
+        return sheet
+
+    def append_rows(
+        self, name: str, rows: List[List], keys: Optional[List[str]] = None
+    ) -> Dict:
+        """Append ``rows``, skipping those whose key was already written."""
+        keys = keys or [None] * len(rows)
+        if len(keys) != len(rows):
+            raise ValueError("keys e rows com tamanhos diferentes")
+        with self._lock:
+            sheet = self._sheet(name)
+            for values in rows:
+                # Uma linha de outra largura deslocaria as colunas da planilha
+                if name in SHEET_HEADERS and len(values) != len(sheet.headers):
+                    raise ValueError(
+                        f"{name}: linha com {len(values)} colunas, o cabeçalho "
+                        f"tem {len(sheet.headers)}"
+                    )
+            new = not sheet.path.exists()
+            lines = []
+            skipped = 0
+            for values, key in zip(rows, keys):
+                if key and key in sheet.keys:
+                    skipped += 1
+                    continue
+                if key:
+                    sheet.keys.add(key)
+                sheet.rows.append(list(values))
+                lines.append(json.dumps({"values": values, "key": key}, default=str))
+            with open(sheet.path, "a", encoding="utf-8") as handle:
+                if new:
+                    handle.write(json.dumps(sheet.headers) + "\n")
+                handle.writelines(line + "\n" for line in lines)
+            if lines:
+                sheet.updated_at = _now()
+            return {
+                "ok": True,
+                "appended": len(lines),
+                "skipped": skipped,
+                "version": sheet.version,
+            }
+
+    def load_rows(self, name: str, if_version: Optional[str] = None) -> Dict:
+        with self._lock:
+            sheet = self._sheet(name)
+            if if_version is not None and if_version == sheet.version:
+                return {"not_modified": True, "version": sheet.version}
+            return {"data": sheet.records(), "version": sheet.version}
+
+    def load_rows_since(self, name: str, since_row: Optional[int] = None) -> Dict:
+        """Return the rows after sheet row ``since_row`` (rows never change)."""
+        with self._lock:
+            sheet = self._sheet(name)
+            start = max(0, since_row - 1) if since_row else 0
+            return {
+                "data": sheet.records(start),
+                "last_row": len(sheet.rows) + 1,
+                "updated_at": sheet.updated_at,
+            }
+
+    def _save_file(self, client: str, filename: str, data: bytes, sha256: str) -> str:
+        folder = self.files_dir / uuid.uuid4().hex
+        folder.mkdir()
+        (folder / Path(filename).name).write_bytes(data)
+        link = f"{self.base_url}/files/{folder.name}/{quote(Path(filename).name)}"
+        self._links[(client, sha256)] = link
+        return link
+
+    def upload_file(self, client: str, filename: str, data: bytes) -> Dict:
+        with self._lock:
+            sha256 = hashlib.sha256(data).hexdigest()
+            return {"link": self._save_file(client, filename, data, sha256)}
+
+    def upload_lookup(self, client: str, sha256: str) -> Dict:
+        with self._lock:
+            return {"link": self._links.get((client, sha256), "")}
+
+    def upload_start(
+        self, client: str, filename: str, sha256: str, size: int, chunk_size: int
+    ) -> Dict:
+        upload_id = uuid.uuid4().hex
+        with self._lock:
+            self._uploads[upload_id] = {
+                "client": client,
+                "filename": filename,
+                "sha256": sha256,
+                "size": size,
+                "chunk_size": chunk_size,
+                "received": set(),
+            }
+        (self.parts_dir / upload_id).write_bytes(b"")
+        return {"upload_id": upload_id}
+
+    def _upload(self, upload_id: str) -> Dict[str, Any]:
+        upload = self._uploads.get(upload_id)
+        if upload is None:
+            raise KeyError(f"Upload desconhecido: {upload_id}")
+        return upload
+
+    def upload_chunk(
+        self, upload_id: str, index: int, offset: int, sha256: str, data: bytes
+    ) -> Dict:
+        if hashlib.sha256(data).hexdigest() != sha256:
+            raise ValueError(f"Pedaço {index} corrompido")
+        with self._lock:
+            upload = self._upload(upload_id)
+            with open(self.parts_dir / upload_id, "r+b") as handle:
+                handle.seek(offset)
+                handle.write(data)
+            upload["received"].add(index)
+        return {"ok": True}
+
+    def upload_status(self, upload_id: str) -> Dict:
+        with self._lock:
+            return {"received": sorted(self._upload(upload_id)["received"])}
+
+    def upload_finish(self, upload_id: str, sha256: str, chunks: int) -> Dict:
+        with self._lock:
+            upload = self._upload(upload_id)
+            missing = [i for i in range(chunks) if i not in upload["received"]]
+            if missing:
+                raise ValueError(f"Faltam os pedaços {missing}")
+            part = self.parts_dir / upload_id
+            data = part.read_bytes()
+            if hashlib.sha256(data).hexdigest() != sha256:
+                raise ValueError("Arquivo montado não confere com o sha256")
+            link = self._save_file(upload["client"], upload["filename"], data, sha256)
+            del self._uploads[upload_id]
+        part.unlink()
+        return {"link": link}
+
+    def file_path(self, relative: str) -> Optional[Path]:
+        path = (self.files_dir / unquote(relative)).resolve()
+        if self.files_dir.resolve() not in path.parents or not path.is_file():
+            return None
+        return path
+
+
+def _parse_multipart(content_type: str, body: bytes) -> Tuple[Dict, Dict]:
+    boundary = content_type.split("boundary=", 1)[1].split(";")[0].strip('"')
+    fields: Dict[str, str] = {}
+    files: Dict[str, Tuple[str, bytes]] = {}
+    for part in body.split(b"--" + boundary.encode())[1:-1]:
+        head, _, data = part[2:].partition(b"\r\n\r\n")
+        data = data[:-2]  # CRLF antes da próxima fronteira
+        disposition = {}
+        for line in head.decode("utf-8").split("\r\n"):
+            if line.lower().startswith("content-disposition:"):
+                for item in line.split(";")[1:]:
+                    key, _, value = item.strip().partition("=")
+                    disposition[key] = value.strip('"')
+        if "filename" in disposition:
+            files[disposition["name"]] = (disposition["filename"], data)
+        else:
+            fields[disposition["name"]] = data.decode("utf-8")
+    return fields, files
+
+
+def _parse_form(content_type: str, body: bytes) -> Tuple[Dict, Dict]:
+    if content_type.startswith("multipart/form-data"):
+        return _parse_multipart(content_type, body)
+    form = parse_qs(body.decode("utf-8"), keep_blank_values=True)
+    return {key: values[0] for key, values in form.items()}, {}
+
+
+class AppsScriptStub:
+    """Dispatch of the Apps Script actions to a :class:`SheetStore`."""
+
+    def __init__(self, store: SheetStore, faults: Optional[Faults] = None):
+        self.store = store
+        self.faults = faults or Faults()
+        self.stats: Counter = Counter()
+        self._stats_lock = threading.Lock()
+
+    def count(self, *names: str) -> None:
+        with self._stats_lock:
+            self.stats.update(names)
+
+    def dispatch(self, form: Dict[str, Any], files: Dict[str, Tuple]) -> Any:
+        action = form.get("action")
+        store = self.store
+        if action == "append_rows":
+            rows = _json(form["rows"])
+            keys = _json(form["keys"]) if form.get("keys") else None
+            return store.append_rows(form["sheet"], rows, keys)
+        if action == "load_rows":
+            return store.load_rows(form["sheet"], form.get("if_version"))
+        if action == "load_rows_since":
+            since_row = form.get("since_row")
+            return store.load_rows_since(
+                form["sheet"], int(since_row) if since_row else None
+            )
+        if action == "batch":
+            return {"results": [self.dispatch(a, {}) for a in _json(form["actions"])]}
+        if action == "upload_file":
+            filename, data = files["file"]
+            return store.upload_file(form["client"], form["filename"], data)
+        if action == "upload_lookup":
+            return store.upload_lookup(form["client"], form["sha256"])
+        if action == "upload_start":
+            return store.upload_start(
+                form["client"],
+                form["filename"],
+                form["sha256"],
+                int(form["size"]),
+                int(form["chunk_size"]),
+            )
+        if action == "upload_chunk":
+            return store.upload_chunk(
+                form["upload_id"],
+                int(form["index"]),
+                int(form["offset"]),
+                form["sha256"],
+                files["chunk"][1],
+            )
+        if action == "upload_status":
+            return store.upload_status(form["upload_id"])
+        if action == "upload_finish":
+            return store.upload_finish(
+                form["upload_id"], form["sha256"], int(form["chunks"])
+            )
+        raise ValueError(f"Ação desconhecida: {action}")
+
+
+def _json(value):
+    # No batch as ações chegam já decodificadas
+    return json.loads(value) if isinstance(value, str) else value
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # mantém as conexões abertas, como o Google
+    stub: AppsScriptStub
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+    def _reply(
+        self, status: int, body: bytes, content_type: str, headers: Dict = None
+    ) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _json(self, status: int, payload: Any, headers: Dict = None) -> None:
+        body = json.dumps(payload, default=str, ensure_ascii=False).encode("utf-8")
+        self._reply(status, body, "application/json; charset=utf-8", headers)
+
+    def do_GET(self) -> None:
+        if self.path == "/stats":
+            with self.stub._stats_lock:
+                self._json(200, dict(self.stub.stats))
+            return
+        if self.path.startswith("/files/"):
+            path = self.stub.store.file_path(self.path[len("/files/") :])
+            if path is not None:
+                self._reply(200, path.read_bytes(), "application/octet-stream")
+                return
+        self._json(404, {"error": "not found"})
+
+    def do_POST(self) -> None:
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        stub, faults = self.stub, self.stub.faults
+        wait = faults.admit()
+        if wait is not None:
+            stub.count("requests", "throttled")
+            self._json(429, {"error": "quota"}, {"Retry-After": str(wait)})
+            return
+        try:
+            form, files = _parse_form(self.headers.get("Content-Type", ""), body)
+            action = form.get("action", "?")
+            stub.count("requests", f"action:{action}")
+            time.sleep(faults.delay())
+            if faults.fails(faults.error_rate):
+                stub.count("errors")
+                self._json(500, {"error": "injected"})
+                return
+            try:
+                result = stub.dispatch(form, files)
+            except (KeyError, ValueError) as error:
+                stub.count("bad_requests")
+                self._json(400, {"error": str(error)})
+                return
+            if faults.fails(faults.lost_rate):
+                stub.count("lost")
+                self._json(503, {"error": "reply lost"})
+                return
+            self._json(200, result)
+        finally:
+            faults.release()
+
+
+def make_server(
+    directory: str,
+    host: str = "127.0.0.1",
+    port: int = 0,
+    faults: Optional[Faults] = None,
+) -> ThreadingHTTPServer:
+    """Return a server bound to ``host:port`` (0 picks a free port).
+
+    Call ``serve_forever()`` (e.g. in a daemon thread) to start answering;
+    the ``stub`` attribute gives access to the store, faults and counters.
+    """
+    handler = type("Handler", (_Handler,), {})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    base_url = f"http://{host}:{server.server_address[1]}"
+    server.url = f"{base_url}/exec"
+    server.stub = handler.stub = AppsScriptStub(SheetStore(directory, base_url), faults)
+    return server
+
+
+def add_fault_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the ``--latency``/``--error-rate``/... options of :class:`Faults`."""
+    parser.add_argument("--latency", type=float, default=0.0, help="segundos")
+    parser.add_argument("--jitter", type=float, default=0.0, help="segundos")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--lost-rate", type=float, default=0.0)
+    parser.add_argument("--quota-per-minute", type=int, default=0)
+    parser.add_argument("--max-concurrent", type=int, default=MAX_CONCURRENT)
+    parser.add_argument("--fault-seed", type=int)
+
+
+def faults_from_args(args: argparse.Namespace) -> Faults:
+    return Faults(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        lost_rate=args.lost_rate,
+        quota_per_minute=args.quota_per_minute,
+        max_concurrent=args.max_concurrent,
+        seed=args.fault_seed,
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data", default="apps_script_data")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    add_fault_arguments(parser)
+    args = parser.parse_args()
+    server = make_server(args.data, args.host, args.port, faults_from_args(args))
+    print(f"APPS_SCRIPT_URL={server.url} (dados em {args.data})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,325 @@
+import streamlit as st
+from datetime import date, timedelta
+
+import calendar_feed
+import google_utils
+import recurrence
+import storage
+import write_queue
+
+
+# Compatibilidade para diferentes versões do Streamlit
+def rerun():
+    """Rerun a aplicação de forma compatível com diferentes versões."""
+    try:
+        st.rerun()  # Streamlit 1.25+
+    except Exception:
+        # Fallback para versões antigas
+        st.experimental_rerun()
+
+
+CASE_STATUS_COLORS = {"Ativo": "green", "Encerrado": "red", "Suspenso": "orange"}
+# As cores de eventos e tarefas são as mesmas do calendário
+EVENT_STATUS_COLORS = calendar_feed.EVENT_STATUS_COLORS
+TASK_PRIORITY_COLORS = calendar_feed.TASK_PRIORITY_COLORS
+TASK_STATUS_COLORS = calendar_feed.TASK_STATUS_COLORS
+PAYMENT_STATUS_COLORS = {"Pendente": "orange", "Pago": "green"}
+PAGE_SIZES = [10, 25, 50, 100]
+
+# Planilhas do Apps Script que recebem cada coleção
+SHEET_NAMES = {
+    "clients": "Clientes",
+    "cases": "Casos",
+    "tasks": "Tarefas",
+    "events": "Eventos",
+    "transactions": "Financeiro",
+    "documents": "Documentos",
+}
+
+
+def item_separator() -> None:
+    """Render a horizontal rule with extra spacing."""
+    st.markdown("<hr style='margin:25px 0'>", unsafe_allow_html=True)
+
+
+def recurrence_inputs(key: str = "recurrence"):
+    """Render the repeat options of an event form and return the RRULE or None.
+
+    The widgets are keyed under ``key`` so that :func:`recurrence_value` can
+    read the rule again from a button callback.
+    """
+    frequency = st.selectbox(
+        "Repetir",
+        ["Não repetir"] + list(recurrence.FREQUENCIES),
+        key=f"{key}_frequency",
+    )
+    if frequency == "Não repetir":
+        return None
+    col1, col2 = st.columns(2)
+    col1.number_input("A cada", min_value=1, value=1, step=1, key=f"{key}_interval")
+    ending = col2.selectbox(
+        "Termina", ["Nunca", "Em uma data", "Após N vezes"], key=f"{key}_ending"
+    )
+    if frequency == "Semanal":
+        st.multiselect(
+            "Dias da semana", list(recurrence.WEEKDAYS), key=f"{key}_weekdays"
+        )
+    if ending == "Em uma data":
+        st.date_input(
+            "Até", value=date.today() + timedelta(days=90), key=f"{key}_until"
+        )
+    elif ending == "Após N vezes":
+        st.number_input(
+            "Ocorrências", min_value=1, value=10, step=1, key=f"{key}_count"
+        )
+    return recurrence_value(key)
+
+
+def recurrence_value(key: str = "recurrence"):
+    """Return the RRULE chosen in :func:`recurrence_inputs`, or None."""
+    state = st.session_state
+    frequency = state.get(f"{key}_frequency", "Não repetir")
+    if frequency == "Não repetir":
+        return None
+    ending = state[f"{key}_ending"]
+    until = state[f"{key}_until"] if ending == "Em uma data" else None
+    count = int(state[f"{key}_count"]) if ending == "Após N vezes" else None
+    weekdays = state.get(f"{key}_weekdays", []) if frequency == "Semanal" else []
+    interval = int(state[f"{key}_interval"])
+    return recurrence.build_rule(frequency, interval, until, count, weekdays)
+
+
+def business_day_inputs(start=None, days=None, calendar_name=None, key="deadline"):
+    """Render the business-day deadline calculator.
+
+    Returns ``(início, dias úteis, calendário, prazo)``, or None when the
+    user chose to type the date. :func:`business_day_value` reads the same
+    result from the widgets keyed under ``key``.
+    """
+    if not st.checkbox(
+        "Calcular em dias úteis", value=days is not None, key=f"{key}_business_days"
+    ):
+        return None
+    import business_days
+
+    col1, col2 = st.columns(2)
+    col1.date_input(
+        "Data da intimação", value=start or date.today(), key=f"{key}_start"
+    )
+    col2.number_input(
+        "Dias úteis", min_value=1, value=int(days or 15), key=f"{key}_days"
+    )
+    calendars = list(business_days.CALENDARS)
+    st.selectbox(
+        "Calendário",
+        calendars,
+        index=calendars.index(calendar_name) if calendar_name in calendars else 0,
+        key=f"{key}_calendar",
+    )
+    start, days, calendar_name, due = business_day_value(key)
+    st.info(f"Prazo final: {due.strftime('%d/%m/%Y')}")
+    calendar = business_days.get_calendar(calendar_name)
+    skipped = sorted({name for _, name in calendar.holidays_between(start, due)})
+    if skipped:
+        st.caption("Não contados: " + ", ".join(skipped))
+    return start, days, calendar_name, due
+
+
+def business_day_value(key: str = "deadline"):
+    """Return the result of :func:`business_day_inputs` from the session state."""
+    state = st.session_state
+    if not state.get(f"{key}_business_days"):
+        return None
+    import business_days
+
+    start = state[f"{key}_start"]
+    days = int(state[f"{key}_days"])
+    calendar_name = state[f"{key}_calendar"]
+    due = business_days.get_calendar(calendar_name).due_date(start, days)
+    return start, days, calendar_name, due
+
+
+def paginate(collection: str, frame) -> list:
+    """Render page controls and return the records of the current page.
+
+    ``frame`` is a result of :meth:`columnar.ColumnarStore.select`.
+    """
+    import columnar
+
+    total = len(frame)
+    col1, col2, col3 = st.columns([1, 1, 2])
+    page_size = col1.selectbox(
+        "Itens por página", PAGE_SIZES, index=1, key=f"{collection}_page_size"
+    )
+    pages = max(1, -(-total // page_size))
+    page_key = f"{collection}_page"
+    # Filtros podem reduzir o total abaixo da página guardada
+    if st.session_state.get(page_key, 1) > pages:
+        st.session_state[page_key] = pages
+    page = col2.number_input(
+        "Página", min_value=1, max_value=pages, step=1, key=page_key
+    )
+    col3.caption(f"{total} registro(s) · página {page} de {pages}")
+    start = (page - 1) * page_size
+    return columnar.get_store().to_records(
+        collection, frame.iloc[start : start + page_size]
+    )
+
+
+def delete_record(collection: str, record_id: str, fragment: str) -> None:
+    """Button callback: delete a record and rerun only the list ``fragment``."""
+    st.session_state[collection].delete(record_id)
+    st.rerun(fragment)
+
+
+def request_dialog(fragment: str, dialog, *args) -> None:
+    """Button callback: open ``dialog(*args)`` from the list ``fragment``.
+
+    A dialog closes when the fragment that opened it reruns, so the list
+    opens it in :func:`show_requested_dialog` and Salvar reruns just the
+    list (see :func:`close_dialog`).
+    """
+    st.session_state[f"_dialog_{fragment}"] = (dialog, args)
+    st.rerun(fragment)
+
+
+def request_edit(collection: str, record_id: str, edit_dialog, fragment: str) -> None:
+    """Button callback: open the edit dialog of a record at its current version."""
+    version = st.session_state[collection].version(record_id)
+    request_dialog(fragment, edit_dialog, record_id, version)
+
+
+def show_requested_dialog(fragment: str) -> None:
+    """Open the dialog requested with :func:`request_dialog`, if any.
+
+    Call it from the body of the list ``fragment``; it also shows the
+    message of a dialog just saved there.
+    """
+    show_dialog_message()
+    request = st.session_state.pop(f"_dialog_{fragment}", None)
+    if request is not None:
+        dialog, args = request
+        dialog(*args, fragment=fragment)
+
+
+def form_values(form: str) -> dict:
+    """Return the widget values keyed ``{form}_<campo>``, by campo."""
+    prefix = f"{form}_"
+    return {
+        key[len(prefix) :]: value
+        for key, value in st.session_state.items()
+        if key.startswith(prefix)
+    }
+
+
+def show_form_error(form: str) -> None:
+    """Show the error a Salvar callback left for the dialog ``form``."""
+    error = st.session_state.pop(f"{form}_error", None)
+    if error:
+        st.error(error)
+
+
+def show_dialog_message() -> None:
+    """Toast the message left by :func:`close_dialog`, if any."""
+    message = st.session_state.pop("_dialog_message", None)
+    if message:
+        st.toast(message)
+
+
+def close_dialog(form: str, fragment, message: str) -> None:
+    """Salvar callback ending: clear ``form``, close the dialog and rerun.
+
+    ``fragment`` is the key (or keys) of the fragment that opened the
+    dialog; None reruns the whole page, for dialogs opened outside a list.
+    ``message`` is shown by :func:`show_dialog_message` in the rerun, since
+    callbacks of a fragment rerun must not draw elements.
+    """
+    prefix = f"{form}_"
+    for key in [key for key in st.session_state if key.startswith(prefix)]:
+        del st.session_state[key]
+    st.session_state["_dialog_message"] = message
+    st.rerun(fragment or "app")
+
+
+def record_actions(
+    collection: str, name: str, record_id: str, edit_dialog, fragment: str
+) -> None:
+    """Render the Editar/Excluir buttons of one listed record.
+
+    Both buttons act in callbacks that rerun only the list ``fragment`` (a
+    ``@st.fragment(key=...)``) the row belongs to: Editar opens the edit
+    dialog from that list and Excluir deletes the record.
+    """
+    col1, col2 = st.columns(2)
+    col1.button(
+        "Editar",
+        key=f"edit_{name}_{record_id}",
+        on_click=request_edit,
+        args=(collection, record_id, edit_dialog, fragment),
+    )
+    col2.button(
+        "Excluir",
+        key=f"del_{name}_{record_id}",
+        on_click=delete_record,
+        args=(collection, record_id, fragment),
+    )
+
+
+def status_badge(status: str, mapping: dict) -> str:
+    """Return HTML string for a colored status badge."""
+    color = mapping.get(status, "gray")
+    return f"<span style='color:{color}; font-weight:bold'>{status}</span>"
+
+
+def report_progress(bar, label: str):
+    """Return a callback that shows report generation progress in ``bar``."""
+
+    def update(done: int, total: int) -> None:
+        bar.progress(
+            done / total if total else 1.0,
+            text=f"Gerando {label}: {done} de {total} linhas",
+        )
+
+    return update
+
+
+def import_progress(bar):
+    """Return a callback that shows import progress in ``bar``."""
+
+    def update(done: int, total) -> None:
+        if total:
+            bar.progress(min(done / total, 1.0), text=f"{done} de {total} linhas lidas")
+        else:
+            bar.progress(0.0, text=f"{done} linhas lidas")
+
+    return update
+
+
+def sync_record(collection: str, record: dict) -> None:
+    """Queue a new record for its Apps Script sheet without blocking the UI."""
+    sync_records(collection, [record])
+
+
+def sheet_columns(collection: str) -> list:
+    """Return the column order of a collection's sheet: ``id``, then the schema."""
+    return ["id", *storage.SCHEMAS[collection]]
+
+
+def sheet_row(collection: str, record: dict) -> list:
+    """Return ``record`` as a sheet row in :func:`sheet_columns` order."""
+    row = [record.get(field) for field in sheet_columns(collection)]
+    return [v.isoformat() if isinstance(v, date) else v for v in row]
+
+
+def sync_records(collection: str, records: list, queue=None) -> None:
+    """Queue several new records with a single journal write.
+
+    ``queue`` defaults to the process-wide write queue, used only when an
+    Apps Script URL is configured.
+    """
+    if queue is None:
+        if not google_utils.is_configured():
+            return
+        queue = write_queue.get_queue()
+    rows = [sheet_row(collection, record) for record in records]
+    queue.enqueue_many(SHEET_NAMES[collection], rows)
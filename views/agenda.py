@@ -0,0 +1,126 @@
+import streamlit as st
+from datetime import date, timedelta
+import pandas as pd
+
+import columnar
+import recurrence
+import storage
+from dialogs import dialog_add_event, dialog_edit_event
+from ui import (
+    EVENT_STATUS_COLORS,
+    item_separator,
+    paginate,
+    record_actions,
+    request_dialog,
+    request_edit,
+    show_requested_dialog,
+    status_badge,
+)
+
+store = columnar.get_store()
+
+st.title("Agenda")
+st.button(
+    "Adicionar Evento", on_click=request_dialog, args=("events_list", dialog_add_event)
+)
+
+
+def skip_occurrence(record_id: str, day: date) -> None:
+    # Lê e grava com a versão lida: se outra sessão alterou a série entre
+    # uma coisa e outra, tenta de novo sobre a versão atual
+    while True:
+        series_record, version = st.session_state.events.get_versioned(record_id)
+        if series_record is None:
+            break
+        skipped = recurrence.parse_exceptions(series_record["Exceções"])
+        series_record["Exceções"] = recurrence.format_exceptions(skipped + (day,))
+        try:
+            st.session_state.events.update(record_id, series_record, version=version)
+        except storage.ConflictError:
+            continue
+        break
+    st.rerun("events_list")
+
+
+def occurrence_actions(e: dict) -> None:
+    col1, col2 = st.columns(2)
+    occurrence_key = f"{e['id']}_{e['Data']:%Y%m%d%H%M}"
+    col1.button(
+        "Editar",
+        key=f"edit_event_{occurrence_key}",
+        on_click=request_edit,
+        args=("events", e["id"], dialog_edit_event, "events_list"),
+    )
+    if e["Recorrência"]:
+        col2.button(
+            "Pular esta data",
+            key=f"skip_event_{occurrence_key}",
+            on_click=skip_occurrence,
+            args=(e["id"], e["Data"].date()),
+        )
+
+
+@st.fragment(key="events_list")
+def events_list():
+    show_requested_dialog("events_list")
+    st.subheader("Eventos")
+    search_event = st.text_input("Buscar", key="search_event")
+    statuses_evt = ["Todos"] + store.distinct("events", "Status")
+    status_filter_evt = st.selectbox("Status", statuses_evt, key="status_event")
+    view = st.radio(
+        "Exibir",
+        ["Cadastros", "Ocorrências no período"],
+        horizontal=True,
+    )
+    filtered_events = store.select(
+        "events",
+        search=search_event,
+        search_fields=("Título",),
+        equals={"Status": status_filter_evt} if status_filter_evt != "Todos" else None,
+    )
+    if view == "Ocorrências no período":
+        col1, col2 = st.columns(2)
+        date_from = col1.date_input("De", value=date.today(), key="agenda_from")
+        date_to = col2.date_input(
+            "Até", value=date.today() + timedelta(days=30), key="agenda_to"
+        )
+        # Séries iniciadas até o fim do período são expandidas só dentro dele
+        stamps = filtered_events["_ts_Data"]
+        in_range = (stamps >= pd.Timestamp(date_from)) & (
+            stamps < pd.Timestamp(date_to + timedelta(days=1))
+        )
+        series = filtered_events["Recorrência"].notna() & (
+            stamps < pd.Timestamp(date_to + timedelta(days=1))
+        )
+        occurrences = recurrence.expand_records(
+            store.to_records("events", filtered_events[(in_range | series).to_numpy()]),
+            date_from,
+            date_to,
+        )
+        filtered_events = pd.DataFrame(
+            occurrences,
+            columns=["id"] + list(storage.SCHEMAS["events"]),
+            dtype=object,
+        ).set_index("id")
+    if len(filtered_events):
+        for e in paginate("events", filtered_events):
+            item_separator()
+            status_html = status_badge(e["Status"], EVENT_STATUS_COLORS)
+            st.write(f"**{e['Título']}** - {e['Data'].strftime('%d/%m/%Y %H:%M')}")
+            st.markdown(
+                f"Tipo: {e['Tipo']} | Status: {status_html}", unsafe_allow_html=True
+            )
+            st.write(f"Local: {e['Local']}")
+            if e["Recorrência"]:
+                st.caption(f"Repete: {recurrence.describe(e['Recorrência'])}")
+            if view == "Ocorrências no período":
+                occurrence_actions(e)
+            else:
+                record_actions(
+                    "events", "event", e["id"], dialog_edit_event, "events_list"
+                )
+    else:
+        st.info("Nenhum evento cadastrado")
+
+
+events_list()
@@ -0,0 +1,53 @@
+import streamlit as st
+
+import columnar
+from dialogs import dialog_add_case, dialog_edit_case
+from ui import (
+    CASE_STATUS_COLORS,
+    item_separator,
+    paginate,
+    record_actions,
+    request_dialog,
+    show_requested_dialog,
+    status_badge,
+)
+
+store = columnar.get_store()
+
+st.title("Casos")
+st.button(
+    "Adicionar Caso", on_click=request_dialog, args=("cases_list", dialog_add_case)
+)
+
+
+@st.fragment(key="cases_list")
+def cases_list():
+    show_requested_dialog("cases_list")
+    st.subheader("Lista de Casos")
+    search_case = st.text_input("Buscar", key="search_case")
+    statuses = ["Todos"] + store.distinct("cases", "Status")
+    status_filter = st.selectbox("Filtrar por Status", statuses, key="status_case")
+    filtered_cases = store.select(
+        "cases",
+        search=search_case,
+        search_fields=("Processo", "Cliente"),
+        equals={"Status": status_filter} if status_filter != "Todos" else None,
+    )
+    if len(filtered_cases):
+        for c in paginate("cases", filtered_cases):
+            item_separator()
+            status_html = status_badge(c["Status"], CASE_STATUS_COLORS)
+            st.markdown(f"**Processo:** {c['Processo']} - Cliente: {c['Cliente']}")
+            st.markdown(
+                f"Status: {status_html} | Advogado: {c['Advogado']}",
+                unsafe_allow_html=True,
+            )
+            st.write(f"Data de Abertura: {c['Data de Abertura']}")
+            if c.get("Partes"):
+                st.write(c["Partes"])
+            record_actions("cases", "case", c["id"], dialog_edit_case, "cases_list")
+    else:
+        st.info("Nenhum caso cadastrado")
+
+
+cases_list()
@@ -0,0 +1,24 @@
+import streamlit as st
+
+from ui import CASE_STATUS_COLORS, item_separator, status_badge
+
+st.title("Casos por Cliente")
+if st.session_state.clients:
+    client_names = st.session_state.clients.values("Nome")
+    client_selected = st.selectbox("Cliente", client_names)
+    cases = st.session_state.cases.query(equals={"Cliente": client_selected})
+    st.subheader(f"Casos de {client_selected}")
+    if cases:
+        for c in cases:
+            item_separator()
+            status_html = status_badge(c["Status"], CASE_STATUS_COLORS)
+            col1, col2 = st.columns(2)
+            col1.write(f"Processo: {c['Processo']}")
+            col2.markdown(f"Status: {status_html}", unsafe_allow_html=True)
+            st.write(f"Advogado: {c['Advogado']} | Abertura: {c['Data de Abertura']}")
+            if c.get("Partes"):
+                st.write(c["Partes"])
+    else:
+        st.info("Nenhum caso para este cliente")
+else:
+    st.info("Nenhum cliente cadastrado")
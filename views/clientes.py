@@ -0,0 +1,46 @@
+import streamlit as st
+
+import columnar
+from dialogs import dialog_add_client, dialog_edit_client
+from ui import (
+    item_separator,
+    paginate,
+    record_actions,
+    request_dialog,
+    show_requested_dialog,
+)
+
+store = columnar.get_store()
+
+st.title("Clientes")
+st.button(
+    "Adicionar Cliente",
+    on_click=request_dialog,
+    args=("clients_list", dialog_add_client),
+)
+
+
+# Busca, paginação, diálogos e exclusões reexecutam só a lista
+@st.fragment(key="clients_list")
+def clients_list():
+    show_requested_dialog("clients_list")
+    st.subheader("Lista de Clientes")
+    search_client = st.text_input("Buscar", key="search_client")
+    clients_filtered = store.select(
+        "clients", search=search_client, search_fields=("Nome",)
+    )
+    if len(clients_filtered):
+        for c in paginate("clients", clients_filtered):
+            item_separator()
+            st.write(f"**{c['Nome']}**")
+            st.write(f"Email: {c['Email']} | Telefone: {c['Telefone']}")
+            if c.get("Anotações"):
+                st.write(c["Anotações"])
+            record_actions(
+                "clients", "client", c["id"], dialog_edit_client, "clients_list"
+            )
+    else:
+        st.info("Nenhum cliente cadastrado")
+
+
+clients_list()
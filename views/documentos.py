@@ -0,0 +1,45 @@
+import streamlit as st
+
+import columnar
+from dialogs import dialog_add_document, dialog_edit_document
+from ui import (
+    item_separator,
+    paginate,
+    record_actions,
+    request_dialog,
+    show_requested_dialog,
+)
+
+store = columnar.get_store()
+
+st.title("Documentos")
+st.button(
+    "Anexar Documento",
+    on_click=request_dialog,
+    args=("documents_list", dialog_add_document),
+)
+
+
+@st.fragment(key="documents_list")
+def documents_list():
+    show_requested_dialog("documents_list")
+    st.subheader("Documentos")
+    search_doc = st.text_input("Buscar", key="search_document")
+    filtered_docs = store.select(
+        "documents", search=search_doc, search_fields=("Título",)
+    )
+    if len(filtered_docs):
+        for d in paginate("documents", filtered_docs):
+            item_separator()
+            st.write(f"**{d['Título']}**")
+            st.write(f"Cliente: {d['Cliente']} | Caso: {d['Caso']}")
+            if d.get("Link"):
+                st.markdown(f"[Abrir arquivo]({d['Link']})")
+            record_actions(
+                "documents", "doc", d["id"], dialog_edit_document, "documents_list"
+            )
+    else:
+        st.info("Nenhum documento anexado")
+
+
+documents_list()
@@ -0,0 +1,92 @@
+import streamlit as st
+from datetime import date
+
+import analytics
+import columnar
+import ledger
+from dialogs import dialog_add_expense, dialog_add_income
+from ui import PAYMENT_STATUS_COLORS, item_separator, paginate, status_badge
+
+# Início de cada período a partir da data de hoje
+FINANCE_PERIODS = {
+    "Últimos 12 meses": lambda today: date(today.year - 1, today.month, 1),
+    "Ano atual": lambda today: date(today.year, 1, 1),
+    "Últimos 5 anos": lambda today: date(today.year - 5, today.month, 1),
+    "Tudo": lambda today: None,
+}
+
+store = columnar.get_store()
+finance = ledger.get_ledger()
+
+st.title("Financeiro")
+# Receitas e despesas mudam os totais e os gráficos: salvar reexecuta a página
+col1, col2 = st.columns(2)
+with col1:
+    if st.button("Registrar Receita"):
+        dialog_add_income()
+with col2:
+    if st.button("Registrar Despesa"):
+        dialog_add_expense()
+
+totals = finance.totals()
+pending = finance.group("Status", "Pendente")
+col1, col2, col3, col4 = st.columns(4)
+col1.metric("Receitas", f"R$ {totals['Receita']:,.2f}")
+col2.metric("Despesas", f"R$ {totals['Despesa']:,.2f}")
+col3.metric("Saldo", f"R$ {totals['Saldo']:,.2f}")
+col4.metric("A receber", f"R$ {pending['Receita']:,.2f}")
+
+
+# A paginação dos movimentos não redesenha os gráficos
+@st.fragment(key="finance_moves")
+def finance_moves(start):
+    movements = store.select(
+        "transactions", date_field="Data", date_from=start, order_by="Data"
+    )
+    if len(movements):
+        for t in paginate("transactions", movements):
+            item_separator()
+            status_html = status_badge(t["Status"], PAYMENT_STATUS_COLORS)
+            st.markdown(
+                f"**{t['Tipo']}** - R$ {t['Valor']:.2f} | {status_html}",
+                unsafe_allow_html=True,
+            )
+            st.write(
+                f"{t['Categoria']} | {t['Data']} | "
+                f"Cliente: {t['Cliente']} | Caso: {t['Caso']}"
+            )
+            st.write(t["Descrição"])
+    else:
+        st.info("Nenhum movimento registrado")
+
+
+period = st.selectbox("Período", list(FINANCE_PERIODS), key="finance_period")
+start = FINANCE_PERIODS[period](date.today())
+charts = analytics.get_analytics()
+tab_moves, tab_flow, tab_categories, tab_aging = st.tabs(
+    ["Movimentos", "Fluxo de caixa", "Categorias", "Recebíveis"]
+)
+with tab_moves:
+    finance_moves(start)
+with tab_flow:
+    flow = charts.cash_flow(start)
+    if len(flow):
+        st.bar_chart(flow[["Receita", "Despesa"]], stack=False)
+        st.line_chart(flow[["Acumulado"]])
+        st.dataframe(flow)
+    else:
+        st.info("Nenhum movimento no período")
+with tab_categories:
+    categories = charts.by_category(start)
+    if len(categories):
+        st.bar_chart(categories, horizontal=True, stack=False)
+        st.dataframe(categories)
+    else:
+        st.info("Nenhum movimento no período")
+with tab_aging:
+    aging = charts.receivables_aging(date.today())
+    if len(aging):
+        st.dataframe(aging, hide_index=True)
+    else:
+        st.info("Nenhuma receita pendente")
+st.write(f"**Saldo atual:** R$ {totals['Saldo']:,.2f}")
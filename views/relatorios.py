@@ -0,0 +1,123 @@
+import streamlit as st
+import pandas as pd
+
+import importer
+import reports
+import storage
+from ui import import_progress, item_separator, report_progress, sync_records
+
+REPORT_FORMATS = [
+    (
+        "xlsx",
+        "Excel",
+        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    ),
+    ("pdf", "PDF", "application/pdf"),
+    ("parquet", "Parquet", "application/vnd.apache.parquet"),
+]
+# Cadastros que aceitam importação em lote
+IMPORT_COLLECTIONS = {
+    "Clientes": "clients",
+    "Casos": "cases",
+    "Documentos": "documents",
+    "Agenda": "events",
+    "Tarefas": "tasks",
+    "Movimentos Financeiros": "transactions",
+}
+
+repo = storage.get_repository()
+
+st.title("Relatórios")
+st.write("Exporte listagens para compartilhar com clientes ou colegas.")
+
+report_type = st.selectbox(
+    "Tipo de relatório",
+    ["Casos", "Documentos", "Movimentos Financeiros", "Backup completo"],
+)
+
+data_map = {
+    "Casos": "cases",
+    "Documentos": "documents",
+    "Movimentos Financeiros": "transactions",
+    "Backup completo": reports.BACKUP,
+}
+collection_name = data_map[report_type]
+if collection_name == reports.BACKUP:
+    st.caption("Uma planilha Excel com uma aba para cada cadastro do painel.")
+    has_data = any(st.session_state[name] for name in reports.BACKUP_SHEETS)
+    formats = [f for f in REPORT_FORMATS if f[0] == "xlsx"]
+else:
+    has_data = bool(st.session_state[collection_name])
+    formats = REPORT_FORMATS
+
+if has_data:
+    # Os arquivos só são gerados quando pedidos e ficam em cache enquanto
+    # os dados da coleção não mudarem
+    report_cache = reports.get_report_cache()
+    for column, (fmt, label, mime) in zip(st.columns(len(formats)), formats):
+        artifact = report_cache.get(collection_name, fmt, report_type)
+        if artifact is None and column.button(f"Gerar {label}", key=f"build_{fmt}"):
+            bar = column.progress(0.0, text=f"Gerando {label}...")
+            artifact = report_cache.build(
+                collection_name,
+                fmt,
+                report_type,
+                progress=report_progress(bar, label),
+            )
+            bar.empty()
+        if artifact is not None:
+            column.download_button(
+                f"Baixar {label}",
+                data=artifact,
+                file_name=f"{report_type}.{fmt}",
+                mime=mime,
+                key=f"download_{fmt}",
+            )
+else:
+    st.info("Nenhum dado disponível para este relatório")
+
+item_separator()
+st.subheader("Importar dados")
+st.write(
+    "Carregue um arquivo CSV, Excel ou Parquet com um registro por linha e os "
+    "nomes dos campos no cabeçalho (os mesmos das exportações)."
+)
+import_type = st.selectbox("Cadastro", list(IMPORT_COLLECTIONS), key="import_type")
+upload = st.file_uploader(
+    "Arquivo", type=["csv", "xlsx", "parquet"], key="import_upload"
+)
+if upload is not None and st.button("Importar", key="import_run"):
+    import_name = IMPORT_COLLECTIONS[import_type]
+    bar = st.progress(0.0, text="Importando...")
+    try:
+        st.session_state.import_result = importer.import_file(
+            repo,
+            import_name,
+            upload,
+            upload.name,
+            on_batch=lambda records: sync_records(import_name, records),
+            progress=import_progress(bar),
+        )
+    except Exception as exc:
+        st.session_state.import_result = None
+        st.error(f"Não foi possível ler o arquivo: {exc}")
+    bar.empty()
+
+import_result = st.session_state.get("import_result")
+if import_result:
+    st.success(
+        f"{import_result['imported']} de {import_result['rows']} linhas importadas"
+    )
+    if import_result["error_count"]:
+        st.warning(
+            f"{import_result['error_count']} problemas encontrados; as linhas "
+            "com erro não foram importadas."
+        )
+        errors_df = pd.DataFrame(import_result["errors"])
+        st.dataframe(errors_df, hide_index=True)
+        st.download_button(
+            "Baixar erros (CSV)",
+            data=errors_df.to_csv(index=False).encode("utf-8-sig"),
+            file_name="erros_importacao.csv",
+            mime="text/csv",
+        )
@@ -0,0 +1,80 @@
+import streamlit as st
+from datetime import date
+
+import business_days
+import columnar
+import deadlines
+import storage
+from dialogs import dialog_add_task, dialog_edit_task
+from ui import (
+    TASK_PRIORITY_COLORS,
+    TASK_STATUS_COLORS,
+    item_separator,
+    paginate,
+    record_actions,
+    request_dialog,
+    show_requested_dialog,
+    status_badge,
+)
+
+repo = storage.get_repository()
+store = columnar.get_store()
+
+st.title("Tarefas")
+st.button(
+    "Adicionar Tarefa", on_click=request_dialog, args=("tasks_list", dialog_add_task)
+)
+with st.expander("Prazos em dias úteis"):
+    st.write(
+        "Tarefas criadas com a contagem em dias úteis guardam a data da "
+        "intimação e o calendário usado. Depois de alterar os feriados "
+        "(`HOLIDAYS_PATH`), recalcule os prazos de todas elas."
+    )
+    if st.button("Recalcular prazos", key="recompute_deadlines"):
+        business_days.reload_calendars()
+        changed = business_days.recompute_tasks(st.session_state.tasks)
+        st.success(f"{changed} prazo(s) alterado(s)")
+
+
+@st.fragment(key="tasks_list")
+def tasks_list():
+    show_requested_dialog("tasks_list")
+    st.subheader("Lista de Tarefas")
+    search_task = st.text_input("Buscar", key="search_task")
+    show_done = st.checkbox("Mostrar concluídas", key="show_done_tasks")
+    apply_filter = st.checkbox("Filtrar por prazo", key="apply_due")
+    due_filter = (
+        st.date_input("Até", value=date.today(), key="filter_due")
+        if apply_filter
+        else None
+    )
+    filtered_tasks = store.select(
+        "tasks",
+        search=search_task,
+        search_fields=("Descrição",),
+        date_field="Prazo",
+        date_to=due_filter,
+    )
+    if not show_done:
+        filtered_tasks = filtered_tasks[
+            (filtered_tasks["Status"] != deadlines.TASK_DONE).to_numpy()
+        ]
+    if len(filtered_tasks):
+        for t in paginate("tasks", filtered_tasks):
+            item_separator()
+            priority_html = status_badge(t["Prioridade"], TASK_PRIORITY_COLORS)
+            status_html = status_badge(t["Status"] or "Pendente", TASK_STATUS_COLORS)
+            st.markdown(
+                f"**{t['Descrição']}** - Prioridade: {priority_html} | "
+                f"Status: {status_html}",
+                unsafe_allow_html=True,
+            )
+            st.write(
+                f"Prazo: {t['Prazo']} | Cliente: {t['Cliente']} | Caso: {t['Caso']}"
+            )
+            record_actions("tasks", "task", t["id"], dialog_edit_task, "tasks_list")
+    else:
+        st.info("Nenhuma tarefa cadastrada")
+
+
+tasks_list()
@@ -0,0 +1,123 @@
+import streamlit as st
+from datetime import datetime, date, timedelta
+from streamlit_calendar import calendar as calendar_component
+
+import calendar_feed
+import deadlines
+import ledger
+from dialogs import open_edit_dialog
+from ui import EVENT_STATUS_COLORS, show_dialog_message, status_badge
+
+# Quantos itens de cada tipo o painel de alertas mostra
+ALERT_ITEMS = 10
+# Fragmentos que uma edição aberta pelo calendário reexecuta; o calendário
+# abre o diálogo e precisa estar na lista para que ele feche
+CALENDAR_EDITS = ["overview_calendar", "overview_alerts", "overview_upcoming"]
+
+finance = ledger.get_ledger()
+agenda = deadlines.get_deadline_index()
+
+st.title("Painel Geral")
+
+
+# Métricas, alertas, calendário e próximos eventos reexecutam separadamente
+@st.fragment(key="overview_metrics")
+def overview_metrics():
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Clientes", len(st.session_state.clients))
+    col2.metric("Casos", len(st.session_state.cases))
+    col3.metric("Tarefas", len(st.session_state.tasks))
+    col4.metric("Saldo", f"R$ {finance.balance():,.2f}")
+
+
+@st.fragment(key="overview_alerts")
+def overview_alerts():
+    now = datetime.now()
+    overdue_tasks = agenda.overdue("tasks", now, limit=ALERT_ITEMS)
+    overdue_events = agenda.overdue("events", now, limit=ALERT_ITEMS)
+    due_tasks = agenda.due_within("tasks", now, deadlines.ALERT_DAYS)
+    due_events = [
+        e
+        for e in agenda.due_within("events", now, deadlines.ALERT_DAYS)
+        if e["Tipo"] == "Prazo"
+    ]
+    if overdue_tasks or overdue_events or due_tasks or due_events:
+        st.subheader("Alertas de prazos")
+        for t in overdue_tasks:
+            due = t["Prazo"].strftime("%d/%m/%Y")
+            st.error(f"Vencida em {due}: {t['Descrição']}")
+        for e in overdue_events:
+            st.warning(
+                f"Evento ainda agendado em {e['Data'].strftime('%d/%m/%Y %H:%M')}: "
+                f"{e['Título']} — atualize o status"
+            )
+        for t in due_tasks[:ALERT_ITEMS]:
+            st.info(f"Vence em {t['Prazo'].strftime('%d/%m/%Y')}: {t['Descrição']}")
+        for e in due_events[:ALERT_ITEMS]:
+            st.info(f"Prazo em {e['Data'].strftime('%d/%m/%Y %H:%M')}: {e['Título']}")
+        hidden = agenda.overdue_count("tasks", now) - len(overdue_tasks)
+        hidden += max(len(due_tasks) - ALERT_ITEMS, 0)
+        if hidden > 0:
+            st.caption(f"e mais {hidden} tarefa(s) na página Tarefas")
+
+
+@st.fragment(key="overview_calendar")
+def overview_calendar():
+    st.subheader("Calendário")
+    show_dialog_message()
+    month = st.session_state.setdefault("calendar_month", date.today().replace(day=1))
+    col1, col2, col3 = st.columns([1, 1, 1])
+    if col1.button("‹ Mês anterior", key="calendar_prev"):
+        month = (month - timedelta(days=1)).replace(day=1)
+    if col2.button("Hoje", key="calendar_today"):
+        month = date.today().replace(day=1)
+    if col3.button("Próximo mês ›", key="calendar_next"):
+        month = (month + timedelta(days=31)).replace(day=1)
+    st.session_state.calendar_month = month
+    calendar_events = calendar_feed.get_calendar_feed().window(
+        *calendar_feed.month_window(month)
+    )
+
+    # A chave muda com o mês para o componente abrir já no mês escolhido
+    cal_state = calendar_component(
+        events=calendar_events,
+        options={
+            "initialView": "dayGridMonth",
+            "initialDate": month.isoformat(),
+            "headerToolbar": {"left": "", "center": "title", "right": ""},
+            "locale": "pt-br",
+            "height": 500,
+        },
+        key=f"overview_calendar_{month:%Y_%m}",
+        callbacks=["eventClick"],
+    )
+
+    if cal_state.get("eventClick"):
+        props = cal_state["eventClick"]["event"].get("extendedProps", {})
+        record_id = props.get("id")
+        if props.get("type") == "event" and record_id in st.session_state.events:
+            open_edit_dialog("events", record_id, fragment=CALENDAR_EDITS)
+        elif props.get("type") == "task" and record_id in st.session_state.tasks:
+            open_edit_dialog("tasks", record_id, fragment=CALENDAR_EDITS)
+
+
+@st.fragment(key="overview_upcoming")
+def overview_upcoming():
+    st.subheader("Próximos eventos")
+    upcoming = agenda.upcoming("events", datetime.now(), 5)
+    if upcoming:
+        for e in upcoming:
+            status_html = status_badge(e["Status"], EVENT_STATUS_COLORS)
+            st.markdown(
+                f"**{e['Título']}** - {e['Data'].strftime('%d/%m/%Y %H:%M')} | "
+                f"{status_html}",
+                unsafe_allow_html=True,
+            )
+    else:
+        st.info("Nenhum evento agendado")
+
+
+overview_metrics()
+overview_alerts()
+overview_calendar()
+overview_upcoming()
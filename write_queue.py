@@ -0,0 +1,262 @@
+import os
+import json
+import time
+import uuid
+import sqlite3
+import threading
+from typing import Callable, Dict, List, Optional
+
+import google_utils
+
+JOURNAL_PATH = os.environ.get("WRITE_QUEUE_PATH", "write_queue.db")
+FLUSH_ROWS = int(os.environ.get("WRITE_QUEUE_FLUSH_ROWS", "50"))
+FLUSH_INTERVAL = float(os.environ.get("WRITE_QUEUE_FLUSH_INTERVAL", "2"))
+MAX_ATTEMPTS = int(os.environ.get("WRITE_QUEUE_MAX_ATTEMPTS", "8"))
+
+Sender = Callable[[str, List[List], List[str]], None]
+
+
+def _send_to_apps_script(sheet_name: str, rows: List[List], keys: List[str]) -> None:
+    google_utils.append_rows(sheet_name, rows, keys=keys)
+
+
+class WriteQueue:
+    """Write-behind queue that journals rows on disk before sending them.
+
+    ``enqueue`` only inserts into a SQLite (WAL) journal and returns. A
+    background thread groups pending rows per sheet and sends them with one
+    ``append_rows`` call per sheet whenever ``flush_rows`` rows accumulate or
+    ``flush_interval`` seconds pass. Rows leave the journal only after the
+    Apps Script confirms the write, so delivery is at-least-once; each row
+    carries an idempotency key so retries can be deduplicated server-side.
+    Rows that keep failing are marked ``failed`` and kept for inspection.
+    """
+
+    def __init__(
+        self,
+        path: str = JOURNAL_PATH,
+        sender: Sender = _send_to_apps_script,
+        flush_rows: int = FLUSH_ROWS,
+        flush_interval: float = FLUSH_INTERVAL,
+        max_attempts: int = MAX_ATTEMPTS,
+    ):
+        self.sender = sender
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        self.max_attempts = max_attempts
+        self.last_error: Optional[str] = None
+        self.last_flush: Optional[float] = None
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS journal (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                key TEXT NOT NULL UNIQUE,
+                sheet TEXT NOT NULL,
+                row TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt REAL NOT NULL DEFAULT 0,
+                status TEXT NOT NULL DEFAULT 'pending',
+                last_error TEXT
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS journal_status ON journal (status, sheet, seq)"
+        )
+        self._conn.commit()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Condition()
+        self._stop = False
+        self._thread = threading.Thread(
+            target=self._run, name="write-queue", daemon=True
+        )
+        self._thread.start()
+
+    def enqueue(self, sheet_name: str, row: List, key: Optional[str] = None) -> str:
+        """Journal a row for ``sheet_name`` and return its idempotency key."""
+        key = key or uuid.uuid4().hex
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO journal (key, sheet, row, created_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, sheet_name, json.dumps(row, default=str), time.time()),
+            )
+            self._conn.commit()
+            pending = self._count("pending")
+        if pending >= self.flush_rows:
+            with self._wakeup:
+                self._wakeup.notify()
+        return key
+
+    def enqueue_many(
+        self, sheet_name: str, rows: List[List], keys: Optional[List[str]] = None
+    ) -> List[str]:
+        """Journal several rows in one transaction and return their keys."""
+        keys = keys or [uuid.uuid4().hex for _ in rows]
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO journal (key, sheet, row, created_at) "
+                "VALUES (?, ?, ?, ?)",
+                [
+                    (key, sheet_name, json.dumps(row, default=str), now)
+                    for key, row in zip(keys, rows)
+                ],
+            )
+            self._conn.commit()
+            pending = self._count("pending")
+        if pending >= self.flush_rows:
+            with self._wakeup:
+                self._wakeup.notify()
+        return keys
+
+    def status(self) -> Dict:
+        """Return pending/failed counts per sheet and the last error seen."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT sheet, status, COUNT(*) FROM journal GROUP BY sheet, status"
+            ).fetchall()
+        by_sheet: Dict[str, Dict[str, int]] = {}
+        for sheet, status, count in rows:
+            by_sheet.setdefault(sheet, {"pending": 0, "failed": 0})[status] = count
+        return {
+            "pending": sum(s["pending"] for s in by_sheet.values()),
+            "failed": sum(s["failed"] for s in by_sheet.values()),
+            "by_sheet": by_sheet,
+            "last_error": self.last_error,
+            "last_flush": self.last_flush,
+        }
+
+    def failed_rows(self) -> List[Dict]:
+        """Return the journal entries that exhausted their attempts."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, sheet, row, attempts, last_error FROM journal "
+                "WHERE status = 'failed' ORDER BY seq"
+            ).fetchall()
+        return [
+            {
+                "key": key,
+                "sheet": sheet,
+                "row": json.loads(row),
+                "attempts": attempts,
+                "last_error": error,
+            }
+            for key, sheet, row, attempts, error in rows
+        ]
+
+    def retry_failed(self) -> None:
+        """Put failed rows back in the queue."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE journal SET status = 'pending', attempts = 0, "
+                "next_attempt = 0 WHERE status = 'failed'"
+            )
+            self._conn.commit()
+        with self._wakeup:
+            self._wakeup.notify()
+
+    def flush(self) -> None:
+        """Send every pending row that is due, blocking the caller."""
+        with self._flush_lock:
+            while self._flush_once():
+                pass
+
+    def close(self) -> None:
+        with self._wakeup:
+            self._stop = True
+            self._wakeup.notify()
+        self._thread.join()
+        self._conn.close()
+
+    def _count(self, status: str) -> int:
+        return self._conn.execute(
+            "SELECT COUNT(*) FROM journal WHERE status = ?", (status,)
+        ).fetchone()[0]
+
+    def _run(self) -> None:
+        while True:
+            with self._wakeup:
+                if self._stop:
+                    return
+                self._wakeup.wait(self.flush_interval)
+                if self._stop:
+                    return
+            try:
+                self.flush()
+            except Exception as exc:  # a thread não pode morrer
+                self.last_error = str(exc)
+
+    def _flush_once(self) -> bool:
+        """Send one batch for the oldest due sheet; return False when idle."""
+        now = time.time()
+        with self._lock:
+            head = self._conn.execute(
+                "SELECT sheet FROM journal WHERE status = 'pending' "
+                "AND next_attempt <= ? ORDER BY seq LIMIT 1",
+                (now,),
+            ).fetchone()
+            if head is None:
+                return False
+            sheet = head[0]
+            batch = self._conn.execute(
+                "SELECT seq, key, row, attempts FROM journal WHERE status = 'pending' "
+                "AND sheet = ? AND next_attempt <= ? ORDER BY seq LIMIT ?",
+                (sheet, now, max(self.flush_rows, 1) * 10),
+            ).fetchall()
+        seqs = [seq for seq, _, _, _ in batch]
+        try:
+            self.sender(
+                sheet,
+                [json.loads(row) for _, _, row, _ in batch],
+                [key for _, key, _, _ in batch],
+            )
+        except Exception as exc:
+            # As linhas voltam para a fila com novo horário e a vez passa
+            # para as outras planilhas
+            self.last_error = f"{sheet}: {exc}"
+            self._mark_failure(batch, str(exc))
+            return True
+        with self._lock:
+            self._conn.executemany(
+                "DELETE FROM journal WHERE seq = ?", [(seq,) for seq in seqs]
+            )
+            self._conn.commit()
+        self.last_flush = time.time()
+        return True
+
+    def _mark_failure(self, batch, error: str) -> None:
+        now = time.time()
+        updates = []
+        for seq, _, _, attempts in batch:
+            attempts += 1
+            status = "failed" if attempts >= self.max_attempts else "pending"
+            # Backoff exponencial limitado a 5 minutos
+            next_attempt = now + min(300, max(self.flush_interval, 1) * 2**attempts)
+            updates.append((attempts, next_attempt, status, error, seq))
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE journal SET attempts = ?, next_attempt = ?, status = ?, "
+                "last_error = ? WHERE seq = ?",
+                updates,
+            )
+            self._conn.commit()
+
+
+_queue: Optional[WriteQueue] = None
+_queue_lock = threading.Lock()
+
+
+def get_queue() -> WriteQueue:
+    """Return the process-wide write queue, starting it on first use."""
+    global _queue
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                _queue = WriteQueue()
+    return _queue